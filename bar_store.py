@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Дискове сховище M1 барів, розбите по місяцях
+Кожен місяць - окрема папка з масивами фіксованої ширини (time int64 локальний час ns, OHLC float64),
+які читаються через numpy.memmap, тому в пам'ять потрапляє лише потрібний діапазон дат
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from session_index import NS_PER_DAY, local_ns
+
+STORE_COLUMNS = {
+    'time': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+}
+FRAME_COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'}
+META_FILE = 'meta.json'
+
+
+class BarStore:
+    """Сховище барів: root/YYYY-MM/{time,open,high,low,close}.bin + meta.json"""
+
+    def __init__(self, root):
+        self.root = root
+        self.meta_path = os.path.join(root, META_FILE)
+        self.meta = self._read_meta()
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'timezone': None, 'months': {}}
+
+    def _write_meta(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.meta_path)
+
+    @property
+    def months(self):
+        """Відсортований список місяців у сховищі"""
+        return sorted(self.meta['months'])
+
+    @property
+    def timezone(self):
+        """Назва часової зони, в якій збережено локальний час (None - невідома)"""
+        return self.meta['timezone']
+
+    def __len__(self):
+        return sum(info['rows'] for info in self.meta['months'].values())
+
+    def _column_path(self, month, column):
+        return os.path.join(self.root, month, f'{column}.bin')
+
+    def _open_month(self, month):
+        """memmap-масиви місяця (без читання в пам'ять)"""
+        rows = self.meta['months'][month]['rows']
+        return {
+            column: np.memmap(self._column_path(month, column), dtype=dtype, mode='r', shape=(rows,))
+            for column, dtype in STORE_COLUMNS.items()
+        }
+
+    def _write_month(self, month, arrays, append=False):
+        os.makedirs(os.path.join(self.root, month), exist_ok=True)
+        for column, dtype in STORE_COLUMNS.items():
+            with open(self._column_path(month, column), 'ab' if append else 'wb') as f:
+                np.ascontiguousarray(arrays[column], dtype=dtype).tofile(f)
+
+    def append(self, df):
+        """Додати бари з DataFrame (результат load_data)
+
+        Нові бари після кінця місяця дописуються в кінець файлів, а перекриття
+        з наявними даними зливається з перезаписом місяця (нові значення мають пріоритет).
+        Повертає кількість рядків у сховищі.
+        """
+        if df.empty:
+            return len(self)
+
+        timezone = df.attrs.get('timezone')
+        if self.meta['months'] and timezone and self.meta['timezone'] not in (None, timezone):
+            raise ValueError(f"Часова зона даних ({timezone}) не збігається зі сховищем ({self.meta['timezone']})")
+        self.meta['timezone'] = self.meta['timezone'] or timezone
+
+        times = local_ns(df['Datetime'])
+        order = np.argsort(times, kind='stable')
+        arrays = {'time': times[order]}
+        for column, name in FRAME_COLUMNS.items():
+            arrays[column] = df[name].to_numpy(dtype=np.float64)[order]
+
+        # Межі місяців у відсортованих даних
+        months = arrays['time'].astype('datetime64[ns]').astype('datetime64[M]')
+        starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+        ends = np.r_[starts[1:], len(months)]
+
+        for lo, hi in zip(starts, ends):
+            month = str(months[lo])
+            part = {column: values[lo:hi] for column, values in arrays.items()}
+            info = self.meta['months'].get(month)
+
+            if info is None:
+                self._write_month(month, part)
+            elif part['time'][0] > info['last']:
+                self._write_month(month, part, append=True)
+            else:
+                existing = {column: np.array(values) for column, values in self._open_month(month).items()}
+                merged = {column: np.concatenate([existing[column], part[column]]) for column in STORE_COLUMNS}
+                # Стабільне сортування + останнє входження кожного моменту
+                order = np.argsort(merged['time'], kind='stable')
+                merged = {column: values[order] for column, values in merged.items()}
+                keep = np.r_[merged['time'][1:] != merged['time'][:-1], True]
+                part = {column: values[keep] for column, values in merged.items()}
+                self._write_month(month, part)
+                info = None
+
+            rows = len(part['time']) + (info['rows'] if info is not None else 0)
+            first = int(part['time'][0]) if info is None else info['first']
+            self.meta['months'][month] = {'rows': rows, 'first': first, 'last': int(part['time'][-1])}
+
+        self._write_meta()
+        return len(self)
+
+    def read_local(self, start_ns=None, end_ns=None):
+        """Масиви барів у діапазоні локального часу [start_ns, end_ns) - копіюються лише потрібні рядки"""
+        chunks = {column: [] for column in STORE_COLUMNS}
+        for month in self.months:
+            info = self.meta['months'][month]
+            if (start_ns is not None and info['last'] < start_ns) or (end_ns is not None and info['first'] >= end_ns):
+                continue
+
+            arrays = self._open_month(month)
+            lo = 0 if start_ns is None else int(np.searchsorted(arrays['time'], start_ns, side='left'))
+            hi = info['rows'] if end_ns is None else int(np.searchsorted(arrays['time'], end_ns, side='left'))
+            for column in STORE_COLUMNS:
+                chunks[column].append(np.array(arrays[column][lo:hi]))
+            del arrays
+
+        return {
+            column: np.concatenate(parts) if parts else np.empty(0, dtype=STORE_COLUMNS[column])
+            for column, parts in chunks.items()
+        }
+
+    def read_range(self, start=None, end=None):
+        """DataFrame барів за локальні дати [start, end] включно (формат як у load_data)"""
+        start_ns = None if start is None else pd.Timestamp(start).normalize().value
+        end_ns = None if end is None else pd.Timestamp(end).normalize().value + NS_PER_DAY
+        arrays = self.read_local(start_ns, end_ns)
+
+        df = pd.DataFrame({'Datetime': arrays['time'].view('datetime64[ns]')})
+        for column, name in FRAME_COLUMNS.items():
+            df[name] = arrays[column]
+        df.attrs['timezone'] = self.timezone
+        return df
+
+
+def main():
+    """Імпорт CSV/XLSX файлів у сховище: python bar_store.py <папка_сховища> <файл> [<файл> ...]"""
+    from liquidity_analyzer import LiquidityAnalyzer
+
+    if len(sys.argv) < 3:
+        print("💡 Використання: python bar_store.py <папка_сховища> <файл> [<файл> ...]")
+        return
+
+    store = BarStore(sys.argv[1])
+    analyzer = LiquidityAnalyzer()
+    for file_path in sys.argv[2:]:
+        df = analyzer.load_data(file_path)
+        if df is None:
+            print(f"❌ Пропускаю {file_path}")
+            continue
+        total = store.append(df)
+        print(f"✅ {file_path}: додано {len(df)} барів, у сховищі {total}")
+
+    print(f"📦 Місяців у сховищі: {len(store.months)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,10 @@ import os
 import glob
 import pandas as pd
 from datetime import datetime
+from config import Config
+from excel_writer import write_excel
 from liquidity_analyzer import LiquidityAnalyzer
+from process_pool import run_in_processes
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -19,10 +22,14 @@ warnings.filterwarnings('ignore')
 class BatchLiquidityAnalyzer:
     """Класс для массового анализа множественных CSV файлов"""
     
-    def __init__(self, files_dir="files", results_dir="results"):
+    def __init__(self, files_dir="files", results_dir="results", result_formats=None):
         self.files_dir = files_dir
         self.results_dir = results_dir
+        # Дополнительные форматы результатов (None - Config.RESULT_FORMATS)
+        self.result_formats = result_formats
         self.analyzer = LiquidityAnalyzer()
+        # Процессы для анализа одного файла по частям дней (бары передаются через общую память)
+        self.analysis_workers = Config.ANALYSIS_WORKERS
         
         # Создаем папки если не существуют
         os.makedirs(self.files_dir, exist_ok=True)
@@ -70,12 +77,16 @@ class BatchLiquidityAnalyzer:
         
         return datetime.now().strftime('%Y%m')
     
-    def process_single_file(self, file_path):
-        """Обработать один файл"""
+    def process_single_file(self, file_path, analysis_workers=None):
+        """Обработать один файл (analysis_workers - процессы для анализа его дней, None - self.analysis_workers)"""
         print(f"\n📁 Обработка файла: {os.path.basename(file_path)}")
         print("-" * 50)
         
         try:
+            # Профиль этапов - отдельно для каждого файла
+            if self.analyzer.profiler is not None:
+                self.analyzer.profiler.reset()
+            
             # Загружаем данные
             df = self.analyzer.load_data(file_path)
             
@@ -84,7 +95,7 @@ class BatchLiquidityAnalyzer:
                 return None
             
             # Анализируем
-            results = self.analyzer.analyze_period(df)
+            results = self.analyzer.analyze_period(df, workers=analysis_workers or self.analysis_workers)
             
             if results.empty:
                 print(f"❌ Ошибка: не удалось проанализировать {file_path}")
@@ -98,17 +109,19 @@ class BatchLiquidityAnalyzer:
             output_path = os.path.join(self.results_dir, output_filename)
             
             # Сохраняем результаты
-            self.analyzer.save_results(results, output_path)
+            self.analyzer.save_results(results, output_path, self.result_formats)
             
             print(f"✅ Результаты сохранены: {output_filename}")
             
+            report = self.analyzer.stage_report()
             return {
                 'file': os.path.basename(file_path),
                 'currency_pair': currency_pair,
                 'period': period,
                 'total_days': len(results),
                 'output_file': output_filename,
-                'status': 'success'
+                'status': 'success',
+                'stage_timings': report.to_dict('records') if report is not None else []
             }
             
         except Exception as e:
@@ -119,8 +132,8 @@ class BatchLiquidityAnalyzer:
                 'error': str(e)
             }
     
-    def process_all_files(self):
-        """Обработать все файлы в папке files"""
+    def process_all_files(self, progress_callback=None, workers=None):
+        """Обработать все файлы в папке files (workers > 1 - в нескольких процессах)"""
         print("🚀 МАССОВЫЙ АНАЛИЗ ЛИКВИДНОСТИ")
         print("=" * 50)
         
@@ -139,12 +152,21 @@ class BatchLiquidityAnalyzer:
         # Обрабатываем каждый файл
         results_summary = []
         start_time = datetime.now()
+        workers = workers or Config.BATCH_WORKERS
         
-        for i, file_path in enumerate(files, 1):
-            print(f"\n🔄 Обработка {i}/{len(files)}")
-            result = self.process_single_file(file_path)
-            if result:
-                results_summary.append(result)
+        if workers > 1 and len(files) > 1:
+            results_summary = self.process_files_parallel(files, workers, progress_callback)
+        else:
+            # Один файл - процессы используются для анализа его дней (настройка экземпляра не меняется)
+            analysis_workers = workers if workers > 1 else None
+            for i, file_path in enumerate(files, 1):
+                if progress_callback:
+                    progress_callback(i, len(files), os.path.basename(file_path))
+                
+                print(f"\n🔄 Обработка {i}/{len(files)}")
+                result = self.process_single_file(file_path, analysis_workers)
+                if result:
+                    results_summary.append(result)
         
         # Создаем общий отчет
         self.create_summary_report(results_summary, start_time)
@@ -152,6 +174,28 @@ class BatchLiquidityAnalyzer:
         print(f"\n✅ ОБРАБОТКА ЗАВЕРШЕНА!")
         print(f"📁 Результаты сохранены в папке: {self.results_dir}")
     
+    def process_files_parallel(self, files, workers, progress_callback=None):
+        """Обработать файлы в пуле из workers процессов, результаты - в порядке списка файлов"""
+        print(f"\n⚡ Параллельная обработка: {workers} процессов")
+        
+        outcomes = {}
+        tasks = run_in_processes(_process_file_worker, files, workers, self.files_dir, self.results_dir, self.result_formats)
+        for done, (file_path, result) in enumerate(tasks, 1):
+            if isinstance(result, Exception):
+                print(f"❌ Ошибка при обработке {file_path}: {str(result)}")
+                result = {
+                    'file': os.path.basename(file_path),
+                    'status': 'error',
+                    'error': str(result)
+                }
+            outcomes[file_path] = result
+            
+            if progress_callback:
+                progress_callback(done, len(files), os.path.basename(file_path))
+            print(f"🔄 Готово {done}/{len(files)}: {os.path.basename(file_path)}")
+        
+        return [outcomes[file_path] for file_path in files if outcomes[file_path]]
+    
     def create_summary_report(self, results_summary, start_time):
         """Создать общий отчет по всем обработанным файлам"""
         end_time = datetime.now()
@@ -197,12 +241,20 @@ class BatchLiquidityAnalyzer:
         ]
         stats_df = pd.DataFrame(stats_data)
         
+        sheets = {'Обработанные файлы': summary_df, 'Общая статистика': stats_df}
+        
+        # Профиль этапов по файлам (Config.PROFILE_STAGES)
+        stage_timings = [
+            {'Файл': result['file'], **stage}
+            for result in results_summary for stage in result.get('stage_timings', [])
+        ]
+        if stage_timings:
+            sheets['Время этапов'] = pd.DataFrame(stage_timings)
+        
         # Сохраняем общий отчет
         summary_file = os.path.join(self.results_dir, f"batch_analysis_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
         
-        with pd.ExcelWriter(summary_file, engine='openpyxl') as writer:
-            summary_df.to_excel(writer, sheet_name='Обработанные файлы', index=False)
-            stats_df.to_excel(writer, sheet_name='Общая статистика', index=False)
+        write_excel(summary_file, sheets)
         
         print(f"\n📊 ОБЩИЙ ОТЧЕТ:")
         print("-" * 30)
@@ -213,6 +265,13 @@ class BatchLiquidityAnalyzer:
         print(f"Отчет сохранен: {os.path.basename(summary_file)}")
 
 
+def _process_file_worker(file_path, files_dir, results_dir, result_formats=None):
+    """Обработать файл в отдельном процессе"""
+    batch = BatchLiquidityAnalyzer(files_dir, results_dir, result_formats)
+    # Процессов уже столько, сколько задано - файл анализируется последовательно
+    return batch.process_single_file(file_path, analysis_workers=1)
+
+
 def main():
     """Главная функция"""
     batch_analyzer = BatchLiquidityAnalyzer()
@@ -10,14 +10,23 @@ import glob
 import pandas as pd
 from datetime import datetime
 import traceback
+from config import Config
+from excel_writer import write_excel
 from liquidity_analyzer import LiquidityAnalyzer
+from process_pool import run_in_processes
 
 class BatchLiquidityAnalyzer:
-    def __init__(self, files_dir="files", results_dir="results"):
+    def __init__(self, files_dir="files", results_dir="results", result_formats=None):
         self.files_dir = files_dir
         self.results_dir = results_dir
+        # Дополнительные форматы результатов (None - Config.RESULT_FORMATS)
+        self.result_formats = result_formats
         self.processed_files = []
         self.failed_files = []
+        # Профиль этапов по файлам (Config.PROFILE_STAGES)
+        self.stage_timings = []
+        # Процессы для анализа одного файла по частям дней (бары передаются через общую память)
+        self.analysis_workers = Config.ANALYSIS_WORKERS
         
         # Создаем папки если их нет
         os.makedirs(self.files_dir, exist_ok=True)
@@ -74,8 +83,8 @@ class BatchLiquidityAnalyzer:
         
         return pair, period, name_without_ext
     
-    def process_single_file(self, filepath):
-        """Обработать один файл"""
+    def process_single_file(self, filepath, analysis_workers=None):
+        """Обработать один файл (analysis_workers - процессы для анализа его дней, None - self.analysis_workers)"""
         print(f"\n🔍 Обрабатываем: {os.path.basename(filepath)}")
         
         try:
@@ -96,7 +105,7 @@ class BatchLiquidityAnalyzer:
             
             # Анализируем данные
             print("   🔬 Выполняем анализ...")
-            results = analyzer.analyze_data(df)
+            results = analyzer.analyze_data(df, workers=analysis_workers or self.analysis_workers)
             
             if results is None or len(results) == 0:
                 raise ValueError("Анализ не дал результатов")
@@ -110,10 +119,16 @@ class BatchLiquidityAnalyzer:
             
             # Сохраняем результаты
             print("   💾 Сохраняем результаты...")
-            analyzer.save_results(results, output_path)
+            analyzer.save_results(results, output_path, self.result_formats)
             
             print(f"   ✅ Результаты сохранены: {output_filename}")
             
+            # Профиль этапов анализа файла
+            report = analyzer.stage_report()
+            if report is not None:
+                report.insert(0, 'input_file', filepath)
+                self.stage_timings.extend(report.to_dict('records'))
+            
             # Добавляем в список успешно обработанных
             self.processed_files.append({
                 'input_file': filepath,
@@ -149,24 +164,92 @@ class BatchLiquidityAnalyzer:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         summary_path = os.path.join(self.results_dir, f"batch_summary_{timestamp}.xlsx")
         
-        with pd.ExcelWriter(summary_path, engine='openpyxl') as writer:
-            
-            # Лист успешно обработанных файлов
-            if self.processed_files:
-                processed_df = pd.DataFrame(self.processed_files)
-                processed_df['processing_time'] = processed_df['processing_time'].dt.strftime('%Y-%m-%d %H:%M:%S')
-                processed_df.to_excel(writer, sheet_name='Processed_Files', index=False)
-            
-            # Лист ошибок
-            if self.failed_files:
-                failed_df = pd.DataFrame(self.failed_files)
-                failed_df['processing_time'] = failed_df['processing_time'].dt.strftime('%Y-%m-%d %H:%M:%S')
-                failed_df.to_excel(writer, sheet_name='Failed_Files', index=False)
+        sheets = {}
+        
+        # Лист успешно обработанных файлов
+        if self.processed_files:
+            processed_df = pd.DataFrame(self.processed_files)
+            processed_df['processing_time'] = processed_df['processing_time'].dt.strftime('%Y-%m-%d %H:%M:%S')
+            sheets['Processed_Files'] = processed_df
+        
+        # Лист ошибок
+        if self.failed_files:
+            failed_df = pd.DataFrame(self.failed_files)
+            failed_df['processing_time'] = failed_df['processing_time'].dt.strftime('%Y-%m-%d %H:%M:%S')
+            sheets['Failed_Files'] = failed_df
+        
+        # Лист профиля этапов
+        if self.stage_timings:
+            sheets['Stage_Timings'] = pd.DataFrame(self.stage_timings)
+        
+        write_excel(summary_path, sheets)
         
         print(f"\n📊 Сводный отчет сохранен: {os.path.basename(summary_path)}")
         return summary_path
     
-    def run_batch_analysis(self):
+    def process_files_sequential(self, files_list, progress_callback=None, analysis_workers=None):
+        """Обработать файлы по очереди (analysis_workers - как в process_single_file)"""
+        for i, file_path in enumerate(files_list, 1):
+            filename = os.path.basename(file_path)
+            
+            # Вызываем callback если есть
+            if progress_callback:
+                progress_callback(i, len(files_list), filename)
+            
+            print(f"📁 Обработка файла: {filename}")
+            
+            try:
+                # Обрабатываем файл
+                result = self.process_single_file(file_path, analysis_workers)
+                if result:
+                    print(f"✅ Успешно обработан: {filename}")
+                else:
+                    # process_single_file уже записал ошибку в failed_files
+                    print(f"❌ Ошибка при обработке: {filename}")
+                    
+            except Exception as e:
+                error_msg = str(e)
+                self.failed_files.append({
+                    'input_file': file_path,
+                    'error': error_msg
+                })
+                print(f"❌ Ошибка при обработке {filename}: {error_msg}")
+    
+    def process_files_parallel(self, files_list, workers, progress_callback=None):
+        """Обработать файлы в пуле из workers процессов (от самого большого файла к меньшему)"""
+        print(f"⚡ Параллельная обработка: {workers} процессов")
+        
+        outcomes = {}
+        tasks = run_in_processes(_process_file_worker, files_list, workers, self.files_dir, self.results_dir, self.result_formats)
+        for done, (file_path, outcome) in enumerate(tasks, 1):
+            filename = os.path.basename(file_path)
+            outcomes[file_path] = outcome
+            
+            if progress_callback:
+                progress_callback(done, len(files_list), filename)
+            
+            if isinstance(outcome, Exception) or not outcome[0]:
+                print(f"❌ Ошибка при обработке: {filename}")
+            else:
+                print(f"✅ Успешно обработан: {filename}")
+        
+        # Собираем результаты процессов в порядке списка файлов
+        for file_path in files_list:
+            outcome = outcomes[file_path]
+            if isinstance(outcome, Exception):
+                self.failed_files.append({
+                    'input_file': file_path,
+                    'error': str(outcome),
+                    'processing_time': datetime.now()
+                })
+                continue
+            
+            _, processed_files, failed_files, stage_timings = outcome
+            self.processed_files.extend(processed_files)
+            self.failed_files.extend(failed_files)
+            self.stage_timings.extend(stage_timings)
+    
+    def run_batch_analysis(self, workers=None):
         """Запустить массовую обработку всех файлов"""
         print("🚀 Запуск массовой обработки файлов...")
         print(f"📁 Папка с файлами: {os.path.abspath(self.files_dir)}")
@@ -186,13 +269,19 @@ class BatchLiquidityAnalyzer:
         
         # Обрабатываем каждый файл
         start_time = datetime.now()
+        workers = workers or Config.BATCH_WORKERS
         
-        for i, file_path in enumerate(files_list, 1):
-            print(f"\n{'='*60}")
-            print(f"📁 Файл {i}/{len(files_list)}: {os.path.basename(file_path)}")
-            print(f"{'='*60}")
-            
-            self.process_single_file(file_path)
+        if workers > 1 and len(files_list) > 1:
+            self.process_files_parallel(files_list, workers)
+        else:
+            # Один файл - процессы используются для анализа его дней (настройка экземпляра не меняется)
+            analysis_workers = workers if workers > 1 else None
+            for i, file_path in enumerate(files_list, 1):
+                print(f"\n{'='*60}")
+                print(f"📁 Файл {i}/{len(files_list)}: {os.path.basename(file_path)}")
+                print(f"{'='*60}")
+                
+                self.process_single_file(file_path, analysis_workers)
         
         # Итоги обработки
         end_time = datetime.now()
@@ -224,10 +313,11 @@ class BatchLiquidityAnalyzer:
         print(f"\n📁 Результаты сохранены в папке: {os.path.abspath(self.results_dir)}")
         print(f"🎯 Готово! Все файлы обработаны.")
     
-    def process_all_files(self, input_folder="files", output_folder="results", progress_callback=None):
+    def process_all_files(self, input_folder="files", output_folder="results", progress_callback=None, workers=None):
         """
         Метод для совместимости с GUI
         Обрабатывает все файлы и возвращает путь к сводному отчету
+        workers > 1 - параллельная обработка в нескольких процессах
         """
         self.files_dir = input_folder
         self.results_dir = output_folder
@@ -245,34 +335,13 @@ class BatchLiquidityAnalyzer:
         print(f"📊 Найдено файлов для обработки: {len(files_list)}")
         
         # Обрабатываем каждый файл
-        for i, file_path in enumerate(files_list, 1):
-            filename = os.path.basename(file_path)
-            
-            # Вызываем callback если есть
-            if progress_callback:
-                progress_callback(i, len(files_list), filename)
-            
-            print(f"📁 Обработка файла: {filename}")
-            
-            try:
-                # Обрабатываем файл
-                result = self.process_single_file(file_path)
-                if result:
-                    print(f"✅ Успешно обработан: {filename}")
-                else:
-                    self.failed_files.append({
-                        'input_file': file_path,
-                        'error': 'Неизвестная ошибка при обработке'
-                    })
-                    print(f"❌ Ошибка при обработке: {filename}")
-                    
-            except Exception as e:
-                error_msg = str(e)
-                self.failed_files.append({
-                    'input_file': file_path,
-                    'error': error_msg
-                })
-                print(f"❌ Ошибка при обработке {filename}: {error_msg}")
+        workers = workers or Config.BATCH_WORKERS
+        if workers > 1 and len(files_list) > 1:
+            self.process_files_parallel(files_list, workers, progress_callback)
+        else:
+            # Один файл - процессы используются для анализа его дней (настройка экземпляра не меняется)
+            analysis_workers = workers if workers > 1 else None
+            self.process_files_sequential(files_list, progress_callback, analysis_workers)
         
         # Создаем сводный отчет
         summary_path = self.create_summary_report()
@@ -283,6 +352,14 @@ class BatchLiquidityAnalyzer:
         
         return summary_path
 
+def _process_file_worker(file_path, files_dir, results_dir, result_formats=None):
+    """Обработать файл в отдельном процессе: (успех, processed_files, failed_files, stage_timings)"""
+    batch = BatchLiquidityAnalyzer(files_dir, results_dir, result_formats)
+    # Процессов уже столько, сколько задано - файл анализируется последовательно
+    result = batch.process_single_file(file_path, analysis_workers=1)
+    return result, batch.processed_files, batch.failed_files, batch.stage_timings
+
+
 def main():
     """Главная функция для запуска массовой обработки"""
     
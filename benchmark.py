@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк етапів аналізу: завантаження, аналіз і збереження результатів
+Працює офлайн на синтетичних даних (synthetic_data.py). Кожен запуск (варіант аналізатора x розмір)
+виконується в окремому процесі, щоб піковий RSS не змішувався між запусками.
+Результат - JSON з часом етапів, барами/с і піковим RSS для порівняння між комітами.
+"""
+
+import argparse
+import inspect
+import importlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import SIZES, ensure_dataset
+
+# Варіант -> модуль з класом LiquidityAnalyzer
+VARIANTS = {
+    'current': 'liquidity_analyzer',
+    'fixed': 'liquidity_analyzer_fixed',
+    'working': 'liquidity_analyzer_working',
+}
+DEFAULT_SIZES = ['1m', '1y']
+DATA_DIR = '.benchmark'
+STAGES = ('load', 'analyze', 'save')
+
+
+def peak_rss_mb():
+    """Піковий RSS процесу в МБ"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux повертає кілобайти, macOS - байти
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def create_analyzer(module, engine, use_cache):
+    """Аналізатор варіанту; рушій і кеш задаються лише там, де вони підтримуються"""
+    parameters = inspect.signature(module.LiquidityAnalyzer).parameters
+    options = {}
+    if 'engine' in parameters:
+        options['engine'] = engine
+    if 'use_cache' in parameters:
+        options['use_cache'] = use_cache
+    return module.LiquidityAnalyzer(**options)
+
+
+def analyze(analyzer, df):
+    """Аналіз періоду: (результати, кількість днів з помилкою)
+
+    Для варіанту без analyze_period - цикл по днях як в analyze_file, помилки днів пропускаються.
+    """
+    if hasattr(analyzer, 'analyze_period'):
+        return analyzer.analyze_period(df), 0
+
+    results = []
+    failed = 0
+    for date in df['Datetime'].dt.date.unique():
+        try:
+            result = analyzer.analyze_day(df, pd.Timestamp(date))
+        except Exception:
+            failed += 1
+            continue
+        if result:
+            results.append(result)
+    return pd.DataFrame(results), failed
+
+
+def save(analyzer, results, output_file):
+    """Збереження результатів (для варіанту без save_results - запис Excel як в analyze_file)"""
+    if hasattr(analyzer, 'save_results'):
+        analyzer.save_results(results, output_file)
+        return
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        results.to_excel(writer, sheet_name='Liquidity_Analysis', index=False)
+
+
+def run_stages(variant, data_path, engine='loop', use_cache=False):
+    """Виміряти етапи одного запуску в поточному процесі"""
+    module = importlib.import_module(VARIANTS[variant])
+    output_dir = tempfile.mkdtemp(prefix='liquidity_benchmark_')
+    stages = {}
+
+    def record(stage, started, bars):
+        seconds = time.perf_counter() - started
+        stages[stage] = {
+            'seconds': round(seconds, 4),
+            'bars_per_sec': round(bars / seconds) if seconds > 0 else None,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            analyzer = create_analyzer(module, engine, use_cache)
+
+            started = time.perf_counter()
+            df = analyzer.load_data(data_path)
+            if df is None:
+                raise ValueError(f"Не вдалося завантажити {data_path}")
+            bars = len(df)
+            record('load', started, bars)
+
+            started = time.perf_counter()
+            results, failed_days = analyze(analyzer, df)
+            record('analyze', started, bars)
+
+            started = time.perf_counter()
+            save(analyzer, results, os.path.join(output_dir, 'results.xlsx'))
+            record('save', started, bars)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return {
+        'bars': bars,
+        'days': len(results),
+        'failed_days': failed_days,
+        'stages': stages,
+        'total_seconds': round(sum(stage['seconds'] for stage in stages.values()), 4),
+    }
+
+
+def run_in_subprocess(variant, data_path, engine, use_cache, timeout):
+    """Запуск в окремому процесі: результат run_stages або {'error': ...}"""
+    command = [sys.executable, os.path.abspath(__file__), '--child', variant, data_path, engine]
+    if use_cache:
+        command.append('--cache')
+    try:
+        completed = subprocess.run(
+            command, capture_output=True, text=True, timeout=timeout,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+    except subprocess.TimeoutExpired:
+        return {'error': f'timeout {timeout} с'}
+
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'помилка процесу'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(variants, sizes, engine='loop', repeat=1, data_dir=DATA_DIR, use_cache=False, timeout=None, seed=0):
+    """Повний бенчмарк: словник з оточенням і списком запусків (найкращий з repeat за загальним часом)"""
+    runs = []
+    for size in sizes:
+        data_path = os.path.abspath(ensure_dataset(data_dir, size, seed))
+        for variant in variants:
+            attempts = []
+            for attempt in range(repeat):
+                print(f"⏱️  {variant} / {size} ({attempt + 1}/{repeat})", file=sys.stderr)
+                attempts.append(run_in_subprocess(variant, data_path, engine, use_cache, timeout))
+            successful = [run for run in attempts if 'error' not in run]
+            best = min(successful, key=lambda run: run['total_seconds']) if successful else attempts[-1]
+            runs.append({'variant': variant, 'module': VARIANTS[variant], 'size': size, 'engine': engine, **best})
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'repeat': repeat,
+        'runs': runs,
+    }
+
+
+def print_summary(report):
+    """Коротка таблиця результатів (у stderr, щоб stdout лишався JSON)"""
+    print(f"\n📊 Бенчмарк {report['commit'] or ''}", file=sys.stderr)
+    for run in report['runs']:
+        if 'error' in run:
+            print(f"   {run['variant']:<8} {run['size']:<4} ❌ {run['error']}", file=sys.stderr)
+            continue
+        stages = ', '.join(f"{stage} {run['stages'][stage]['seconds']:.2f}с" for stage in STAGES)
+        peak = max(stage['peak_rss_mb'] for stage in run['stages'].values())
+        failed = f", ⚠️ днів з помилкою: {run['failed_days']}" if run['failed_days'] else ''
+        print(f"   {run['variant']:<8} {run['size']:<4} {run['bars']:>10,} барів: {stages}, RSS {peak:.0f} МБ{failed}",
+              file=sys.stderr)
+
+
+def main():
+    """Запуск: python benchmark.py [--sizes 1m,1y] [--variants current,fixed,working] [--output файл.json]"""
+    parser = argparse.ArgumentParser(description="Бенчмарк load_data / analyze_period / save_results")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help=f"розміри даних через кому: {', '.join(SIZES)}")
+    parser.add_argument('--variants', default=','.join(VARIANTS), help=f"варіанти через кому: {', '.join(VARIANTS)}")
+    parser.add_argument('--engine', default='loop', choices=['loop', 'vectorized'], help="рушій аналізу (де підтримується)")
+    parser.add_argument('--repeat', type=int, default=1, help="кількість повторів, береться найкращий")
+    parser.add_argument('--cache', action='store_true', help="увімкнути кеші завантаження та днів (де підтримуються)")
+    parser.add_argument('--timeout', type=float, default=None, help="ліміт часу одного запуску, с")
+    parser.add_argument('--seed', type=int, default=0, help="seed синтетичних даних")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="папка для згенерованих даних")
+    parser.add_argument('--output', help="файл для JSON (типово - stdout)")
+    parser.add_argument('--child', nargs=3, metavar=('VARIANT', 'DATA', 'ENGINE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        variant, data_path, engine = args.child
+        print(json.dumps(run_stages(variant, data_path, engine, args.cache)))
+        return
+
+    variants = [variant.strip() for variant in args.variants.split(',') if variant.strip()]
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [variant for variant in variants if variant not in VARIANTS] + [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"невідомі значення: {', '.join(unknown)}")
+
+    report = run_benchmark(variants, sizes, args.engine, args.repeat, args.data_dir, args.cache, args.timeout, args.seed)
+    print_summary(report)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"✅ Результати збережено: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
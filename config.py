@@ -24,6 +24,10 @@ class Config:
     DEFAULT_INPUT_FILE = "DAT_MT_EURUSD_M1_202505.csv"
     DEFAULT_OUTPUT_FILE = "liquidity_analysis_results.xlsx"
     
+    # Додаткові формати результатів поруч з основним файлом: 'parquet', 'arrow', 'csv.gz', 'jsonl'
+    # (перегляд результатів читає їх замість Excel); parquet та arrow потребують pyarrow
+    RESULT_FORMATS = []
+    
     # Формати даних  
     DATE_FORMAT = '%Y.%m.%d'
     TIME_FORMAT = '%H:%M'
@@ -35,3 +39,28 @@ class Config:
     
     # UTC offset
     UTC_OFFSET = 3  # UTC+3
+    
+    # Часова зона брокера: 'dst' - таблиця переходів TIMEZONE, 'fixed' - постійний зсув UTC_OFFSET
+    TIMEZONE = 'Europe/Kyiv'
+    TIMEZONE_MODE = 'dst'
+    
+    # Кеш завантажених даних
+    CACHE_ENABLED = True
+    CACHE_DIR = ".liquidity_cache"
+    CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 ГБ
+    DAY_CACHE_ENABLED = False  # Кеш результатів днів: вмикати явно, бо пише SQLite-базу в CACHE_DIR
+    DAY_CACHE_FILE = "day_results.sqlite"  # Кеш результатів днів (у CACHE_DIR)
+    DAY_CACHE_MAX_ENTRIES = 200_000
+    
+    # Кількість процесів для масової обробки та для аналізу одного файлу (1 - послідовно)
+    BATCH_WORKERS = 1
+    ANALYSIS_WORKERS = 1
+    
+    # Найдовше вікно (барів), для якого індекс діапазонів відповідає за O(1): доба M1 барів
+    RANGE_INDEX_MAX_WINDOW = 1440
+    
+    # Профілювання етапів (час, виклики, переглянуті рядки) - звіт у stage_report() і у зведеному звіті
+    PROFILE_STAGES = False
+    
+    # Розмір частини (рядків) для потокового читання
+    STREAM_CHUNK_ROWS = 200_000
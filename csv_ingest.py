@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Швидке завантаження M1 CSV файлів
+Формат визначається за невеликою вибіркою, колонки читаються з явними типами,
+а дата і час фіксованої ширини (YYYY.MM.DD, HH:MM) розбираються напряму в int64 наносекунди
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from session_index import NS_PER_MINUTE, NS_PER_DAY
+
+BAR_COLUMNS = ['Date', 'Time', 'Open', 'High', 'Low', 'Close']
+RAW_COLUMNS = BAR_COLUMNS + ['Volume']
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+SAMPLE_BYTES = 64 * 1024
+
+DATE_PATTERN = re.compile(r'^\d{4}([.-])\d{2}\1\d{2}$')
+TIME_PATTERN = re.compile(r'^\d{2}:\d{2}(:\d{2})?$')
+
+
+def sniff_format(file_path, sample_bytes=SAMPLE_BYTES):
+    """Визначити формат файлу за вибіркою з його початку
+
+    Повертає dict з ключами has_header, date_sep, with_seconds, fields
+    або None, якщо формат не підходить для швидкого шляху.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.read(sample_bytes).splitlines()
+
+    lines = [line.strip() for line in lines if line.strip()]
+    if not lines:
+        return None
+
+    has_header = ('date' in lines[0].lower() and 'time' in lines[0].lower())
+    if has_header:
+        header = [name.strip() for name in lines[0].split(',')]
+        if any(name not in header for name in BAR_COLUMNS):
+            return None
+        lines = lines[1:]
+        date_col, time_col = header.index('Date'), header.index('Time')
+    else:
+        date_col, time_col = 0, 1
+
+    if not lines:
+        return None
+
+    fields = lines[0].split(',')
+    if len(fields) <= max(date_col, time_col):
+        return None
+
+    date_match = DATE_PATTERN.match(fields[date_col].strip())
+    time_match = TIME_PATTERN.match(fields[time_col].strip())
+    if not date_match or not time_match:
+        return None
+
+    return {
+        'has_header': has_header,
+        'date_sep': date_match.group(1),
+        'with_seconds': time_match.group(1) is not None,
+        'fields': len(fields),
+    }
+
+
+def days_from_civil(year, month, day):
+    """Кількість днів від 1970-01-01 для григоріанської дати (векторизовано)"""
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def parse_fixed_datetime(dates, times, date_sep='.', with_seconds=False):
+    """Розібрати колонки дати і часу фіксованої ширини у int64 UTC наносекунди
+
+    Повертає None, якщо хоча б одне значення не відповідає формату.
+    """
+    time_width = 8 if with_seconds else 5
+
+    # На 1 байт ширше, щоб виявити занадто довгі значення
+    date_bytes = np.asarray(dates, dtype='S11').view(np.uint8).reshape(-1, 11)
+    time_bytes = np.asarray(times, dtype=f'S{time_width + 1}').view(np.uint8).reshape(-1, time_width + 1)
+
+    if date_bytes[:, 10].any() or time_bytes[:, time_width].any():
+        return None
+
+    date_digits = date_bytes[:, [0, 1, 2, 3, 5, 6, 8, 9]].astype(np.int64) - 48
+    time_positions = [0, 1, 3, 4, 6, 7] if with_seconds else [0, 1, 3, 4]
+    time_digits = time_bytes[:, time_positions].astype(np.int64) - 48
+
+    separator = ord(date_sep)
+    valid = (
+        ((date_digits >= 0) & (date_digits <= 9)).all() and
+        ((time_digits >= 0) & (time_digits <= 9)).all() and
+        (date_bytes[:, 4] == separator).all() and (date_bytes[:, 7] == separator).all() and
+        (time_bytes[:, 2] == ord(':')).all() and
+        (not with_seconds or (time_bytes[:, 5] == ord(':')).all())
+    )
+    if not valid:
+        return None
+
+    year = date_digits[:, 0] * 1000 + date_digits[:, 1] * 100 + date_digits[:, 2] * 10 + date_digits[:, 3]
+    month = date_digits[:, 4] * 10 + date_digits[:, 5]
+    day = date_digits[:, 6] * 10 + date_digits[:, 7]
+    hour = time_digits[:, 0] * 10 + time_digits[:, 1]
+    minute = time_digits[:, 2] * 10 + time_digits[:, 3]
+    second = time_digits[:, 4] * 10 + time_digits[:, 5] if with_seconds else 0
+
+    if ((month < 1) | (month > 12) | (day < 1) | (day > 31) | (hour > 23) | (minute > 59)).any():
+        return None
+    if with_seconds and (second > 59).any():
+        return None
+
+    return (days_from_civil(year, month, day) * NS_PER_DAY +
+            hour * (60 * NS_PER_MINUTE) + minute * NS_PER_MINUTE + second * 1_000_000_000)
+
+
+def _read_options(file_format):
+    """Параметри pd.read_csv для файлу визначеного формату (None, якщо формат не підходить)"""
+    # Дата і час читаються як байти фіксованої ширини (на 1 байт ширше для перевірки довжини),
+    # ціни - одразу як float64 (порожнє поле - NaN, такі бари аналіз пропускає), Volume не читається взагалі
+    time_width = 8 if file_format['with_seconds'] else 5
+    dtypes = {'Date': 'S11', 'Time': f'S{time_width + 1}', 'Open': np.float64,
+              'High': np.float64, 'Low': np.float64, 'Close': np.float64}
+    missing = {column: [''] for column in PRICE_COLUMNS}
+    options = dict(usecols=BAR_COLUMNS, dtype=dtypes, keep_default_na=False, na_values=missing)
+
+    if file_format['has_header']:
+        return options
+    if file_format['fields'] in (len(BAR_COLUMNS), len(RAW_COLUMNS)):
+        return dict(options, header=None, names=RAW_COLUMNS[:file_format['fields']])
+    return None
+
+
+def _to_bars(raw, file_format):
+    """Прочитані колонки → DataFrame барів з Datetime в UTC (None, якщо дата/час некоректні)"""
+    epoch_ns = parse_fixed_datetime(
+        raw['Date'].to_numpy(), raw['Time'].to_numpy(),
+        file_format['date_sep'], file_format['with_seconds']
+    )
+    if epoch_ns is None:
+        return None
+
+    return pd.DataFrame({
+        'Datetime': pd.DatetimeIndex(epoch_ns.view('datetime64[ns]')).tz_localize('UTC'),
+        'Open': raw['Open'].to_numpy(),
+        'High': raw['High'].to_numpy(),
+        'Low': raw['Low'].to_numpy(),
+        'Close': raw['Close'].to_numpy(),
+    })
+
+
+def read_bars_fast(file_path):
+    """Швидко прочитати M1 CSV у DataFrame з колонками Datetime (UTC), Open, High, Low, Close
+
+    Повертає None, якщо файл не підходить для швидкого шляху
+    (тоді використовується звичайне завантаження).
+    """
+    try:
+        file_format = sniff_format(file_path)
+        options = None if file_format is None else _read_options(file_format)
+        if options is None:
+            return None
+
+        raw = pd.read_csv(file_path, **options)
+        if raw.empty:
+            return None
+
+        return _to_bars(raw, file_format)
+    except (ValueError, TypeError, OSError, UnicodeError, pd.errors.ParserError):
+        return None
+
+
+def iter_bars_fast(file_path, chunk_rows):
+    """Читати M1 CSV частинами по chunk_rows рядків (DataFrame як у read_bars_fast)
+
+    Повертає генератор або None, якщо файл не підходить для швидкого шляху.
+    Якщо формат зміниться посеред файлу, генератор кидає ValueError.
+    """
+    try:
+        file_format = sniff_format(file_path)
+    except (OSError, UnicodeError):
+        return None
+    options = None if file_format is None else _read_options(file_format)
+    if options is None:
+        return None
+
+    def chunks():
+        with pd.read_csv(file_path, chunksize=chunk_rows, **options) as reader:
+            for raw in reader:
+                bars = _to_bars(raw, file_format)
+                if bars is None:
+                    raise ValueError(f"Некоректна дата/час у файлі {file_path}")
+                yield bars
+
+    return chunks()
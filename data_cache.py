@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Дисковий кеш завантажених даних
+Зберігає прочитані бари (Datetime в UTC, Open/High/Low/Close) у бінарному колоночному
+форматі .npz, ключ - шлях, розмір, mtime і хеш вмісту файлу плюс версія завантажувача.
+Індекс (шлях -> розмір, mtime, хеш) - окремий маленький файл на кожен шлях, записаний атомарно,
+тому паралельні процеси не перетирають записи один одного.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from tz_offsets import utc_ns
+
+# Збільшувати при кожній зміні формату прочитаних даних
+LOADER_VERSION = 2
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+INDEX_DIR = 'index'
+HASH_CHUNK = 1024 * 1024
+
+
+def file_digest(file_path):
+    """Хеш вмісту файлу (blake2b)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write(path, write):
+    """Записати файл через тимчасовий файл і os.replace"""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class DataCache:
+    """Кеш завантажених DataFrame з обмеженням розміру (витісняються найдавніше використані)"""
+
+    def __init__(self, directory, max_bytes, version=LOADER_VERSION):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        self.index_dir = os.path.join(directory, INDEX_DIR)
+
+    def _index_path(self, path):
+        name = hashlib.blake2b(path.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.index_dir, f'{name}.json')
+
+    def _read_index(self, index_path):
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_index(self, path, entry):
+        os.makedirs(self.index_dir, exist_ok=True)
+        _atomic_write(self._index_path(path), lambda f: f.write(json.dumps(entry).encode('utf-8')))
+
+    def key(self, file_path):
+        """Ключ кешу для файлу
+
+        Хеш вмісту перераховується лише коли змінились розмір або mtime файлу.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        entry = self._read_index(self._index_path(path))
+
+        if (entry and entry.get('path') == path
+                and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns):
+            digest = entry['digest']
+        else:
+            digest = file_digest(path)
+            # Папка кешу створюється вже тут, щоб store() після першого load() не хешував файл ще раз
+            try:
+                self._write_index(path, {'path': path, 'size': stat.st_size,
+                                         'mtime_ns': stat.st_mtime_ns, 'digest': digest})
+            except OSError as e:
+                print(f"⚠️ Не вдалося записати індекс кешу: {e}")
+
+        return f'{digest}-v{self.version}'
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def load(self, file_path):
+        """Завантажити DataFrame з кешу (None, якщо запису немає), Datetime в UTC"""
+        try:
+            entry_path = self._entry_path(self.key(file_path))
+        except OSError:
+            return None
+
+        try:
+            with np.load(entry_path) as data:
+                columns = {name: data[name] for name in PRICE_COLUMNS}
+                times = data['Datetime'].view('datetime64[ns]')
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile) as e:
+            # Пошкоджений запис видаляється, щоб файл прочитався заново і потрапив у кеш знову
+            print(f"⚠️ Пошкоджений запис кешу видалено: {e}")
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            return None
+
+        # Позначаємо запис як щойно використаний
+        os.utime(entry_path)
+
+        return pd.DataFrame({'Datetime': pd.DatetimeIndex(times).tz_localize('UTC'), **columns})
+
+    def store(self, file_path, df):
+        """Зберегти DataFrame (Datetime в UTC) у кеш і витіснити старі записи понад ліміт"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            key = self.key(file_path)
+
+            meta = {'version': self.version}
+            arrays = {name: df[name].to_numpy(dtype=np.float64) for name in PRICE_COLUMNS}
+            _atomic_write(self._entry_path(key), lambda f: np.savez(
+                f, Datetime=utc_ns(df['Datetime']), meta=np.array(json.dumps(meta)), **arrays))
+
+            self.evict()
+        except OSError as e:
+            print(f"⚠️ Не вдалося зберегти дані в кеш: {e}")
+
+    def entries(self):
+        """Записи кешу: список (path, size, mtime) від найдавніше використаного"""
+        if not os.path.isdir(self.directory):
+            return []
+        result = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                result.append((path, stat.st_size, stat.st_mtime))
+        return sorted(result, key=lambda entry: entry[2])
+
+    def index_paths(self):
+        """Файли індексу (по одному на шлях вихідного файлу)"""
+        if not os.path.isdir(self.index_dir):
+            return []
+        return [os.path.join(self.index_dir, name) for name in os.listdir(self.index_dir) if name.endswith('.json')]
+
+    def evict(self):
+        """Видалити найдавніше використані записи, поки кеш більший за max_bytes, і їхні рядки індексу"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = False
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed = True
+            except OSError:
+                continue
+        if removed:
+            self.prune_index()
+
+    def prune_index(self):
+        """Видалити рядки індексу, для яких немає запису кешу"""
+        for index_path in self.index_paths():
+            entry = self._read_index(index_path)
+            if entry is not None and os.path.exists(self._entry_path(f"{entry['digest']}-v{self.version}")):
+                continue
+            try:
+                os.remove(index_path)
+            except OSError:
+                continue
+
+    def clear(self):
+        """Очистити кеш повністю"""
+        for path, _, _ in self.entries():
+            os.remove(path)
+        for index_path in self.index_paths():
+            os.remove(index_path)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Кеш результатів аналізу окремих днів
+Ключ - хеш барів дня, High/Low попереднього дня, параметрів аналізу та версії логіки,
+тому однакові дні з різних файлів (перекриття, повторний експорт) не перераховуються
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+import numpy as np
+
+# Збільшувати при кожній зміні логіки analyze_day
+ANALYSIS_VERSION = 2
+
+# Як часто (у записах) перевіряти ліміт кешу
+EVICT_EVERY = 1000
+
+# Скільки звернень до кешу накопичувати перед записом last_used
+TOUCH_BATCH = 1000
+
+
+def day_key(times, opens, highs, lows, closes, prev_high, prev_low, parameters):
+    """Ключ дня: хеш барів, рівнів попереднього дня та параметрів аналізу"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(json.dumps(parameters, sort_keys=True).encode('utf-8'))
+    digest.update(np.array([prev_high, prev_low], dtype=np.float64).tobytes())
+    for values in (times, opens, highs, lows, closes):
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+class DayResultCache:
+    """Дисковий кеш (SQLite) результатів днів з витісненням найдавніше використаних
+
+    Час останнього використання оновлюється пачками (flush), а не окремою транзакцією на кожне читання.
+    """
+
+    def __init__(self, path, max_entries, version=ANALYSIS_VERSION):
+        self.path = path
+        self.max_entries = max_entries
+        self.version = version
+        self._connection = None
+        self._puts = 0
+        self._touched = {}  # ключ -> час останнього читання, ще не записаний у базу
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS days ('
+                'key TEXT PRIMARY KEY, version INTEGER, result BLOB, last_used REAL)'
+            )
+            self._connection.commit()
+        return self._connection
+
+    def get(self, key):
+        """Результат дня з кешу (None, якщо запису немає)"""
+        try:
+            row = self.connection.execute(
+                'SELECT result FROM days WHERE key = ? AND version = ?', (key, self.version)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH:
+                self.flush()
+            return pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError):
+            return None
+
+    def flush(self):
+        """Записати накопичені часи використання однією транзакцією"""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        try:
+            self.connection.executemany('UPDATE days SET last_used = ? WHERE key = ?',
+                                        [(used, key) for key, used in touched.items()])
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Не вдалося оновити час використання кешу днів: {e}")
+
+    def put(self, key, result):
+        """Зберегти результат дня"""
+        self._touched.pop(key, None)
+        try:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO days (key, version, result, last_used) VALUES (?, ?, ?, ?)',
+                (key, self.version, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), time.time())
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Не вдалося зберегти результат дня в кеш: {e}")
+            return
+
+        self._puts += 1
+        if self._puts % EVICT_EVERY == 0:
+            self.evict()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM days').fetchone()[0]
+
+    def evict(self):
+        """Видалити записи старих версій і найдавніше використані понад max_entries"""
+        self.flush()
+        try:
+            self.connection.execute('DELETE FROM days WHERE version != ?', (self.version,))
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                self.connection.execute(
+                    'DELETE FROM days WHERE key IN (SELECT key FROM days ORDER BY last_used LIMIT ?)', (excess,)
+                )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Не вдалося очистити кеш днів: {e}")
+
+    def clear(self):
+        """Очистити кеш повністю"""
+        self._touched = {}
+        self.connection.execute('DELETE FROM days')
+        self.connection.commit()
+
+    def close(self):
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Контекст аналізу одного дня
+Ліниво обчислює та кешує зрізи сесій, вікно після sweep та їх екстремуми,
+щоб усі перевірки дня використовували один і той самий зріз.
+Якщо аналізатор має індекс діапазонів для цих даних, екстремуми вікон беруться з нього за O(1)
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from kernels import first_touch
+from price_units import MISSING_HIGH, MISSING_LOW, to_units
+from session_index import day_number
+
+# Агрегати вікна: ціна відкриття/закриття, екстремуми та час їх першого досягнення
+WindowStats = namedtuple('WindowStats', ['open', 'high', 'low', 'close', 'high_time', 'low_time'])
+
+
+def window_stats(frame):
+    """Агрегати вікна (None для порожнього вікна)"""
+    if frame.empty:
+        return None
+
+    highs = frame['High']
+    lows = frame['Low']
+    times = frame['Datetime']
+
+    # argmax/argmin повертають перше входження екстремуму
+    high_pos = highs.argmax()
+    low_pos = lows.argmin()
+
+    return WindowStats(
+        open=frame['Open'].iloc[0],
+        high=highs.iloc[high_pos],
+        low=lows.iloc[low_pos],
+        close=frame['Close'].iloc[-1],
+        high_time=times.iloc[high_pos],
+        low_time=times.iloc[low_pos],
+    )
+
+
+class DayContext:
+    """Кеш вікон та агрегатів для одного торгового дня"""
+
+    def __init__(self, analyzer, df, date, london_end_hour=15):
+        self.analyzer = analyzer
+        self.df = df
+        self.date = date if isinstance(date, pd.Timestamp) else pd.Timestamp(date)
+        self.london_end_hour = london_end_hour
+        self._sessions = {}
+        self._session_stats = {}
+        self._after_sweep = {}
+        self._after_sweep_stats = {}
+
+    def session(self, start_hour, end_hour, day_offset=0):
+        """Зріз сесії [start_hour, end_hour) дня зі зсувом day_offset днів"""
+        key = (start_hour, end_hour, day_offset)
+        if key not in self._sessions:
+            date = self.date + pd.Timedelta(days=day_offset) if day_offset else self.date
+            self._sessions[key] = self.analyzer.get_session_data(self.df, date, start_hour, end_hour)
+        return self._sessions[key]
+
+    def range_index(self):
+        """Індекс діапазонів аналізатора для цих даних (None - агрегати рахуються по зрізах)"""
+        build = getattr(self.analyzer, 'build_range_index', None)
+        return build(self.df) if build is not None else None
+
+    def session_stats(self, start_hour, end_hour, day_offset=0):
+        """Агрегати сесії (None якщо даних немає)"""
+        key = (start_hour, end_hour, day_offset)
+        if key not in self._session_stats:
+            found, stats = False, None
+
+            # Готові агрегати з куба сесій, якщо він побудований для цих даних
+            cube = getattr(self.analyzer, 'session_cube', None)
+            if cube is not None and cube.matches(self.df):
+                date = self.date + pd.Timedelta(days=day_offset) if day_offset else self.date
+                found, stats = cube.lookup(date, start_hour, end_hour)
+
+            if not found:
+                ranges = self.range_index()
+                if ranges is not None:
+                    date = self.date + pd.Timedelta(days=day_offset) if day_offset else self.date
+                    stats = ranges.window_stats(*self.analyzer.session_index.bounds(date, start_hour, end_hour))
+                else:
+                    stats = window_stats(self.session(start_hour, end_hour, day_offset))
+            self._session_stats[key] = stats
+        return self._session_stats[key]
+
+    def _london_end(self, sweep_time):
+        if self.london_end_hour == 24:
+            return sweep_time.normalize() + pd.Timedelta(days=1)
+        return sweep_time.replace(hour=self.london_end_hour, minute=0, second=0, microsecond=0)
+
+    def after_sweep_bounds(self, sweep_time):
+        """Позиції [lo, hi) вікна після sweep у відсортованих даних індексу"""
+        times = self.analyzer.session_index.times
+        lo, hi = np.searchsorted(times, [pd.Timestamp(sweep_time).value, self._london_end(sweep_time).value],
+                                 side='right')
+        return int(lo), int(max(lo, hi))
+
+    def after_sweep(self, sweep_time):
+        """Бари після sweep до кінця Лондону (включно)"""
+        if sweep_time not in self._after_sweep:
+            if self.range_index() is not None:
+                # Дані відсортовані: вікно - позиційний зріз без маски
+                lo, hi = self.after_sweep_bounds(sweep_time)
+                window = self.df.iloc[lo:hi]
+            else:
+                # Вікно лежить у межах дня sweep, тому фільтруємо лише денний зріз
+                if day_number(sweep_time) == day_number(self.date):
+                    source = self.session(0, 24)
+                else:
+                    source = self.df
+                mask = (source['Datetime'] > sweep_time) & (source['Datetime'] <= self._london_end(sweep_time))
+                window = source[mask]
+            self._after_sweep[sweep_time] = window
+
+        # Рядки вікна враховуються кожному кроку, що його читає
+        profiler = getattr(self.analyzer, 'profiler', None)
+        if profiler is not None:
+            profiler.add_rows(len(self._after_sweep[sweep_time]))
+        return self._after_sweep[sweep_time]
+
+    def after_sweep_stats(self, sweep_time):
+        """Агрегати вікна після sweep (None якщо вікно порожнє)"""
+        if sweep_time not in self._after_sweep_stats:
+            ranges = self.range_index()
+            if ranges is not None:
+                self._after_sweep_stats[sweep_time] = ranges.window_stats(*self.after_sweep_bounds(sweep_time))
+            else:
+                self._after_sweep_stats[sweep_time] = window_stats(self.after_sweep(sweep_time))
+        return self._after_sweep_stats[sweep_time]
+
+    def touches(self, sweep_time, levels, tolerance):
+        """Чи торкнулись бари вікна після sweep кожного з рівнів (одиниці ціни) з допуском"""
+        window = self.after_sweep(sweep_time)
+        if window.empty:
+            return [False] * len(levels)
+        high, low = to_units(window['High'], MISSING_HIGH), to_units(window['Low'], MISSING_LOW)
+        return (first_touch(high, low, levels, tolerance) >= 0).tolist()
+
+    def after_touch_stats(self, sweep_time, level, tolerance):
+        """Агрегати барів вікна після sweep, що йдуть після першого дотику рівня (None, якщо таких немає)"""
+        window = self.after_sweep(sweep_time)
+        if window.empty:
+            return None
+        touch_pos = first_touch(to_units(window['High'], MISSING_HIGH), to_units(window['Low'], MISSING_LOW),
+                                level, tolerance)
+        if touch_pos < 0:
+            return None
+        touch_time = window['Datetime'].iloc[touch_pos]
+        return window_stats(window[window['Datetime'] > touch_time])
@@ -7,6 +7,7 @@
 import os
 import pandas as pd
 from datetime import datetime
+from result_formats import find_results, read_results
 
 def print_project_info():
     """Інформація про проект"""
@@ -55,7 +56,7 @@ def show_analysis_results():
     """Показати результати аналізу"""
     results_file = 'liquidity_analysis_results.xlsx'
     
-    if not os.path.exists(results_file):
+    if find_results(results_file) is None:
         print("❌ Файл результатів не знайдено!")
         print("   Запустіть: python liquidity_analyzer.py")
         return
@@ -64,8 +65,7 @@ def show_analysis_results():
     print("-" * 25)
     
     # Основні результати
-    df = pd.read_excel(results_file, sheet_name='Analysis_Results')
-    stats_df = pd.read_excel(results_file, sheet_name='Statistics')
+    df, stats_df = read_results(results_file)
     
     print(f"📅 Період аналізу: {df['date'].min()} - {df['date'].max()}")
     print(f"📊 Торгових днів: {len(df)}")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Швидкий запис таблиць у Excel (.xlsx)
+Аркуші пишуться потоком прямо в zip-архів блоками рядків: XML комірок будується по колонках
+з типізованих масивів (числа, логічні, дати, рядки через таблицю спільних рядків),
+без об'єктів комірок openpyxl. Вміст аркушів такий самий, як у DataFrame.to_excel(index=False),
+крім двох випадків: текст, що починається з '=', лишається текстом (openpyxl пише формулу),
+а символи, заборонені в XML, відкидаються (openpyxl падає з помилкою).
+Дати з часовою зоною пишуться як локальний час (to_excel їх не приймає).
+Заголовок оформлюється, як у to_excel pandas 1.x-2.x: жирний, з тонкою рамкою, по центру.
+"""
+
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+
+# Кількість рядків, що формуються і записуються за один раз
+CHUNK_ROWS = 20_000
+
+# Стилі комірок: 0 - загальний, 1 - дата й час, 2 - дата, 3 - заголовок (як у pandas)
+DATETIME_STYLE = 1
+DATE_STYLE = 2
+HEADER_STYLE = 3
+
+EXCEL_EPOCH_NS = pd.Timestamp('1899-12-30').value
+NS_PER_DAY = 86_400 * 10**9
+
+# Символи, заборонені в XML 1.0
+ILLEGAL_CHARACTERS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Символи, заборонені в назвах аркушів
+INVALID_TITLE = re.compile(r'[\\*?:/\[\]]')
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+STYLES_XML = (
+    XML_HEADER +
+    f'<styleSheet xmlns="{MAIN_NS}">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="YYYY-MM-DD HH:MM:SS"/>'
+    '<numFmt numFmtId="165" formatCode="YYYY-MM-DD"/>'
+    '</numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="top"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def column_letter(position):
+    """Літера колонки Excel за номером з нуля (0 -> A, 26 -> AA)"""
+    letters = ''
+    position += 1
+    while position:
+        position, remainder = divmod(position - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def excel_serial(nanoseconds):
+    """Дата/час (int64 ns) як число днів Excel"""
+    return (nanoseconds - EXCEL_EPOCH_NS) / NS_PER_DAY
+
+
+class SharedStrings:
+    """Таблиця спільних рядків книги"""
+
+    def __init__(self):
+        self.index = {}
+
+    def codes(self, values):
+        """Номери рядків у таблиці (нові рядки додаються в кінець)"""
+        index = self.index
+        return [index.setdefault(value, len(index)) for value in values]
+
+    def xml(self):
+        items = ''.join(
+            f'<si><t xml:space="preserve">{escape(ILLEGAL_CHARACTERS.sub("", value))}</t></si>' for value in self.index
+        )
+        count = len(self.index)
+        return XML_HEADER + f'<sst xmlns="{MAIN_NS}" count="{count}" uniqueCount="{count}">{items}</sst>'
+
+
+def value_cell(reference, value, strings):
+    """XML комірки для довільного значення (колонки типу object, пропуски та нескінченності)"""
+    if value is None or value is pd.NaT or (isinstance(value, (float, np.floating)) and value != value):
+        return ''
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        value = value.item() if isinstance(value, np.generic) else value
+        if value in (np.inf, -np.inf):
+            # Як inf_rep у DataFrame.to_excel
+            return f'<c r="{reference}" t="s"><v>{strings.codes(["inf" if value > 0 else "-inf"])[0]}</v></c>'
+        return f'<c r="{reference}"><v>{value!r}</v></c>'
+    if hasattr(value, 'hour'):
+        serial = excel_serial(pd.Timestamp(value).tz_localize(None).value)
+        return f'<c r="{reference}" s="{DATETIME_STYLE}"><v>{serial!r}</v></c>'
+    if hasattr(value, 'toordinal'):
+        serial = excel_serial(pd.Timestamp(value).value)
+        return f'<c r="{reference}" s="{DATE_STYLE}"><v>{serial!r}</v></c>'
+    return f'<c r="{reference}" t="s"><v>{strings.codes([str(value)])[0]}</v></c>'
+
+
+def column_cells(series, letter, first_row, strings):
+    """XML комірок колонки (порожній рядок - порожня комірка)"""
+    rows = range(first_row, first_row + len(series))
+    kind = series.dtype.kind
+
+    if kind == 'b':
+        return [f'<c r="{letter}{row}" t="b"><v>{int(value)}</v></c>' for row, value in zip(rows, series.tolist())]
+
+    if kind in 'iu':
+        return [f'<c r="{letter}{row}"><v>{value}</v></c>' for row, value in zip(rows, series.tolist())]
+
+    if kind == 'f':
+        values = series.to_numpy(dtype=np.float64)
+        if np.isfinite(values).all():
+            return [f'<c r="{letter}{row}"><v>{value!r}</v></c>' for row, value in zip(rows, values.tolist())]
+        return [value_cell(f'{letter}{row}', value, strings) for row, value in zip(rows, values.tolist())]
+
+    if kind == 'M':
+        datetimes = series.dt.tz_localize(None) if series.dt.tz is not None else series
+        serials = excel_serial(datetimes.to_numpy(dtype='datetime64[ns]').view(np.int64)).tolist()
+        return [
+            '' if missing else f'<c r="{letter}{row}" s="{DATETIME_STYLE}"><v>{serial!r}</v></c>'
+            for row, serial, missing in zip(rows, serials, series.isna().tolist())
+        ]
+
+    if kind != 'O' and pd.api.types.is_string_dtype(series.dtype):
+        # Рядкова колонка: кожне унікальне значення додається в таблицю спільних рядків один раз
+        codes, uniques = pd.factorize(series)
+        table = np.array(strings.codes(uniques.tolist()) + [-1])
+        return [
+            '' if code < 0 else f'<c r="{letter}{row}" t="s"><v>{code}</v></c>'
+            for row, code in zip(rows, table[codes].tolist())
+        ]
+
+    return [value_cell(f'{letter}{row}', value, strings) for row, value in zip(rows, series.tolist())]
+
+
+def write_sheet(archive, path, df, strings):
+    """Записати аркуш у zip-архів потоком, блоками по CHUNK_ROWS рядків"""
+    letters = [column_letter(position) for position in range(df.shape[1])]
+    header = ''.join(
+        f'<c r="{letter}1" s="{HEADER_STYLE}" t="s"><v>{code}</v></c>'
+        for letter, code in zip(letters, strings.codes([str(column) for column in df.columns]))
+    )
+
+    with archive.open(path, 'w', force_zip64=True) as stream:
+        stream.write(f'{XML_HEADER}<worksheet xmlns="{MAIN_NS}"><sheetData>'.encode('utf-8'))
+        if letters:
+            stream.write(f'<row r="1">{header}</row>'.encode('utf-8'))
+
+            for start in range(0, len(df), CHUNK_ROWS):
+                chunk = df.iloc[start:start + CHUNK_ROWS]
+                first_row = start + 2
+                columns = [
+                    column_cells(chunk.iloc[:, position], letter, first_row, strings)
+                    for position, letter in enumerate(letters)
+                ]
+                rows = ''.join(
+                    f'<row r="{row}">{"".join(cells)}</row>'
+                    for row, cells in zip(range(first_row, first_row + len(chunk)), zip(*columns))
+                )
+                stream.write(rows.encode('utf-8'))
+
+        stream.write(b'</sheetData></worksheet>')
+
+
+def write_excel(output_file, sheets):
+    """Записати аркуші {назва: DataFrame} у файл Excel (без індексу, як DataFrame.to_excel)"""
+    strings = SharedStrings()
+    names = list(sheets)
+    for name in names:
+        if not name or len(name) > 31 or INVALID_TITLE.search(name):
+            raise ValueError(f"Некоректна назва аркуша: {name!r}")
+    numbers = range(1, len(names) + 1)
+
+    with zipfile.ZipFile(output_file, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for number, name in zip(numbers, names):
+            write_sheet(archive, f'xl/worksheets/sheet{number}.xml', sheets[name], strings)
+
+        sheet_types = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{number}.xml" ContentType="{CONTENT_TYPE}.worksheet+xml"/>'
+            for number in numbers
+        )
+        archive.writestr('[Content_Types].xml', (
+            XML_HEADER +
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{CONTENT_TYPE}.sheet.main+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{CONTENT_TYPE}.styles+xml"/>'
+            f'<Override PartName="/xl/sharedStrings.xml" ContentType="{CONTENT_TYPE}.sharedStrings+xml"/>'
+            f'{sheet_types}</Types>'
+        ))
+        archive.writestr('_rels/.rels', (
+            XML_HEADER +
+            f'<Relationships xmlns="{PACKAGE_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ))
+
+        sheet_entries = ''.join(
+            f'<sheet name={quoteattr(name)} sheetId="{number}" r:id="rId{number}"/>'
+            for number, name in zip(numbers, names)
+        )
+        archive.writestr('xl/workbook.xml', (
+            XML_HEADER +
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}"><sheets>{sheet_entries}</sheets></workbook>'
+        ))
+
+        relationships = ''.join(
+            f'<Relationship Id="rId{number}" Type="{REL_NS}/worksheet" Target="worksheets/sheet{number}.xml"/>'
+            for number in numbers
+        )
+        archive.writestr('xl/_rels/workbook.xml.rels', (
+            XML_HEADER +
+            f'<Relationships xmlns="{PACKAGE_REL_NS}">{relationships}'
+            f'<Relationship Id="rId{len(names) + 1}" Type="{REL_NS}/styles" Target="styles.xml"/>'
+            f'<Relationship Id="rId{len(names) + 2}" Type="{REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+            '</Relationships>'
+        ))
+        archive.writestr('xl/styles.xml', STYLES_XML)
+        archive.writestr('xl/sharedStrings.xml', strings.xml())
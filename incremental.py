@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Інкрементальний аналіз
+Зберігає результати попереднього запуску, час останнього бару та High/Low кожного дня,
+а при надходженні нових барів перераховує лише нові дні та дні після змінених (через PDH/PDL)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from kernels import segment_extrema
+from results_schema import format_results, typed_results
+from session_index import NS_PER_DAY
+
+# Збільшувати при зміні логіки аналізу, щоб збережені результати перераховувались повністю
+STATE_VERSION = 3
+
+
+def day_levels(df, session_index):
+    """High/Low кожного дня (вікно 0-24, як у calculate_pdh_pdl): DataFrame з індексом номера дня"""
+    hour_bounds = session_index.hour_bounds
+    high, _ = segment_extrema(df['High'].to_numpy(dtype=np.float64), hour_bounds[:, 0], hour_bounds[:, 24], 'max')
+    low, _ = segment_extrema(df['Low'].to_numpy(dtype=np.float64), hour_bounds[:, 0], hour_bounds[:, 24], 'min')
+    return pd.DataFrame({'high': high, 'low': low}, index=pd.Index(session_index.days, name='day'))
+
+
+class IncrementalAnalysis:
+    """Сховище результатів з інкрементальним оновленням"""
+
+    def __init__(self, state_path, analyzer=None):
+        if analyzer is None:
+            from liquidity_analyzer import LiquidityAnalyzer
+            analyzer = LiquidityAnalyzer()
+        self.state_path = state_path
+        self.analyzer = analyzer
+        self.state = self._load_state()
+
+    def parameters(self):
+        """Параметри аналізу, від яких залежать результати"""
+        return {
+            'version': STATE_VERSION,
+            'pip_size': self.analyzer.pip_size,
+            'tolerance': self.analyzer.tolerance,
+            'sessions': {name: (hours['start'], hours['end']) for name, hours in Config.SESSIONS.items()},
+        }
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return None
+        try:
+            return pd.read_pickle(self.state_path)
+        except Exception as e:
+            print(f"⚠️ Не вдалося прочитати збережені результати {self.state_path}: {e}")
+            return None
+
+    def _save_state(self):
+        tmp_path = self.state_path + '.tmp'
+        pd.to_pickle(self.state, tmp_path)
+        os.replace(tmp_path, self.state_path)
+
+    @property
+    def results(self):
+        """Збережені результати по днях"""
+        return pd.DataFrame() if self.state is None else self.state['results']
+
+    def update(self, df, engine=None):
+        """Оновити результати за даними df
+
+        df - дані після load_data, що містять усі нові бари та повний день перед першим з них
+        (наприклад, вся історія з кешу або діапазон зі сховища барів).
+        Повертає (результати, список перерахованих дат).
+        """
+        index = self.analyzer.build_session_index(df)
+        if not index.valid:
+            raise ValueError("Інкрементальний аналіз потребує впорядкованих за часом даних")
+        if len(index.times) == 0:
+            return self.results, []
+
+        levels = day_levels(df, index)
+        state = self.state
+
+        if state is None or state['parameters'] != self.parameters():
+            print("Повний аналіз (збережених результатів немає або змінились параметри)")
+            results = self.analyzer.analyze_period(df, engine=engine)
+            recomputed = [pd.Timestamp(day * NS_PER_DAY) for day in index.days]
+            stored_levels = levels
+        else:
+            stored_levels = state['levels']
+
+            # Дні з барами після останнього збереженого
+            new_days = np.unique(index.times[index.times > state['last_timestamp']] // NS_PER_DAY)
+
+            # Дні, High/Low яких змінились (або яких ще не було)
+            previous = stored_levels.reindex(levels.index)
+            unchanged = previous['high'].eq(levels['high']) & previous['low'].eq(levels['low'])
+            changed = levels.index[~unchanged].to_numpy()
+
+            # Наступний день після зміненого залежить від нього через PDH/PDL
+            affected = np.union1d(np.union1d(new_days, changed), changed + 1)
+            affected = affected[np.isin(affected, index.days)]
+            recomputed = [pd.Timestamp(day * NS_PER_DAY) for day in affected]
+
+            print(f"Інкрементальний аналіз: перераховую {len(recomputed)} днів")
+            day_results = []
+            for date in recomputed:
+                day_result = self.analyzer.analyze_day(df, date)
+                if day_result:
+                    day_results.append(day_result)
+            if self.analyzer.day_cache is not None:
+                self.analyzer.day_cache.flush()
+
+            # Замінюємо перераховані дні; збережені дні повертаються до звичного вигляду,
+            # щоб вся таблиця приводилась до типізованої схеми один раз, як в analyze_period
+            dates = {date.strftime('%Y-%m-%d') for date in recomputed}
+            kept = state['results']
+            if not kept.empty:
+                kept = format_results(kept[~kept['date'].isin(dates)])
+            frames = [frame for frame in (kept, pd.DataFrame(day_results)) if not frame.empty]
+            results = pd.DataFrame([])
+            if frames:
+                results = typed_results(pd.concat(frames, ignore_index=True))
+                results = results.sort_values('date', kind='stable').reset_index(drop=True)
+
+            stored_levels = levels.combine_first(stored_levels)
+
+        self.state = {
+            'parameters': self.parameters(),
+            'last_timestamp': int(max(index.times[-1], state['last_timestamp'] if state else index.times[-1])),
+            'levels': stored_levels,
+            'results': results,
+        }
+        self._save_state()
+        return results, recomputed
+
+
+def main():
+    """Нічне оновлення: python incremental.py <файл_стану> <файл_даних> [<результати.xlsx>]"""
+    from liquidity_analyzer import LiquidityAnalyzer
+
+    if len(sys.argv) < 3:
+        print("💡 Використання: python incremental.py <файл_стану> <файл_даних> [<результати.xlsx>]")
+        return
+
+    analyzer = LiquidityAnalyzer()
+    df = analyzer.load_data(sys.argv[2])
+    if df is None:
+        print("❌ Не вдалося завантажити дані")
+        return
+
+    incremental = IncrementalAnalysis(sys.argv[1], analyzer)
+    results, recomputed = incremental.update(df)
+    print(f"✅ Перераховано днів: {len(recomputed)}, всього результатів: {len(results)}")
+
+    if len(sys.argv) > 3:
+        analyzer.save_results(results, sys.argv[3])
+
+
+if __name__ == "__main__":
+    main()
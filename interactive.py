@@ -10,6 +10,8 @@ import pandas as pd
 from datetime import datetime
 from config import Config
 from validator import validate_input_file
+from result_formats import find_results, read_results
+from result_statistics import cube_table, statistics_cube
 
 def print_header():
     """Виведення заголовку"""
@@ -63,8 +65,8 @@ def run_analysis():
         # Коротка статистика
         print(f"\n📊 Коротка статистика:")
         print(f"   Оброблено днів: {len(results)}")
-        print(f"   London Sweep High: {(results['london_sweep_high'] == 'Yes').sum()}")
-        print(f"   London Sweep Low: {(results['london_sweep_low'] == 'Yes').sum()}")
+        print(f"   London Sweep High: {results['london_sweep_high'].sum()}")
+        print(f"   London Sweep Low: {results['london_sweep_low'].sum()}")
         print(f"   Continue: {(results['sweep_type'] == 'Continue').sum()}")
         print(f"   Sweep and Reverse: {(results['sweep_type'] == 'Sweep and Reverse').sum()}")
         
@@ -75,14 +77,13 @@ def show_results():
     """Показати результати"""
     print("\n📊 РЕЗУЛЬТАТИ АНАЛІЗУ")
     
-    if not os.path.exists(Config.DEFAULT_OUTPUT_FILE):
+    if find_results(Config.DEFAULT_OUTPUT_FILE) is None:
         print(f"❌ Файл результатів {Config.DEFAULT_OUTPUT_FILE} не знайдено!")
         print("   Спочатку запустіть аналіз (опція 2)")
         return
     
     try:
-        df = pd.read_excel(Config.DEFAULT_OUTPUT_FILE, sheet_name='Analysis_Results')
-        stats_df = pd.read_excel(Config.DEFAULT_OUTPUT_FILE, sheet_name='Statistics')
+        df, stats_df = read_results(Config.DEFAULT_OUTPUT_FILE)
         
         print(f"📅 Період: {df['date'].min()} - {df['date'].max()}")
         print(f"📊 Оброблено днів: {len(df)}")
@@ -102,26 +103,25 @@ def show_detailed_stats():
     """Детальна статистика"""
     print("\n📈 ДЕТАЛЬНА СТАТИСТИКА")
     
-    if not os.path.exists(Config.DEFAULT_OUTPUT_FILE):
+    if find_results(Config.DEFAULT_OUTPUT_FILE) is None:
         print(f"❌ Файл результатів не знайдено!")
         return
     
     try:
-        df = pd.read_excel(Config.DEFAULT_OUTPUT_FILE, sheet_name='Analysis_Results')
-        stats_df = pd.read_excel(Config.DEFAULT_OUTPUT_FILE, sheet_name='Statistics')
+        df, stats_df, cube = read_results(Config.DEFAULT_OUTPUT_FILE, with_cube=True)
+        if cube is None:
+            # Файл збережено до появи куба статистики - рахуємо його з результатів
+            cube = statistics_cube(df)
         
         print("\n📊 Загальна статистика:")
         for _, row in stats_df.iterrows():
             print(f"   {row['Metric']:<25}: {row['Value']:>3} ({row['Percentage']:>6.1f}%)")
         
         print("\n📅 Аналіз по днях тижня:")
-        day_stats = df.groupby('day_of_week').agg({
-            'extension_pips': 'mean',
-            'sweep_type': lambda x: (x == 'Continue').sum()
-        }).round(1)
+        day_stats = cube_table(cube, 'weekday').round(1)
         
         for day, row in day_stats.iterrows():
-            print(f"   {day:<10}: {row['extension_pips']:>6.1f} пунктів, Continue: {int(row['sweep_type'])}")
+            print(f"   {day:<10}: {row['Extension Pips Mean']:>6.1f} пунктів, Continue: {int(row['Continue'])}")
         
         print(f"\n🎯 Кореляції:")
         print(f"   Asia Range vs Extension: {df[['asia_high', 'asia_low', 'extension_pips']].corr().iloc[0,2]:.3f}")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Векторизовані ядра для групових обчислень по сегментах масивів
+Сегмент - це напіввідкритий діапазон позицій [lo, hi) у відсортованому масиві барів
+"""
+
+import numpy as np
+
+
+def segment_positions(lo, hi):
+    """Розгорнути сегменти [lo, hi) у плоский масив позицій
+
+    Повертає (pos, seg, offsets, nonempty):
+    pos - позиції барів усіх непорожніх сегментів підряд,
+    seg - номер сегмента (серед непорожніх) для кожної позиції,
+    offsets - початок кожного непорожнього сегмента у pos,
+    nonempty - маска непорожніх сегментів.
+    """
+    lo = np.asarray(lo, dtype=np.int64)
+    hi = np.asarray(hi, dtype=np.int64)
+    nonempty = hi > lo
+    lengths = (hi - lo)[nonempty]
+    starts = lo[nonempty]
+
+    offsets = np.zeros(len(lengths), dtype=np.int64)
+    if len(lengths) > 1:
+        np.cumsum(lengths[:-1], out=offsets[1:])
+
+    seg = np.repeat(np.arange(len(lengths)), lengths)
+    pos = starts[seg] + (np.arange(len(seg)) - offsets[seg])
+
+    return pos, seg, offsets, nonempty
+
+
+def segment_extrema(values, lo, hi, kind='max'):
+    """Максимум/мінімум на кожному сегменті та позиція його першого входження
+
+    NaN пропускаються (як у pandas max/min). Для порожніх сегментів і сегментів лише з NaN
+    повертає NaN та позицію -1.
+    """
+    pos, seg, offsets, nonempty = segment_positions(lo, hi)
+    count = len(nonempty)
+
+    extremum = np.full(count, np.nan)
+    first_idx = np.full(count, -1, dtype=np.int64)
+
+    if len(pos) == 0:
+        return extremum, first_idx
+
+    seg_values = values[pos]
+    reducer = np.fmax if kind == 'max' else np.fmin
+    seg_extremum = reducer.reduceat(seg_values, offsets)
+
+    # Перше входження: мінімальна позиція серед барів, що дорівнюють екстремуму
+    candidates = np.where(seg_values == seg_extremum[seg], pos, np.iinfo(np.int64).max)
+    seg_first = np.minimum.reduceat(candidates, offsets)
+    seg_first[seg_first == np.iinfo(np.int64).max] = -1
+
+    extremum[nonempty] = seg_extremum
+    first_idx[nonempty] = seg_first
+
+    return extremum, first_idx
+
+
+def first_touch(high, low, levels, tolerance, lo=None, hi=None):
+    """Позиція першого бару, що торкнувся рівня з допуском (-1 якщо дотику немає)
+
+    Дотик: |High - level| <= tolerance або |Low - level| <= tolerance.
+
+    Без lo/hi весь масив - один сегмент, а levels - скаляр або список рівнів;
+    результат - позиція (або масив позицій для кожного рівня).
+    З lo/hi кожен сегмент [lo, hi) - окремий день/вікно, levels має форму (S,)
+    (один рівень на сегмент) або (S, K) (K рівнів на сегмент), і всі сегменти
+    та рівні обчислюються за один виклик.
+    """
+    # Цілі одиниці ціни не перетворюються: різниця з рівнем (можливо, з половиною одиниці) точна
+    high = np.asarray(high)
+    low = np.asarray(low)
+
+    single_segment = lo is None
+    if single_segment:
+        scalar_level = np.ndim(levels) == 0
+        levels = np.atleast_1d(np.asarray(levels, dtype=np.float64))[None, :]
+        lo, hi = [0], [len(high)]
+    else:
+        levels = np.asarray(levels, dtype=np.float64)
+
+    one_level = levels.ndim == 1
+    if one_level:
+        levels = levels[:, None]
+
+    pos, seg, offsets, nonempty = segment_positions(lo, hi)
+    first_idx = np.full(levels.shape, -1, dtype=np.int64)
+
+    if len(pos) > 0:
+        seg_levels = levels[nonempty][seg]
+        touched = ((np.abs(high[pos][:, None] - seg_levels) <= tolerance) |
+                   (np.abs(low[pos][:, None] - seg_levels) <= tolerance))
+
+        missing = np.iinfo(np.int64).max
+        candidates = np.where(touched, pos[:, None], missing)
+        seg_first = np.minimum.reduceat(candidates, offsets, axis=0)
+        seg_first[seg_first == missing] = -1
+        first_idx[nonempty] = seg_first
+
+    if one_level:
+        first_idx = first_idx[:, 0]
+    if single_segment:
+        first_idx = first_idx[0]
+        if scalar_level:
+            return int(first_idx[0])
+    return first_idx
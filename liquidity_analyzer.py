@@ -11,6 +11,26 @@ import numpy as np
 import os
 from datetime import datetime, timedelta
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from bar_store import BarStore
+from config import Config
+from csv_ingest import iter_bars_fast, read_bars_fast
+from data_cache import DataCache
+from day_cache import DayResultCache, day_key
+from day_context import DayContext
+from parameter_sweep import ParameterSweep, parameter_grid
+from price_units import price_units
+from range_index import BarRangeIndex
+from result_formats import write_results
+from result_statistics import statistics_cube, summary_statistics
+from results_schema import format_results, typed_results
+from session_cube import SessionCube
+from session_index import NS_PER_DAY, SessionIndex, day_number, local_ns
+from shared_bars import SharedBars
+from stage_profiler import StageProfiler, frame_rows
+from tz_offsets import OffsetTable, utc_ns
+from vectorized_engine import VectorizedEngine
 
 warnings.filterwarnings('ignore')
 
@@ -18,80 +38,253 @@ warnings.filterwarnings('ignore')
 class LiquidityAnalyzer:
     """Клас для аналізу ліквідності EUR/USD по торгових сесіях"""
     
-    def __init__(self):
+    ENGINES = ('loop', 'vectorized')
+    
+    # Етапи профілювання: метод -> кількість рядків етапу (None - рядки, переглянуті вкладеними етапами)
+    PROFILED_STAGES = {
+        'load_data': lambda df, *args: frame_rows(df),
+        'build_session_cube': lambda cube, df: len(df),
+        'analyze_period': lambda results, df, *args: len(df),
+        'analyze_day': None,
+        'calculate_asia_levels': None,
+        'calculate_pdh_pdl': None,
+        'check_frankfurt_sweep': None,
+        'check_london_sweep': None,
+        'determine_london_direction': None,
+        'determine_sweep_type': None,
+        'check_rebalance': None,
+        'calculate_extensions': None,
+        'check_retests': None,
+        'check_pdh_pdl_sweep': None,
+        'analyze_new_york_session': None,
+        'get_session_data': lambda frame, *args: frame_rows(frame),
+        'save_results': lambda _, results_df, *args: len(results_df),
+        'calculate_statistics': lambda _, results_df: len(results_df),
+        'calculate_statistics_cube': lambda _, results_df: len(results_df),
+    }
+    
+    def __init__(self, engine='loop', use_cache=None, profile=None):
+        if use_cache is None:
+            use_cache = Config.CACHE_ENABLED
+        if profile is None:
+            profile = Config.PROFILE_STAGES
         self.pip_size = 0.00010  # Розмір пункту для EUR/USD
         self.tolerance = 0.00030  # Допуск для Asia Mid (±3 пункти)
-        
+        self.engine = engine  # 'loop' - по днях, 'vectorized' - всі дні за один прохід
+        self.session_index = None  # Індекс позицій сесій для останнього завантаженого DataFrame
+        self.session_cube = None  # Агрегати сесій по днях для того ж DataFrame
+        self.range_index = None  # Індекс max High / min Low для того ж DataFrame (будується ліниво)
+        self.data_cache = DataCache(Config.CACHE_DIR, Config.CACHE_MAX_BYTES) if use_cache else None
+        self.day_cache = DayResultCache(os.path.join(Config.CACHE_DIR, Config.DAY_CACHE_FILE),
+                                        Config.DAY_CACHE_MAX_ENTRIES) if use_cache and Config.DAY_CACHE_ENABLED else None
+        self._price_arrays = None  # (індекс, Open, High, Low, Close) для ключів кешу днів
+        self.offset_table = None  # Таблиця зсувів часової зони для останнього завантаження
+        
+        # Профілювання етапів: методи обгортаються лише тут, вимкнене профілювання нічого не коштує
+        self.profiler = None
+        if profile:
+            self.profiler = StageProfiler()
+            self.profiler.instrument(self, self.PROFILED_STAGES)
+        
+    @property
+    def pip_units(self):
+        """Пункт в одиницях ціни (price_units)"""
+        return price_units(self.pip_size)
+    
+    @property
+    def tolerance_units(self):
+        """Допуск Asia Mid в одиницях ціни"""
+        return price_units(self.tolerance)
+    
     def load_data(self, file_path):
-        """Завантаження та попередня обробка даних"""
+        """Завантаження та попередня обробка даних
+        
+        Datetime - наївний локальний час брокера (без часової зони); назва зони - у df.attrs['timezone'].
+        """
         print(f"Завантажую дані з файлу: {file_path}")
         
         try:
-            # Определяем, есть ли заголовки в файле
-            with open(file_path, 'r', encoding='utf-8') as f:
-                first_line = f.readline().strip().lower()
-            has_header = ('date' in first_line and 'time' in first_line)
+            df = self._load_cached(file_path)
+            
+            if df is None:
+                df = self._load_frame(file_path)
+                if df is None:
+                    return None
+                if self.data_cache is not None:
+                    self.data_cache.store(file_path, df)
 
-            if file_path.endswith('.xlsx'):
-                # Для Excel завжди header=0 (зазвичай є заголовки)
-                df = pd.read_excel(file_path)
-            else:
-                if has_header:
-                    df = pd.read_csv(file_path)
-                else:
-                    df = pd.read_csv(file_path, header=None, names=['Date', 'Time', 'Open', 'High', 'Low', 'Close', 'Volume'])
+            df = self._to_local_time(df)
 
-            if df.empty:
-                print(f"❌ Файл пустой: {file_path}")
-                return None
+            print(f"Завантажено {len(df)} записів")
+            print(f"Період: з {df['Datetime'].min()} до {df['Datetime'].max()}")
 
-            # Об'єднання дати і часу з підтримкою різних форматів
-            parse_success = False
-            for date_fmt in ['%Y.%m.%d %H:%M', '%Y-%m-%d %H:%M', '%Y.%m.%d %H:%M:%S', '%Y-%m-%d %H:%M:%S']:
-                try:
-                    # Парсим дату как UTC
-                    df['Datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format=date_fmt, utc=True)
-                    parse_success = True
-                    break
-                except Exception:
-                    continue
-            if not parse_success:
-                print(f"❌ Ошибка при разборе дати/времени: не удалось определить формат даты/времени")
-                return None
+            # Індекс і куб сесій будуються один раз після завантаження
+            self.session_index = SessionIndex(df)
+            self.build_session_cube(df)
 
-            # Конвертуємо з UTC у локальний час брокера (Europe/Kyiv) з урахуванням DST
-            try:
-                import pytz
-                kyiv_tz = pytz.timezone('Europe/Kyiv')
-                df['Datetime'] = df['Datetime'].dt.tz_convert(kyiv_tz)
-            except ImportError:
-                # Если pytz не установлен, используем zoneinfo (Python 3.9+)
-                try:
-                    from zoneinfo import ZoneInfo
-                    df['Datetime'] = df['Datetime'].dt.tz_convert(ZoneInfo('Europe/Kyiv'))
-                except ImportError:
-                    print("❌ Не удалось импортировать pytz или zoneinfo для работы с часовыми зонами")
-                    print("💡 Устанавливаем pytz: pip install pytz")
-                    # Fallback: простое добавление 3 часов (без учета DST)
-                    df['Datetime'] = df['Datetime'].dt.tz_localize(None) + pd.Timedelta(hours=3)
+            return df
 
-            # Залишаємо тільки потрібні колонки
-            df = df[['Datetime', 'Open', 'High', 'Low', 'Close']].copy()
+        except Exception as e:
+            print(f"❌ Ошибка при загрузке файла {file_path}: {str(e)}")
+            return None
+    
+    def load_range(self, store, start=None, end=None):
+        """Завантажити з BarStore лише бари за дати [start, end] (плюс попередній день для PDH/PDL)"""
+        if not isinstance(store, BarStore):
+            store = BarStore(store)
+        
+        first_date = None if start is None else pd.Timestamp(start) - pd.Timedelta(days=1)
+        print(f"Завантажую дані зі сховища: {store.root} ({start or '...'} - {end or '...'})")
+        
+        df = store.read_range(first_date, end)
+        if df.empty:
+            print("❌ У сховищі немає даних за вказаний період")
+            return None
+        
+        print(f"Завантажено {len(df)} записів")
+        print(f"Період: з {df['Datetime'].min()} до {df['Datetime'].max()}")
+        
+        self.session_index = SessionIndex(df)
+        self.build_session_cube(df)
+        return df
+    
+    def analyze_range(self, store, start=None, end=None, engine=None):
+        """Аналіз діапазону дат зі сховища без завантаження всієї історії"""
+        df = self.load_range(store, start, end)
+        if df is None:
+            return pd.DataFrame()
+        
+        results = self.analyze_period(df, engine=engine)
+        if start is not None and not results.empty:
+            # Попередній день потрібен лише як PDH/PDL
+            results = results[results['date'] >= pd.Timestamp(start).strftime('%Y-%m-%d')].reset_index(drop=True)
+        return results
+    
+    def _load_cached(self, file_path):
+        """Дані з кешу (в UTC), якщо файл не змінювався (None інакше)"""
+        if self.data_cache is None or not os.path.isfile(file_path):
+            return None
+        
+        df = self.data_cache.load(file_path)
+        if df is not None:
+            print("⚡ Дані взято з кешу")
+        return df
+    
+    def _load_frame(self, file_path):
+        """Прочитати файл: колонки Datetime (UTC), Open, High, Low, Close, впорядковані за часом"""
+        # Швидкий шлях: CSV з датою/часом фіксованої ширини
+        df = None if file_path.endswith('.xlsx') else read_bars_fast(file_path)
+        
+        if df is None:
+            df = self._read_raw_data(file_path)
+            if df is None:
+                return None
+
+        # Залишаємо тільки потрібні колонки
+        df = df[['Datetime', 'Open', 'High', 'Low', 'Close']].copy()
 
-            # Сортуємо по даті
+        # Сортуємо по даті (пропускаємо, якщо дані вже впорядковані)
+        if not df['Datetime'].is_monotonic_increasing:
             df = df.sort_values('Datetime').reset_index(drop=True)
 
-            print(f"Завантажено {len(df)} записів")
-            print(f"Період: з {df['Datetime'].min()} до {df['Datetime'].max()}")
+        return df
+    
+    def build_offset_table(self, start_ns, end_ns):
+        """Таблиця зсувів локального часу брокера для UTC моментів [start_ns, end_ns]"""
+        if Config.TIMEZONE_MODE == 'fixed':
+            return OffsetTable.fixed(Config.UTC_OFFSET)
+        
+        try:
+            return OffsetTable.from_zone(Config.TIMEZONE, start_ns, end_ns)
+        except Exception as e:
+            print(f"❌ Не вдалося отримати переходи часової зони {Config.TIMEZONE}: {e}")
+            print(f"💡 Використовую постійний зсув UTC+{Config.UTC_OFFSET} (без урахування DST)")
+            return OffsetTable.fixed(Config.UTC_OFFSET)
+    
+    def _to_local_time(self, df):
+        """Конвертувати Datetime з UTC у наївний локальний час брокера (Europe/Kyiv з урахуванням DST)"""
+        utc = utc_ns(df['Datetime'])
+        if len(utc) == 0:
+            self.offset_table = self.build_offset_table(0, 0)
+        else:
+            self.offset_table = self.build_offset_table(utc[0], utc[-1])
+        
+        df['Datetime'] = self.offset_table.to_local(utc).view('datetime64[ns]')
+        df.attrs['timezone'] = self.offset_table.name
+        return df
+    
+    def _read_raw_data(self, file_path):
+        """Звичайне завантаження CSV/XLSX з перебором форматів дати (колонка Datetime в UTC)"""
+        # Определяем, есть ли заголовки в файле
+        with open(file_path, 'r', encoding='utf-8') as f:
+            first_line = f.readline().strip().lower()
+        has_header = ('date' in first_line and 'time' in first_line)
 
-            return df
+        if file_path.endswith('.xlsx'):
+            # Для Excel завжди header=0 (зазвичай є заголовки)
+            df = pd.read_excel(file_path)
+        else:
+            if has_header:
+                df = pd.read_csv(file_path)
+            else:
+                df = pd.read_csv(file_path, header=None, names=['Date', 'Time', 'Open', 'High', 'Low', 'Close', 'Volume'])
 
-        except Exception as e:
-            print(f"❌ Ошибка при загрузке файла {file_path}: {str(e)}")
+        if df.empty:
+            print(f"❌ Файл пустой: {file_path}")
+            return None
+
+        # Об'єднання дати і часу з підтримкою різних форматів
+        parse_success = False
+        for date_fmt in ['%Y.%m.%d %H:%M', '%Y-%m-%d %H:%M', '%Y.%m.%d %H:%M:%S', '%Y-%m-%d %H:%M:%S']:
+            try:
+                # Парсим дату как UTC
+                df['Datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format=date_fmt, utc=True)
+                parse_success = True
+                break
+            except Exception:
+                continue
+        if not parse_success:
+            print(f"❌ Ошибка при разборе дати/времени: не удалось определить формат даты/времени")
+            return None
+
+        return df
+    
+    def build_session_index(self, df):
+        """Побудувати індекс сесій для DataFrame, якщо його ще немає"""
+        if self.session_index is None or not self.session_index.matches(df):
+            self.session_index = SessionIndex(df)
+        return self.session_index
+    
+    def build_session_cube(self, df):
+        """Побудувати куб агрегатів сесій для DataFrame, якщо його ще немає"""
+        if self.session_cube is None or not self.session_cube.matches(df):
+            self.session_cube = SessionCube.build(df, session_index=self.build_session_index(df))
+        return self.session_cube
+    
+    def build_range_index(self, df):
+        """Індекс діапазонів для DataFrame з готовим індексом сесій (None для даних з часовою зоною)"""
+        if self.range_index is not None and self.range_index.matches(df):
+            return self.range_index
+        if self.session_index is None or not self.session_index.matches(df) or df['Datetime'].dt.tz is not None:
             return None
+        self.range_index = BarRangeIndex(df)
+        return self.range_index
+    
+    def use_session_cube(self, cube_path, df):
+        """Використати збережений куб сесій, якщо він побудований з тих самих даних"""
+        cube = SessionCube.load(cube_path)
+        if not cube.bind(df):
+            print(f"⚠️ Куб сесій {cube_path} не відповідає даним, буде перебудовано")
+            return self.build_session_cube(df)
+        self.session_cube = cube
+        return cube
     
     def get_session_data(self, df, date, start_hour, end_hour):
         """Отримати дані для конкретної сесії"""
+        # Швидкий шлях: позиційний зріз за готовим індексом
+        if self.session_index is not None and self.session_index.matches(df):
+            return self.session_index.slice(date, start_hour, end_hour)
+        
         # Конвертируем date в тот же тип что и df['Datetime']
         if df['Datetime'].dt.tz is not None:
             # Данные с timezone
@@ -127,90 +320,80 @@ class LiquidityAnalyzer:
         mask = (df['Datetime'] >= session_start) & (df['Datetime'] < session_end)
         return df[mask].copy()
     
-    def calculate_asia_levels(self, df, date):
+    def session_hours(self, name):
+        """Години сесії name з Config.SESSIONS: (початок, кінець) - ті самі, що у векторизованого рушія"""
+        hours = Config.SESSIONS[name]
+        return hours['start'], hours['end']
+    
+    def day_context(self, df, date):
+        """Створити контекст аналізу дня (кеш зрізів сесій і вікна після sweep)"""
+        return DayContext(self, df, date, london_end_hour=self.session_hours('london')[1])
+    
+    def calculate_asia_levels(self, df, date, ctx=None):
         """Розрахунок Asia High/Low/Mid для конкретної дати"""
-        asia_data = self.get_session_data(df, date, 2, 10)  # 02:00 - 10:00
+        if ctx is None:
+            ctx = self.day_context(df, date)
+        asia = ctx.session_stats(*self.session_hours('asia'))
         
-        if asia_data.empty:
+        if asia is None:
             return None, None, None
             
-        asia_high = asia_data['High'].max()
-        asia_low = asia_data['Low'].min()
+        asia_high = asia.high
+        asia_low = asia.low
         asia_mid = (asia_high + asia_low) / 2
         
         return asia_high, asia_low, asia_mid
     
-    def calculate_pdh_pdl(self, df, date):
+    def calculate_pdh_pdl(self, df, date, ctx=None):
         """Розрахунок PDH/PDL (попередній день)"""
-        # Получаем предыдущий день
-        if isinstance(date, pd.Timestamp):
-            prev_date = date - pd.Timedelta(days=1)
-        else:
-            prev_date = pd.Timestamp(date) - pd.Timedelta(days=1)
-            
-        prev_day_data = self.get_session_data(df, prev_date, 0, 24)  # Весь попередний день
+        if ctx is None:
+            ctx = self.day_context(df, date)
+        prev_day = ctx.session_stats(0, 24, day_offset=-1)  # Весь попередний день
         
-        if prev_day_data.empty:
+        if prev_day is None:
             return None, None
             
-        pdh = prev_day_data['High'].max()
-        pdl = prev_day_data['Low'].min()
+        pdh = prev_day.high
+        pdl = prev_day.low
         
         return pdh, pdl
     
-    def check_frankfurt_sweep(self, df, date, asia_high, asia_low):
-        """Перевірка Frankfurt Sweep (09:00-10:00)"""
-        frankfurt_data = self.get_session_data(df, date, 9, 10)
+    def check_frankfurt_sweep(self, df, date, asia_high, asia_low, ctx=None):
+        """Перевірка Frankfurt Sweep (типово 09:00-10:00)"""
+        if ctx is None:
+            ctx = self.day_context(df, date)
+        frankfurt = ctx.session_stats(*self.session_hours('frankfurt'))
         
-        if frankfurt_data.empty or asia_high is None or asia_low is None:
+        if frankfurt is None or asia_high is None or asia_low is None:
             return False, False, None, None
             
-        frankfurt_high = frankfurt_data['High'].max()
-        frankfurt_low = frankfurt_data['Low'].min()
-        
-        sweep_high = frankfurt_high >= (asia_high + self.pip_size)
-        sweep_low = frankfurt_low <= (asia_low - self.pip_size)
+        # Порівняння в цілих одиницях ціни: sweep рівно на пункт не губиться через похибку float
+        sweep_high = price_units(frankfurt.high) >= price_units(asia_high) + self.pip_units
+        sweep_low = price_units(frankfurt.low) <= price_units(asia_low) - self.pip_units
         
         # Знаходимо час sweep
-        sweep_high_time = None
-        sweep_low_time = None
-        
-        if sweep_high:
-            high_idx = frankfurt_data[frankfurt_data['High'] == frankfurt_high].index[0]
-            sweep_high_time = df.loc[high_idx, 'Datetime']
-            
-        if sweep_low:
-            low_idx = frankfurt_data[frankfurt_data['Low'] == frankfurt_low].index[0]
-            sweep_low_time = df.loc[low_idx, 'Datetime']
+        sweep_high_time = frankfurt.high_time if sweep_high else None
+        sweep_low_time = frankfurt.low_time if sweep_low else None
         
         return sweep_high, sweep_low, sweep_high_time, sweep_low_time
     
-    def check_london_sweep(self, df, date, asia_high, asia_low):
-        """Перевірка London Sweep (10:00-15:00)"""
-        london_data = self.get_session_data(df, date, 10, 15)
+    def check_london_sweep(self, df, date, asia_high, asia_low, ctx=None):
+        """Перевірка London Sweep (типово 10:00-15:00)"""
+        if ctx is None:
+            ctx = self.day_context(df, date)
+        london = ctx.session_stats(*self.session_hours('london'))
         
-        if london_data.empty or asia_high is None or asia_low is None:
+        if london is None or asia_high is None or asia_low is None:
             return False, False, None, None, None, None
             
-        london_high = london_data['High'].max()
-        london_low = london_data['Low'].min()
-        
-        sweep_high = london_high >= (asia_high + self.pip_size)
-        sweep_low = london_low <= (asia_low - self.pip_size)
+        sweep_high = price_units(london.high) >= price_units(asia_high) + self.pip_units
+        sweep_low = price_units(london.low) <= price_units(asia_low) - self.pip_units
         
         # Знаходимо час і ціну sweep
         sweep_price = None
         sweep_time = None
-        sweep_high_time = None
-        sweep_low_time = None
-        
-        if sweep_high:
-            high_idx = london_data[london_data['High'] == london_high].index[0]
-            sweep_high_time = df.loc[high_idx, 'Datetime']
-                
-        if sweep_low:
-            low_idx = london_data[london_data['Low'] == london_low].index[0]
-            sweep_low_time = df.loc[low_idx, 'Datetime']
+        sweep_high_time = london.high_time if sweep_high else None
+        sweep_low_time = london.low_time if sweep_low else None
             
         # Визначаємо який sweep відбувся першим та встановлюємо відповідну ціну
         if sweep_high and sweep_low:
@@ -229,35 +412,31 @@ class LiquidityAnalyzer:
         
         return sweep_high, sweep_low, sweep_price, sweep_time, sweep_high_time, sweep_low_time
     
-    def determine_london_direction(self, df, date, sweep_time, sweep_price):
+    def determine_london_direction(self, df, date, sweep_time, sweep_price, ctx=None):
         """Визначення основного напрямку руху в Лондоні"""
+        if ctx is None:
+            ctx = self.day_context(df, date)
         
         # Якщо є sweep - аналізуємо після sweep
         if sweep_time is not None and sweep_price is not None:
-            london_end = sweep_time.replace(hour=15, minute=0, second=0, microsecond=0)
-            after_sweep_data = df[(df['Datetime'] > sweep_time) & (df['Datetime'] <= london_end)]
+            after_sweep = ctx.after_sweep_stats(sweep_time)
             
-            if not after_sweep_data.empty:
-                max_high = after_sweep_data['High'].max()
-                min_low = after_sweep_data['Low'].min()
-                
-                up_move = max_high - sweep_price
-                down_move = sweep_price - min_low
+            if after_sweep is not None:
+                up_move = price_units(after_sweep.high) - price_units(sweep_price)
+                down_move = price_units(sweep_price) - price_units(after_sweep.low)
                 
                 return 'Long' if up_move > down_move else 'Short'
         
         # Якщо немає sweep - аналізуємо всю Лондонську сесію
-        london_data = self.get_session_data(df, date, 10, 15)  # 10:00 - 15:00
+        london = ctx.session_stats(*self.session_hours('london'))
         
-        if london_data.empty:
+        if london is None:
             return None
             
-        london_open = london_data.iloc[0]['Open']  # Відкриття Лондону о 10:00
-        london_high = london_data['High'].max()
-        london_low = london_data['Low'].min()
+        london_open = price_units(london.open)  # Відкриття Лондону
         
-        up_move = london_high - london_open
-        down_move = london_open - london_low
+        up_move = price_units(london.high) - london_open
+        down_move = london_open - price_units(london.low)
         
         return 'Long' if up_move > down_move else 'Short'
     
@@ -286,170 +465,143 @@ class LiquidityAnalyzer:
                 
         return 'No Sweep'
     
-    def check_rebalance(self, df, sweep_time, sweep_type, asia_mid, london_direction):
+    def check_rebalance(self, df, sweep_time, sweep_type, asia_mid, london_direction, ctx=None):
         """Перевірка Rebalance"""
         if sweep_type != 'Sweep and Reverse' or sweep_time is None:
             return 'No'
-            
-        # Дані після sweep до 15:00
-        london_end = sweep_time.replace(hour=15, minute=0, second=0, microsecond=0)
-        after_sweep_data = df[(df['Datetime'] > sweep_time) & (df['Datetime'] <= london_end)]
         
-        if after_sweep_data.empty:
-            return 'No'
+        if ctx is None:
+            ctx = self.day_context(df, sweep_time)
             
-        # Перевіряємо дотик до Asia Mid ±3 пункти
-        touched_mid = False
-        mid_touch_time = None
+        # Бари після дотику до Asia Mid ±3 пункти у вікні після sweep до кінця Лондону
+        mid = price_units(asia_mid)
+        after_mid = ctx.after_touch_stats(sweep_time, mid, self.tolerance_units)
         
-        for idx, row in after_sweep_data.iterrows():
-            if abs(row['High'] - asia_mid) <= self.tolerance or abs(row['Low'] - asia_mid) <= self.tolerance:
-                touched_mid = True
-                mid_touch_time = row['Datetime']
-                break
-                
-        if not touched_mid:
-            return 'No'
-            
-        # Перевіряємо чи після дотику ціна пішла проти основного руху
-        after_mid_data = after_sweep_data[after_sweep_data['Datetime'] > mid_touch_time]
-        
-        if after_mid_data.empty:
+        if after_mid is None:
             return 'No'
             
         # Логіка перевірки продовження руху проти основного напрямку
         if london_direction == 'Long':
             # Основний рух вгору, але після rebalance має йти вниз
-            min_after_mid = after_mid_data['Low'].min()
-            return 'Yes' if min_after_mid < (asia_mid - self.pip_size) else 'No'
+            min_after_mid = price_units(after_mid.low)
+            return 'Yes' if min_after_mid < mid - self.pip_units else 'No'
         else:
             # Основний рух вниз, але після rebalance має йти вгору
-            max_after_mid = after_mid_data['High'].max()
-            return 'Yes' if max_after_mid > (asia_mid + self.pip_size) else 'No'
+            max_after_mid = price_units(after_mid.high)
+            return 'Yes' if max_after_mid > mid + self.pip_units else 'No'
     
-    def calculate_extensions(self, df, date, sweep_time, sweep_price, sweep_high, sweep_low, asia_range):
+    def calculate_extensions(self, df, date, sweep_time, sweep_price, sweep_high, sweep_low, asia_range, ctx=None):
         """Розрахунок розширень після sweep або від початку Лондону"""
         if asia_range == 0:
             return 0, 0, None, None, 0, 0
+        
+        if ctx is None:
+            ctx = self.day_context(df, date)
+        
+        # Рухи рахуються в одиницях ціни, пункти і відсотки - відношення цілих
+        pip = self.pip_units
             
         # Якщо є sweep - рахуємо від sweep
         if sweep_time is not None and sweep_price is not None:
-            # Дані після sweep до 15:00
-            london_end = sweep_time.replace(hour=15, minute=0, second=0, microsecond=0)
-            after_sweep_data = df[(df['Datetime'] > sweep_time) & (df['Datetime'] <= london_end)]
+            # Дані після sweep до кінця Лондону
+            after_sweep = ctx.after_sweep_stats(sweep_time)
             
-            if after_sweep_data.empty:
+            if after_sweep is None:
                 return 0, 0, None, None, 0, 0
                 
-            max_high = after_sweep_data['High'].max()
-            min_low = after_sweep_data['Low'].min()
+            max_high = price_units(after_sweep.high)
+            min_low = price_units(after_sweep.low)
+            sweep_price = price_units(sweep_price)
             
             # Час досягнення максимуму і мінімуму
-            max_time = after_sweep_data[after_sweep_data['High'] == max_high]['Datetime'].iloc[0]
-            min_time = after_sweep_data[after_sweep_data['Low'] == min_low]['Datetime'].iloc[0]
+            max_time = after_sweep.high_time
+            min_time = after_sweep.low_time
             
             # Розширення в пунктах від sweep price
             if sweep_high:
-                extension_pips = (max_high - sweep_price) / self.pip_size
-                reverse_pips = (sweep_price - min_low) / self.pip_size
+                extension_pips = (max_high - sweep_price) / pip
+                reverse_pips = (sweep_price - min_low) / pip
             else:
-                extension_pips = (sweep_price - min_low) / self.pip_size
-                reverse_pips = (max_high - sweep_price) / self.pip_size
+                extension_pips = (sweep_price - min_low) / pip
+                reverse_pips = (max_high - sweep_price) / pip
                 
         else:
-            # Якщо немає sweep - рахуємо від початку Лондону (10:00)
-            london_data = self.get_session_data(df, date, 10, 15)  # 10:00 - 15:00
+            # Якщо немає sweep - рахуємо від початку Лондону
+            london = ctx.session_stats(*self.session_hours('london'))
             
-            if london_data.empty:
+            if london is None:
                 return 0, 0, None, None, 0, 0
                 
-            london_open = london_data.iloc[0]['Open']  # Ціна на 10:00
-            max_high = london_data['High'].max()
-            min_low = london_data['Low'].min()
+            london_open = price_units(london.open)  # Ціна на відкритті Лондону
+            max_high = price_units(london.high)
+            min_low = price_units(london.low)
             
             # Час досягнення максимуму і мінімуму
-            max_time = london_data[london_data['High'] == max_high]['Datetime'].iloc[0]
-            min_time = london_data[london_data['Low'] == min_low]['Datetime'].iloc[0]
+            max_time = london.high_time
+            min_time = london.low_time
             
-            # Розширення в пунктах від London Open (10:00)
+            # Розширення в пунктах від London Open
             up_move = max_high - london_open
             down_move = london_open - min_low
             
             if up_move > down_move:
                 # Основний рух вгору
-                extension_pips = up_move / self.pip_size
-                reverse_pips = down_move / self.pip_size
+                extension_pips = up_move / pip
+                reverse_pips = down_move / pip
             else:
                 # Основний рух вниз
-                extension_pips = down_move / self.pip_size
-                reverse_pips = up_move / self.pip_size
+                extension_pips = down_move / pip
+                reverse_pips = up_move / pip
             
         # Розширення у відсотках від Asia Range
-        extension_percent = (extension_pips * self.pip_size / asia_range) * 100
-        reverse_percent = (reverse_pips * self.pip_size / asia_range) * 100
+        asia_range = price_units(asia_range)
+        extension_percent = (extension_pips * pip / asia_range) * 100
+        reverse_percent = (reverse_pips * pip / asia_range) * 100
         
         return extension_pips, extension_percent, max_time, min_time, reverse_pips, reverse_percent
     
-    def check_retests(self, df, sweep_time, sweep_price, asia_mid):
+    def check_retests(self, df, sweep_time, sweep_price, asia_mid, ctx=None):
         """Перевірка retests"""
         if sweep_time is None:
             return 'No', 'No'
-            
-        # Дані після sweep до 15:00
-        london_end = sweep_time.replace(hour=15, minute=0, second=0, microsecond=0)
-        after_sweep_data = df[(df['Datetime'] > sweep_time) & (df['Datetime'] <= london_end)]
         
-        if after_sweep_data.empty:
-            return 'No', 'No'
+        if ctx is None:
+            ctx = self.day_context(df, sweep_time)
             
-        # Retest Asia Sweep Level
-        retest_sweep = 'No'
-        for idx, row in after_sweep_data.iterrows():
-            if abs(row['High'] - sweep_price) <= self.tolerance or abs(row['Low'] - sweep_price) <= self.tolerance:
-                retest_sweep = 'Yes'
-                break
-                
-        # Asia Mid Retest
-        retest_mid = 'No'
-        for idx, row in after_sweep_data.iterrows():
-            if abs(row['High'] - asia_mid) <= self.tolerance or abs(row['Low'] - asia_mid) <= self.tolerance:
-                retest_mid = 'Yes'
-                break
+        # Retest Asia Sweep Level та Asia Mid Retest за один прохід по вікну після sweep до кінця Лондону
+        sweep_touch, mid_touch = ctx.touches(
+            sweep_time, [price_units(sweep_price), price_units(asia_mid)], self.tolerance_units
+        )
+        retest_sweep = 'Yes' if sweep_touch else 'No'
+        retest_mid = 'Yes' if mid_touch else 'No'
                 
         return retest_sweep, retest_mid
     
-    def check_pdh_pdl_sweep(self, df, date, pdh, pdl):
+    def check_pdh_pdl_sweep(self, df, date, pdh, pdl, ctx=None):
         """Перевірка Sweep PDH/PDL"""
-        london_data = self.get_session_data(df, date, 10, 15)
+        if ctx is None:
+            ctx = self.day_context(df, date)
+        london = ctx.session_stats(*self.session_hours('london'))
         
-        if london_data.empty or pdh is None or pdl is None:
+        if london is None or pdh is None or pdl is None:
             return 'No', 'No', None, None
-            
-        london_high = london_data['High'].max()
-        london_low = london_data['Low'].min()
         
-        sweep_pdh = 'Yes' if london_high >= (pdh + self.pip_size) else 'No'
-        sweep_pdl = 'Yes' if london_low <= (pdl - self.pip_size) else 'No'
+        sweep_pdh = 'Yes' if price_units(london.high) >= price_units(pdh) + self.pip_units else 'No'
+        sweep_pdl = 'Yes' if price_units(london.low) <= price_units(pdl) - self.pip_units else 'No'
         
         # Час sweep
-        pdh_time = None
-        pdl_time = None
-        
-        if sweep_pdh == 'Yes':
-            high_idx = london_data[london_data['High'] == london_high].index[0]
-            pdh_time = df.loc[high_idx, 'Datetime']
-            
-        if sweep_pdl == 'Yes':
-            low_idx = london_data[london_data['Low'] == london_low].index[0]
-            pdl_time = df.loc[low_idx, 'Datetime']
+        pdh_time = london.high_time if sweep_pdh == 'Yes' else None
+        pdl_time = london.low_time if sweep_pdl == 'Yes' else None
         
         return sweep_pdh, sweep_pdl, pdh_time, pdl_time
     
-    def analyze_new_york_session(self, df, date, asia_high, asia_low, london_direction):
+    def analyze_new_york_session(self, df, date, asia_high, asia_low, london_direction, ctx=None):
         """Аналіз Нью-Йоркської сесії"""
-        ny_data = self.get_session_data(df, date, 15, 19)  # 15:00 - 19:00
+        if ctx is None:
+            ctx = self.day_context(df, date)
+        ny = ctx.session_stats(*self.session_hours('newyork'))
         
-        if ny_data.empty:
+        if ny is None:
             return {
                 'ny_direction': None,
                 'ny_status': None,
@@ -461,10 +613,10 @@ class LiquidityAnalyzer:
                 'ny_min_low_time': None
             }
             
-        # NY Open - перша свічка о 15:00
-        ny_open = ny_data.iloc[0]['Open']
-        ny_high = ny_data['High'].max()
-        ny_low = ny_data['Low'].min()
+        # NY Open - перша свічка сесії (ціни в одиницях)
+        ny_open = price_units(ny.open)
+        ny_high = price_units(ny.high)
+        ny_low = price_units(ny.low)
         
         # Визначення напрямку NY
         up_move = ny_high - ny_open
@@ -480,17 +632,17 @@ class LiquidityAnalyzer:
             ny_status = 'Reverse'
             
         # Розширення в пунктах
-        ny_up_extension_pips = up_move / self.pip_size
-        ny_down_extension_pips = down_move / self.pip_size
+        ny_up_extension_pips = up_move / self.pip_units
+        ny_down_extension_pips = down_move / self.pip_units
         
         # Розширення у відсотках від Asia Range
-        asia_range = asia_high - asia_low if (asia_high and asia_low) else 0
+        asia_range = price_units(asia_high - asia_low) if (asia_high and asia_low) else 0
         ny_up_extension_percent = (up_move / asia_range * 100) if asia_range > 0 else 0
         ny_down_extension_percent = (down_move / asia_range * 100) if asia_range > 0 else 0
         
         # Час досягнення максимуму і мінімуму
-        ny_max_high_time = ny_data[ny_data['High'] == ny_high]['Datetime'].iloc[0]
-        ny_min_low_time = ny_data[ny_data['Low'] == ny_low]['Datetime'].iloc[0]
+        ny_max_high_time = ny.high_time
+        ny_min_low_time = ny.low_time
         
         return {
             'ny_direction': ny_direction,
@@ -503,13 +655,61 @@ class LiquidityAnalyzer:
             'ny_min_low_time': ny_min_low_time.strftime('%H:%M') if ny_min_low_time is not None else None
         }
     
+    def day_cache_key(self, df, date):
+        """Ключ кешу результату дня (None, якщо дані не впорядковані за часом)"""
+        index = self.build_session_index(df)
+        if not index.valid:
+            return None
+        
+        # Масиви цін витягуються один раз для кожного індексу
+        if self._price_arrays is None or self._price_arrays[0] is not index:
+            self._price_arrays = (index,) + tuple(df[column].to_numpy(dtype=np.float64)
+                                                  for column in ('Open', 'High', 'Low', 'Close'))
+        _, opens, highs, lows, closes = self._price_arrays
+        
+        lo, hi = index.bounds(date, 0, 24)
+        prev_lo, prev_hi = index.bounds(pd.Timestamp(date) - pd.Timedelta(days=1), 0, 24)
+        
+        # PDH/PDL як у pandas max/min: бари без цін пропускаються
+        prev_high = np.fmax.reduce(highs[prev_lo:prev_hi]) if prev_hi > prev_lo else np.nan
+        prev_low = np.fmin.reduce(lows[prev_lo:prev_hi]) if prev_hi > prev_lo else np.nan
+        
+        # Години сесій - саме ті, що використовують кроки аналізу
+        parameters = {
+            'day': int(day_number(date)),
+            'pip_size': self.pip_size,
+            'tolerance': self.tolerance,
+            'sessions': {name: list(self.session_hours(name)) for name in Config.SESSIONS},
+        }
+        return day_key(index.times[lo:hi], opens[lo:hi], highs[lo:hi], lows[lo:hi], closes[lo:hi],
+                       prev_high, prev_low, parameters)
+    
     def analyze_day(self, df, date):
+        """Аналіз одного дня (результат береться з кешу днів, якщо день вже аналізувався)"""
+        key = self.day_cache_key(df, date) if self.day_cache is not None else None
+        if key is not None:
+            day_result = self.day_cache.get(key)
+            if day_result is not None:
+                return day_result
+        
+        day_result = self._analyze_day(df, date)
+        if key is not None and day_result:
+            self.day_cache.put(key, day_result)
+        return day_result
+    
+    def _analyze_day(self, df, date):
         """Аналіз одного дня"""
+        # Контекст дня: кожна сесія та вікно після sweep вибираються один раз
+        return self.analyze_context(self.day_context(df, date))
+    
+    def analyze_context(self, ctx):
+        """Аналіз дня за готовим контекстом (DayContext або контекст живого потоку барів)"""
+        df, date = ctx.df, ctx.date
         date_str = date.strftime('%Y-%m-%d')
         day_name = date.strftime('%A')
         
         # Розрахунок Asia рівнів
-        asia_high, asia_low, asia_mid = self.calculate_asia_levels(df, date)
+        asia_high, asia_low, asia_mid = self.calculate_asia_levels(df, date, ctx=ctx)
         
         if asia_high is None:
             return None  # Немає даних для цього дня
@@ -517,18 +717,18 @@ class LiquidityAnalyzer:
         asia_range = asia_high - asia_low
         
         # Розрахунок PDH/PDL
-        pdh, pdl = self.calculate_pdh_pdl(df, date)
+        pdh, pdl = self.calculate_pdh_pdl(df, date, ctx=ctx)
         
         # Frankfurt Sweep
         frankfurt_sweep_high, frankfurt_sweep_low, frankfurt_high_time, frankfurt_low_time = \
-            self.check_frankfurt_sweep(df, date, asia_high, asia_low)
+            self.check_frankfurt_sweep(df, date, asia_high, asia_low, ctx=ctx)
         
         # London Sweep
         london_sweep_high, london_sweep_low, sweep_price, sweep_time, london_high_time, london_low_time = \
-            self.check_london_sweep(df, date, asia_high, asia_low)
+            self.check_london_sweep(df, date, asia_high, asia_low, ctx=ctx)
         
         # Основний рух Лондону
-        london_direction = self.determine_london_direction(df, date, sweep_time, sweep_price)
+        london_direction = self.determine_london_direction(df, date, sweep_time, sweep_price, ctx=ctx)
         
         # Тип sweep
         sweep_type = self.determine_sweep_type(
@@ -537,22 +737,22 @@ class LiquidityAnalyzer:
         )
         
         # Rebalance
-        rebalance = self.check_rebalance(df, sweep_time, sweep_type, asia_mid, london_direction)
+        rebalance = self.check_rebalance(df, sweep_time, sweep_type, asia_mid, london_direction, ctx=ctx)
         
         # Розширення
         extension_pips, extension_percent, max_time, min_time, reverse_pips, reverse_percent = \
             self.calculate_extensions(
-                df, date, sweep_time, sweep_price, london_sweep_high, london_sweep_low, asia_range
+                df, date, sweep_time, sweep_price, london_sweep_high, london_sweep_low, asia_range, ctx=ctx
             )
         
         # Retests
-        retest_sweep, retest_mid = self.check_retests(df, sweep_time, sweep_price, asia_mid)
+        retest_sweep, retest_mid = self.check_retests(df, sweep_time, sweep_price, asia_mid, ctx=ctx)
         
         # PDH/PDL Sweep
-        sweep_pdh, sweep_pdl, pdh_time, pdl_time = self.check_pdh_pdl_sweep(df, date, pdh, pdl)
+        sweep_pdh, sweep_pdl, pdh_time, pdl_time = self.check_pdh_pdl_sweep(df, date, pdh, pdl, ctx=ctx)
         
         # Аналіз Нью-Йорку
-        ny_analysis = self.analyze_new_york_session(df, date, asia_high, asia_low, london_direction)
+        ny_analysis = self.analyze_new_york_session(df, date, asia_high, asia_low, london_direction, ctx=ctx)
         
         return {
             'date': date_str,
@@ -590,9 +790,32 @@ class LiquidityAnalyzer:
             **ny_analysis
         }
     
-    def analyze_period(self, df):
-        """Аналіз всього періоду"""
+    def analyze_period(self, df, engine=None, workers=None):
+        """Аналіз всього періоду (workers > 1 - паралельно по частинах днів)
+        
+        Результат - таблиця в типізованій схемі results_schema (звичний вигляд - format_results).
+        """
+        engine = engine or self.engine
+        if engine not in self.ENGINES:
+            raise ValueError(f"Невідомий рушій аналізу: {engine}")
+        
+        workers = workers or Config.ANALYSIS_WORKERS
+        if workers > 1:
+            results = self._analyze_parallel(df, engine, workers)
+            if results is not None:
+                return typed_results(results)
+        
+        return typed_results(self._analyze_days(df, engine))
+    
+    def _analyze_days(self, df, engine):
+        """Послідовний аналіз усіх днів: таблиця до приведення до типізованої схеми"""
+        if engine == 'vectorized':
+            print("Починаю аналіз (векторизований рушій)...")
+            return VectorizedEngine(self.pip_size, self.tolerance).analyze(df, self.session_index, typed=False)
+        
         print("Починаю аналіз...")
+        self.build_session_index(df)
+        self.build_session_cube(df)
         
         # Отримуємо унікальні дати
         df['Date'] = df['Datetime'].dt.date
@@ -607,69 +830,197 @@ class LiquidityAnalyzer:
             if day_result:
                 results.append(day_result)
         
+        if self.day_cache is not None:
+            self.day_cache.flush()
         return pd.DataFrame(results)
     
-    def analyze_data(self, df):
-        """Алиас для analyze_period (для совместимости с BatchLiquidityAnalyzer)"""
-        return self.analyze_period(df)
+    def _iter_local_chunks(self, file_path, chunk_rows):
+        """Частини файлу в локальному часі (весь файл одним шматком, якщо читати частинами не можна)"""
+        chunks = None if file_path.endswith('.xlsx') else iter_bars_fast(file_path, chunk_rows)
+        
+        # Перша частина читається одразу, щоб при невідповідному форматі перейти на звичайне завантаження
+        first = None
+        if chunks is not None:
+            try:
+                first = next(chunks, None)
+            except (ValueError, pd.errors.ParserError):
+                chunks = None
+        
+        if chunks is None:
+            print("⚠️ Формат файлу не підтримує потокове читання, завантажую файл повністю")
+            df = self.load_data(file_path)
+            if df is not None:
+                yield df
+            return
+        
+        if first is not None:
+            yield self._to_local_time(first)
+        for chunk in chunks:
+            yield self._to_local_time(chunk)
     
-    def save_results(self, results_df, output_file):
-        """Збереження результатів у Excel"""
-        print(f"Зберігаю результати у файл: {output_file}")
+    def iter_days(self, file_path, chunk_rows=None):
+        """Потокове завантаження по днях
+        
+        Читає файл частинами і видає (дата, бари) для кожного повного локального дня,
+        де бари - це попередній календарний день (для PDH/PDL) плюс сам день.
+        Незавершений останній день частини переноситься в наступну.
+        """
+        chunk_rows = chunk_rows or Config.STREAM_CHUNK_ROWS
+        print(f"Потокове читання файлу: {file_path} (по {chunk_rows} рядків)")
+        
+        carry = None  # Незавершений день з кінця попередньої частини
+        previous = None  # Бари попереднього повного дня
+        
+        def emit(day_frame, day):
+            date = pd.Timestamp(day * NS_PER_DAY)
+            if previous is not None and previous[0] == day - 1:
+                frame = pd.concat([previous[1], day_frame], ignore_index=True)
+            else:
+                frame = day_frame.reset_index(drop=True)
+            return date, frame
         
-        # Створюємо Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            # Основні результати
-            results_df.to_excel(writer, sheet_name='Analysis_Results', index=False)
+        for chunk in self._iter_local_chunks(file_path, chunk_rows):
+            buffer = chunk if carry is None else pd.concat([carry, chunk], ignore_index=True)
+            if buffer.empty:
+                continue
+            
+            days = local_ns(buffer['Datetime']) // NS_PER_DAY
+            if np.any(days[1:] < days[:-1]):
+                raise ValueError("Потоковий режим потребує впорядкованих за часом даних")
+            
+            starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+            ends = np.r_[starts[1:], len(days)]
+            
+            # Останній день частини може продовжуватись у наступній
+            for lo, hi in zip(starts[:-1], ends[:-1]):
+                day_frame = buffer.iloc[lo:hi]
+                yield emit(day_frame, days[lo])
+                previous = (days[lo], day_frame)
             
-            # Статистика
-            stats_df = self.calculate_statistics(results_df)
-            stats_df.to_excel(writer, sheet_name='Statistics', index=False)
+            carry = buffer.iloc[starts[-1]:]
         
-        print(f"Результати збережено у файл: {output_file}")
+        if carry is not None and not carry.empty:
+            yield emit(carry, local_ns(carry['Datetime'][:1])[0] // NS_PER_DAY)
     
-    def calculate_statistics(self, results_df):
-        """Розрахунок статистики"""
-        stats = []
-        
-        # Загальна статистика
-        total_days = len(results_df)
+    def analyze_stream(self, file_path, chunk_rows=None):
+        """Потоковий аналіз: генератор результатів по днях з обмеженим використанням пам'яті"""
+        for date, frame in self.iter_days(file_path, chunk_rows):
+            # Індекс сесій лише для двох днів у пам'яті
+            self.session_index = SessionIndex(frame)
+            self.session_cube = None
+            
+            day_result = self.analyze_day(frame, date)
+            if day_result:
+                yield day_result
         
-        # Frankfurt sweeps
-        frankfurt_high_count = (results_df['frankfurt_sweep_high'] == 'Yes').sum()
-        frankfurt_low_count = (results_df['frankfurt_sweep_low'] == 'Yes').sum()
+        if self.day_cache is not None:
+            self.day_cache.flush()
+    
+    def _analyze_parallel(self, df, engine, workers):
+        """Аналіз суміжних частин днів у процесах (None, якщо ділити дані не варто)
+        
+        Кожна частина містить ще й попередній календарний день для PDH/PDL,
+        результати частин об'єднуються в порядку дат, як при послідовному аналізі,
+        і приводяться до типізованої схеми один раз - уже після об'єднання.
+        Бари передаються воркерам через спільну пам'ять, а не копією DataFrame.
+        """
+        index = self.build_session_index(df)
+        if not index.valid or len(index.days) < 2 * workers:
+            return None
         
-        # London sweeps
-        london_high_count = (results_df['london_sweep_high'] == 'Yes').sum()
-        london_low_count = (results_df['london_sweep_low'] == 'Yes').sum()
+        shards = [days for days in np.array_split(index.days, workers) if len(days)]
+        print(f"Починаю аналіз ({engine}, {len(shards)} процесів)...")
+        
+        tasks = []
+        for days in shards:
+            lo = int(np.searchsorted(index.times, (days[0] - 1) * NS_PER_DAY, side='left'))
+            hi = int(np.searchsorted(index.times, (days[-1] + 1) * NS_PER_DAY, side='left'))
+            first_date = pd.Timestamp(days[0] * NS_PER_DAY).strftime('%Y-%m-%d')
+            tasks.append((lo, hi, first_date))
+        
+        # Блоки видаляються після завершення пулу, зокрема при помилці чи перериванні
+        with SharedBars.create(df) as bars, ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [executor.submit(_analyze_shard, bars.spec, lo, hi, first_date, engine, self.pip_size, self.tolerance,
+                                       self.profiler is not None)
+                       for lo, hi, first_date in tasks]
+            try:
+                parts = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        
+        # Етапи воркерів додаються до профілю; analyze_period враховується лише тут (загальний час)
+        if self.profiler is not None:
+            for _, stages in parts:
+                stages.pop('analyze_period', None)
+                self.profiler.merge(stages)
+        
+        frames = [part for part, _ in parts if not part.empty]
+        if not frames:
+            return pd.DataFrame([])
+        return pd.concat(frames, ignore_index=True)
+    
+    def analyze_data(self, df, engine=None, workers=None):
+        """Алиас для analyze_period (для совместимости с BatchLiquidityAnalyzer)"""
+        return self.analyze_period(df, engine=engine, workers=workers)
+    
+    def save_results(self, results_df, output_file, formats=None):
+        """Збереження результатів (формат за розширенням, formats - додаткові формати поруч)"""
+        print(f"Зберігаю результати у файл: {output_file}")
         
-        # Sweep types
-        continue_count = (results_df['sweep_type'] == 'Continue').sum()
-        reverse_count = (results_df['sweep_type'] == 'Sweep and Reverse').sum()
-        no_sweep_count = (results_df['sweep_type'] == 'No Sweep').sum()
+        # Основні результати, статистика та її куб (для переглядачів результатів);
+        # звичний вигляд (Yes/No, HH:MM) формується один раз, типізована таблиця йде у табличні формати
+        display_df = format_results(results_df)
+        stats_df = self.calculate_statistics(display_df)
+        cube_df = self.calculate_statistics_cube(display_df)
+        formats = Config.RESULT_FORMATS if formats is None else formats
+        for path in write_results(results_df, stats_df, output_file, formats, cube_df, display_df)[1:]:
+            print(f"Додатковий формат: {path}")
         
-        # Rebalance
-        rebalance_yes = (results_df['rebalance'] == 'Yes').sum()
-        
-        # Directions
-        long_count = (results_df['london_direction'] == 'Long').sum()
-        short_count = (results_df['london_direction'] == 'Short').sum()
-        
-        stats.extend([
-            {'Metric': 'Загальна кількість днів', 'Value': total_days, 'Percentage': 100.0},
-            {'Metric': 'Frankfurt Sweep High', 'Value': frankfurt_high_count, 'Percentage': round(frankfurt_high_count/total_days*100, 2)},
-            {'Metric': 'Frankfurt Sweep Low', 'Value': frankfurt_low_count, 'Percentage': round(frankfurt_low_count/total_days*100, 2)},
-            {'Metric': 'London Sweep High', 'Value': london_high_count, 'Percentage': round(london_high_count/total_days*100, 2)},
-            {'Metric': 'London Sweep Low', 'Value': london_low_count, 'Percentage': round(london_low_count/total_days*100, 2)},
-            {'Metric': 'Continue', 'Value': continue_count, 'Percentage': round(continue_count/total_days*100, 2)},
-            {'Metric': 'Sweep and Reverse', 'Value': reverse_count, 'Percentage': round(reverse_count/total_days*100, 2)},
-            {'Metric': 'No Sweep', 'Value': no_sweep_count, 'Percentage': round(no_sweep_count/total_days*100, 2)},
-            {'Metric': 'Rebalance Yes', 'Value': rebalance_yes, 'Percentage': round(rebalance_yes/total_days*100, 2)},
-            {'Metric': 'London Long', 'Value': long_count, 'Percentage': round(long_count/total_days*100, 2)},
-            {'Metric': 'London Short', 'Value': short_count, 'Percentage': round(short_count/total_days*100, 2)},
-        ])
-        
-        return pd.DataFrame(stats)
+        print(f"Результати збережено у файл: {output_file}")
+    
+    def stage_report(self):
+        """Звіт профілювання етапів (None, якщо профілювання вимкнене)"""
+        return self.profiler.report() if self.profiler is not None else None
+    
+    def sweep_parameters(self, df, grid=None):
+        """Рядок статистики для кожної комбінації параметрів (parameter_sweep.parameter_grid)"""
+        if grid is None:
+            grid = parameter_grid(pip_sizes=[self.pip_size], tolerances=[self.tolerance])
+        return ParameterSweep(df, self.build_session_index(df)).run(grid)
+    
+    def calculate_statistics(self, results_df):
+        """Розрахунок статистики"""
+        return summary_statistics(results_df)
+    
+    def calculate_statistics_cube(self, results_df):
+        """Статистика в розрізі днів тижня, місяців, років і типів sweep"""
+        return statistics_cube(results_df)
+
+
+def _analyze_shard(spec, lo, hi, first_date, engine, pip_size, tolerance, profile=False):
+    """Аналіз рядків [lo, hi) спільних барів у процесі-воркері
+
+    Повертає (таблицю результатів днів, починаючи з first_date, ще не типізовану; лічильники етапів або {}).
+    """
+    with SharedBars.attach(spec) as bars:
+        return _analyze_shard_frame(bars.frame(lo, hi), first_date, engine, pip_size, tolerance, profile)
+
+
+def _analyze_shard_frame(df, first_date, engine, pip_size, tolerance, profile=False):
+    """Аналіз частини днів: посилання на спільну пам'ять зникають разом з локальними змінними"""
+    analyzer = LiquidityAnalyzer(engine=engine, profile=profile)
+    analyzer.pip_size = pip_size
+    analyzer.tolerance = tolerance
+    analyzer.build_session_cube(df)
+    
+    results = analyzer._analyze_days(df, engine)
+    stages = analyzer.profiler.stages if analyzer.profiler is not None else {}
+    if results.empty:
+        return results, stages
+    # Перший день частини потрібен лише як попередній день для PDH/PDL
+    return results[results['date'] >= first_date].reset_index(drop=True), stages
 
 
 def main():
@@ -707,14 +1058,19 @@ def main():
     # Виведення короткої статистики
     print("\n📊 Коротка статистика:")
     print(f"Оброблено днів: {len(results)}")
-    print(f"Frankfurt Sweep High: {(results['frankfurt_sweep_high'] == 'Yes').sum()}")
-    print(f"Frankfurt Sweep Low: {(results['frankfurt_sweep_low'] == 'Yes').sum()}")
-    print(f"London Sweep High: {(results['london_sweep_high'] == 'Yes').sum()}")
-    print(f"London Sweep Low: {(results['london_sweep_low'] == 'Yes').sum()}")
+    print(f"Frankfurt Sweep High: {results['frankfurt_sweep_high'].sum()}")
+    print(f"Frankfurt Sweep Low: {results['frankfurt_sweep_low'].sum()}")
+    print(f"London Sweep High: {results['london_sweep_high'].sum()}")
+    print(f"London Sweep Low: {results['london_sweep_low'].sum()}")
     print(f"Continue: {(results['sweep_type'] == 'Continue').sum()}")
     print(f"Sweep and Reverse: {(results['sweep_type'] == 'Sweep and Reverse').sum()}")
     print(f"No Sweep: {(results['sweep_type'] == 'No Sweep').sum()}")
     
+    report = analyzer.stage_report()
+    if report is not None:
+        print("\n⏱️ Профіль етапів:")
+        print(report.to_string(index=False))
+    
     print(f"\n✅ Аналіз завершено! Результати збережено у файл: {output_file}")
     print("💡 Для массовой обработки используйте: python batch_analyzer.py")
 
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Живий аналіз ліквідності по одному M1 бару
+Стан дня (агрегати сесій, Asia High/Low/Mid, PDH/PDL, вікна після екстремумів Лондону з дотиками рівнів)
+оновлюється за O(1) на бар. Події (Asia, Frankfurt sweep, London sweep, rebalance touch, retest,
+напрямок Лондону і NY) видаються, щойно їх можна визначити, а в кінці дня - той самий словник,
+що й analyze_day (кроки аналізатора виконуються над живим контекстом дня).
+Джерело барів підключається окремо: сокет, іменований канал або хвіст CSV-файлу.
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from day_context import WindowStats
+from price_units import PRICE_SCALE, price_units
+from results_schema import typed_results
+from session_cube import cube_sessions
+from session_index import NS_PER_DAY, NS_PER_HOUR, NS_PER_MINUTE, hour_offset
+
+# Подія: вид, дата дня (YYYY-MM-DD), локальний час бару, що її визначив, і деталі
+LiveEvent = namedtuple('LiveEvent', ['kind', 'date', 'time', 'details'])
+
+# Рядок бару: дата, час (UTC), Open, High, Low, Close[, Volume] - як у M1 CSV (порожня ціна - NaN)
+BAR_LINE = re.compile(
+    r'^\s*(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})[ ,;T](\d{1,2}):(\d{2})(?::(\d{2}))?'
+    r'[,;]([^,;]*)[,;]([^,;]*)[,;]([^,;]*)[,;]([^,;\s]*)'
+)
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def parse_bar_line(line):
+    """Рядок CSV -> (UTC ns, open, high, low, close) або None для заголовка чи некоректного рядка"""
+    match = BAR_LINE.match(line)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second = (int(value or 0) for value in match.groups()[:6])
+    try:
+        days = datetime(year, month, day).toordinal() - EPOCH_ORDINAL
+        prices = tuple(float(value) if value.strip() else float('nan') for value in match.groups()[6:])
+    except ValueError:
+        return None
+    utc = days * NS_PER_DAY + hour * NS_PER_HOUR + minute * NS_PER_MINUTE + second * 1_000_000_000
+    return (utc,) + prices
+
+
+class RunningWindow:
+    """Агрегати вікна, що доповнюються по одному бару (екстремум - перше входження, NaN пропускаються)"""
+
+    __slots__ = ('open', 'high', 'low', 'close', 'high_time', 'low_time')
+
+    def __init__(self):
+        self.open = None
+
+    def add(self, bar_time, open_, high, low, close):
+        if self.open is None:
+            self.open = open_
+            self.high, self.high_time = high, bar_time
+            self.low, self.low_time = low, bar_time
+        else:
+            if high > self.high or (self.high != self.high and high == high):
+                self.high, self.high_time = high, bar_time
+            if low < self.low or (self.low != self.low and low == low):
+                self.low, self.low_time = low, bar_time
+        self.close = close
+
+    def stats(self):
+        """WindowStats як у DayContext (None для порожнього вікна)"""
+        if self.open is None:
+            return None
+        return WindowStats(self.open, self.high, self.low, self.close,
+                           pd.Timestamp(self.high_time), pd.Timestamp(self.low_time))
+
+
+class SweepWindow:
+    """Бари після поточного екстремуму Лондону до кінця Лондону (включно) і дотики рівнів у них
+
+    Новий екстремум Лондону починає нове вікно, тож у кінці Лондону вікно відповідає
+    DayContext.after_sweep для часу sweep.
+    """
+
+    __slots__ = ('start_time', 'window', 'touch_times', 'after_touch')
+
+    def __init__(self, start_time, levels):
+        self.start_time = start_time
+        self.window = RunningWindow()
+        self.touch_times = dict.fromkeys(levels)
+        self.after_touch = {level: RunningWindow() for level in levels}
+
+    def add(self, bar_time, bar, high_units, low_units, tolerance):
+        """Додати бар; повертає рівні, яких бар торкнувся вперше"""
+        touched = []
+        for level, touch_time in self.touch_times.items():
+            if touch_time is None:
+                if abs(high_units - level) <= tolerance or abs(low_units - level) <= tolerance:
+                    self.touch_times[level] = bar_time
+                    touched.append(level)
+            elif bar_time > touch_time:
+                self.after_touch[level].add(bar_time, *bar)
+        self.window.add(bar_time, *bar)
+        return touched
+
+
+class LiveDayContext:
+    """Контекст дня для LiquidityAnalyzer.analyze_context з агрегатами живого аналізатора"""
+
+    df = None
+
+    def __init__(self, live):
+        self.live = live
+        self.date = pd.Timestamp(live.day_start)
+
+    def session_stats(self, start_hour, end_hour, day_offset=0):
+        """Агрегати сесії (весь попередній день - для PDH/PDL)"""
+        if day_offset == -1 and (start_hour, end_hour) == (0, 24):
+            return self.live.previous_day.stats() if self.live.previous_day is not None else None
+        window = self.live.windows.get((start_hour, end_hour))
+        if day_offset or window is None:
+            raise ValueError(f"Живий аналіз не відстежує сесію {start_hour}-{end_hour} (зсув {day_offset})")
+        return window.stats()
+
+    def _sweep_window(self, sweep_time, levels=()):
+        for window in (self.live.high_window, self.live.low_window):
+            if window is not None and window.start_time == sweep_time.value and all(
+                    level in window.touch_times for level in levels):
+                return window
+        raise ValueError(f"Немає вікна після sweep {sweep_time}")
+
+    def after_sweep_stats(self, sweep_time):
+        return self._sweep_window(sweep_time).window.stats()
+
+    def touches(self, sweep_time, levels, tolerance):
+        window = self._sweep_window(sweep_time, levels)
+        return [window.touch_times[level] is not None for level in levels]
+
+    def after_touch_stats(self, sweep_time, level, tolerance):
+        window = self._sweep_window(sweep_time, [level])
+        return window.after_touch[level].stats() if window.touch_times[level] is not None else None
+
+
+class LiveAnalyzer:
+    """Автомат стану торгового дня: бари по одному, події одразу, результат дня як analyze_day
+
+    Бари мають надходити впорядкованими за часом; бари вже завершених днів пропускаються.
+    Сесії - Config.SESSIONS (ті самі години, що використовують кроки аналізатора).
+    """
+
+    def __init__(self, analyzer=None, sessions=None):
+        if analyzer is None:
+            from liquidity_analyzer import LiquidityAnalyzer
+            analyzer = LiquidityAnalyzer(use_cache=False)
+        self.analyzer = analyzer
+
+        hours = cube_sessions(sessions)
+        if hours['asia'][1] > hours['london'][0]:
+            raise ValueError("Живий аналіз потребує, щоб Азія закінчувалась до початку Лондону")
+        self.sessions = hours
+        self.bounds = {name: (hour_offset(start), hour_offset(end)) for name, (start, end) in hours.items()}
+        self.london_end = hours['london'][1] * NS_PER_HOUR  # вікно після sweep включає бар о кінці Лондону
+
+        # Моменти дня (зсув від початку доби), з яких визначаються події
+        asia_close = self.bounds['asia'][1]
+        london_close = self.london_end + 1
+        ny_close = max(self.bounds['newyork'][1], london_close)
+        # Результат дня залежить лише від сесій аналізу, тож визначений після закриття останньої з них
+        self.day_close = max([ny_close] + [end for name, (_, end) in self.bounds.items() if name != 'day'])
+        self.milestones = sorted([
+            (asia_close, self._close_asia),
+            (max(asia_close, self.bounds['frankfurt'][1]), self._close_frankfurt),
+            (london_close, self._close_london),
+            (ny_close, self._close_newyork),
+            (self.day_close, self._close_day),
+        ], key=lambda milestone: milestone[0])
+
+        self.results = []
+        self.skipped = 0
+        self.day = None
+        self.day_start = None
+        self.previous_day = None  # Агрегати попереднього календарного дня (PDH/PDL)
+        self._previous_number = None
+        self.offset_table = None
+        self._offset_range = (0, 0)
+        self._reset_day()
+
+    def _reset_day(self):
+        self.windows = {self.sessions[name]: RunningWindow() for name in self.sessions}
+        self.high_window = None
+        self.low_window = None
+        self.asia = None  # {'high', 'low', 'mid'} - ціни Азії після її закриття
+        self.levels = None  # (asia_high, asia_low, asia_mid) в одиницях ціни
+        self.london_direction = None
+        self.swept = set()
+        self.emitted = set()
+        self._next_milestone = 0
+
+    # --- Вхід барів ---
+
+    def update(self, bar_time, open_, high, low, close):
+        """Новий бар (наївний локальний час у ns); повертає список подій
+
+        Ціни зберігаються як np.float64, як у DataFrame пакетного аналізу: round() для float Python
+        округлює половини інакше, тож Asia Mid та інші ціни результату розходились би в останньому знаку.
+        """
+        day = bar_time // NS_PER_DAY
+        if self.day is not None and day < self.day:
+            self.skipped += 1
+            return []
+
+        events = []
+        if day != self.day:
+            if self.day is not None:
+                events += self._finish_day()
+            self._start_day(day)
+
+        offset = bar_time - self.day_start
+        events += self._advance(offset)
+        bar = (np.float64(open_), np.float64(high), np.float64(low), np.float64(close))
+        self._add_bar(bar_time, offset, bar, events)
+        return events
+
+    def update_utc(self, utc_ns, open_, high, low, close):
+        """Новий бар з часом UTC (як у M1 CSV): час переводиться в локальний час брокера"""
+        if not self._offset_range[0] <= utc_ns < self._offset_range[1]:
+            year = pd.Timestamp(utc_ns).year
+            self._offset_range = (pd.Timestamp(year=year, month=1, day=1).value,
+                                  pd.Timestamp(year=year + 1, month=1, day=1).value)
+            self.offset_table = self.analyzer.build_offset_table(*self._offset_range)
+        local = int(self.offset_table.to_local([utc_ns])[0])
+        return self.update(local, open_, high, low, close)
+
+    def update_line(self, line):
+        """Рядок M1 CSV (UTC); заголовки та некоректні рядки пропускаються"""
+        bar = parse_bar_line(line)
+        return self.update_utc(*bar) if bar is not None else []
+
+    def flush(self):
+        """Кінець потоку: завершити поточний день"""
+        if self.day is None:
+            return []
+        events = self._finish_day()
+        self.day = None
+        return events
+
+    def results_frame(self):
+        """Результати завершених днів як analyze_period (типізована схема)"""
+        return typed_results(pd.DataFrame(self.results))
+
+    # --- Стан дня ---
+
+    def _start_day(self, day):
+        if self._previous_number != day - 1:
+            self.previous_day = None
+        self.day = day
+        self.day_start = day * NS_PER_DAY
+        self._reset_day()
+
+    def _finish_day(self):
+        events = self._advance(NS_PER_DAY)
+        day_window = self.windows[self.sessions['day']]
+        self.previous_day = day_window if day_window.open is not None else None
+        self._previous_number = self.day
+        return events
+
+    def _advance(self, offset):
+        """Події всіх моментів дня до offset включно"""
+        events = []
+        while self._next_milestone < len(self.milestones) and self.milestones[self._next_milestone][0] <= offset:
+            events += self.milestones[self._next_milestone][1]()
+            self._next_milestone += 1
+        return events
+
+    def _event(self, kind, bar_time, **details):
+        return LiveEvent(kind, self.date_str, pd.Timestamp(bar_time), details)
+
+    @property
+    def date_str(self):
+        return pd.Timestamp(self.day_start).strftime('%Y-%m-%d')
+
+    def context(self):
+        """Контекст поточного дня для кроків аналізатора"""
+        return LiveDayContext(self)
+
+    def _add_bar(self, bar_time, offset, bar, events):
+        london_lo, london_hi = self.bounds['london']
+        in_london = london_lo <= offset < london_hi
+        london = self.windows[self.sessions['london']]
+
+        for name, (lo, hi) in self.bounds.items():
+            if lo <= offset < hi:
+                self.windows[self.sessions[name]].add(bar_time, *bar)
+
+        # Бар став новим екстремумом Лондону (або першим баром сесії)
+        new_high = in_london and london.high_time == bar_time
+        new_low = in_london and london.low_time == bar_time
+
+        if self.levels is None or not london_lo <= offset <= self.london_end:
+            return
+
+        # Вікна після екстремумів Лондону: старе вікно отримує бар, новий екстремум починає нове
+        high_units = price_units(bar[1])
+        low_units = price_units(bar[2])
+        tolerance = self.analyzer.tolerance_units
+        for side, window in (('high', self.high_window), ('low', self.low_window)):
+            if window is not None and bar_time > window.start_time:
+                for level in window.add(bar_time, bar, high_units, low_units, tolerance):
+                    if side in self.swept:
+                        events += self._touch_events(side, level, bar_time)
+
+        asia_high, asia_low, asia_mid = self.levels
+        if new_high:
+            self.high_window = SweepWindow(bar_time, (asia_high, asia_mid))
+        if new_low:
+            self.low_window = SweepWindow(bar_time, (asia_low, asia_mid))
+
+        # London sweep визначається першим баром, що пробив рівень Азії на пункт
+        pip = self.analyzer.pip_units
+        if new_high and 'high' not in self.swept and price_units(london.high) >= asia_high + pip:
+            self.swept.add('high')
+            events.append(self._event('london_sweep', bar_time, side='high', level=self.asia['high'],
+                                      price=london.high))
+        if new_low and 'low' not in self.swept and price_units(london.low) <= asia_low - pip:
+            self.swept.add('low')
+            events.append(self._event('london_sweep', bar_time, side='low', level=self.asia['low'],
+                                      price=london.low))
+
+    def _touch_events(self, side, level, bar_time):
+        """Rebalance touch (Asia Mid) і retest рівня sweep після London sweep - один раз на день"""
+        asia_high, asia_low, asia_mid = self.levels
+        kind = 'rebalance_touch' if level == asia_mid else 'retest'
+        if (kind, side) in self.emitted:
+            return []
+        self.emitted.add((kind, side))
+        name = 'asia_mid' if level == asia_mid else f'asia_{side}'
+        return [self._event(kind, bar_time, side=side, level=name, price=round(level / PRICE_SCALE, Config.PRECISION))]
+
+    # --- Моменти, з яких події визначені ---
+
+    def _close_asia(self):
+        asia = self.windows[self.sessions['asia']].stats()
+        if asia is None:
+            self.levels = None
+            return []
+        mid = (asia.high + asia.low) / 2
+        self.asia = {'high': asia.high, 'low': asia.low, 'mid': mid}
+        self.levels = (price_units(asia.high), price_units(asia.low), price_units(mid))
+        return [self._event('asia_range', self.day_start + self.bounds['asia'][1],
+                            high=asia.high, low=asia.low, mid=round(mid, Config.PRECISION))]
+
+    def _close_frankfurt(self):
+        if self.levels is None:
+            return []
+        ctx = self.context()
+        sweep_high, sweep_low, high_time, low_time = self.analyzer.check_frankfurt_sweep(
+            None, ctx.date, self.asia['high'], self.asia['low'], ctx=ctx
+        )
+        events = []
+        if sweep_high:
+            events.append(self._event('frankfurt_sweep', high_time.value, side='high', level=self.asia['high']))
+        if sweep_low:
+            events.append(self._event('frankfurt_sweep', low_time.value, side='low', level=self.asia['low']))
+        return events
+
+    def _close_london(self):
+        if self.levels is None:
+            return []
+        ctx = self.context()
+        sweep_high, sweep_low, sweep_price, sweep_time, _, _ = self.analyzer.check_london_sweep(
+            None, ctx.date, self.asia['high'], self.asia['low'], ctx=ctx
+        )
+        self.london_direction = self.analyzer.determine_london_direction(None, ctx.date, sweep_time, sweep_price, ctx=ctx)
+        sweep_type = self.analyzer.determine_sweep_type(
+            sweep_high, sweep_low, self.london_direction, self.asia['high'], self.asia['low'], sweep_price
+        )
+        return [self._event('london_direction', self.day_start + self.london_end,
+                            direction=self.london_direction, sweep_type=sweep_type)]
+
+    def _close_newyork(self):
+        if self.levels is None:
+            return []
+        ctx = self.context()
+        ny = self.analyzer.analyze_new_york_session(
+            None, ctx.date, self.asia['high'], self.asia['low'], self.london_direction, ctx=ctx
+        )
+        if ny['ny_direction'] is None:
+            return []
+        return [self._event('ny_direction', self.day_start + self.bounds['newyork'][1],
+                            direction=ny['ny_direction'], status=ny['ny_status'])]
+
+    def _close_day(self):
+        if self.levels is None:
+            return []
+        result = self.analyzer.analyze_context(self.context())
+        if not result:
+            return []
+        self.results.append(result)
+        return [self._event('day_result', self.day_start + self.day_close, result=result)]
+
+
+# --- Джерела барів: генератори рядків M1 CSV ---
+
+def csv_tail(path, follow=True, from_start=True, poll_interval=1.0):
+    """Рядки CSV-файлу, що дописується (як tail -f); follow=False - до кінця файлу"""
+    with open(path, encoding='utf-8') as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        partial = ''
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    if partial:
+                        yield partial
+                    return
+                time.sleep(poll_interval)
+                continue
+            # Незавершений рядок чекає решти
+            partial += line
+            if partial.endswith('\n'):
+                yield partial
+                partial = ''
+
+
+def named_pipe(path, reopen=True):
+    """Рядки з іменованого каналу (FIFO створюється, якщо його немає); після закриття письменника - знову чекає"""
+    if not os.path.exists(path):
+        os.mkfifo(path)
+    while True:
+        with open(path, encoding='utf-8') as pipe:
+            yield from pipe
+        if not reopen:
+            return
+
+
+def socket_lines(address, reconnect=True):
+    """Рядки з локального сокета: 'host:port' - TCP, інакше шлях Unix-сокета; з'єднання приймаються по одному"""
+    if ':' in address:
+        host, port = address.rsplit(':', 1)
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((host, int(port)))
+    else:
+        if os.path.exists(address):
+            os.unlink(address)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(address)
+    server.listen(1)
+    try:
+        while True:
+            connection, _ = server.accept()
+            with connection, connection.makefile('r', encoding='utf-8') as stream:
+                yield from stream
+            if not reconnect:
+                return
+    finally:
+        server.close()
+        if ':' not in address and os.path.exists(address):
+            os.unlink(address)
+
+
+FEEDS = {
+    'csv': csv_tail,
+    'pipe': named_pipe,
+    'socket': socket_lines,
+}
+
+EVENT_ICONS = {
+    'asia_range': '🌏',
+    'frankfurt_sweep': '🇩🇪',
+    'london_sweep': '🇬🇧',
+    'rebalance_touch': '⚖️',
+    'retest': '🔁',
+    'london_direction': '🧭',
+    'ny_direction': '🗽',
+    'day_result': '✅',
+}
+
+
+def print_event(event):
+    """Вивести подію одним рядком"""
+    icon = EVENT_ICONS.get(event.kind, '•')
+    if event.kind == 'day_result':
+        result = event.details['result']
+        text = f"{result['sweep_type']}, London {result['london_direction']}, NY {result['ny_direction']}"
+    else:
+        text = ', '.join(f"{key}={value}" for key, value in event.details.items())
+    print(f"{icon} {event.date} {event.time:%H:%M} {event.kind}: {text}", flush=True)
+
+
+def run(live, lines, on_event=print_event, on_result=None):
+    """Подати рядки джерела в живий аналізатор; on_result(dict) - для кожного завершеного дня"""
+    def handle(events):
+        for event in events:
+            on_event(event)
+            if on_result is not None and event.kind == 'day_result':
+                on_result(event.details['result'])
+
+    try:
+        for line in lines:
+            handle(live.update_line(line))
+    finally:
+        handle(live.flush())
+
+
+def main():
+    """Запуск: python live_analyzer.py csv дані.csv | pipe /tmp/bars | socket 127.0.0.1:9100"""
+    parser = argparse.ArgumentParser(description="Живий аналіз сесій по M1 барах (час UTC, формат M1 CSV)")
+    parser.add_argument('feed', choices=list(FEEDS), help="джерело барів")
+    parser.add_argument('source', help="файл CSV, шлях FIFO або адреса сокета (host:port чи шлях)")
+    parser.add_argument('--no-follow', action='store_true', help="для csv: прочитати файл до кінця і завершити")
+    parser.add_argument('--results', help="JSONL-файл, куди дописуються результати днів")
+    args = parser.parse_args()
+
+    lines = csv_tail(args.source, follow=not args.no_follow) if args.feed == 'csv' else FEEDS[args.feed](args.source)
+
+    def save_result(result):
+        with open(args.results, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+    print(f"📡 Живий аналіз: {args.feed} {args.source}")
+    try:
+        run(LiveAnalyzer(), lines, on_result=save_result if args.results else None)
+    except KeyboardInterrupt:
+        print("\n⏹️ Зупинено")
+
+
+if __name__ == "__main__":
+    main()
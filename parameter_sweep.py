@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Перебір параметрів аналізу: години сесій, поріг sweep (pip_size) і допуск (tolerance)
+Бари готуються один раз (int32 одиниці, календарні дні, sparse table High/Low), межі та екстремуми
+кожної варіації сесії рахуються один раз для всіх комбінацій, а кожна комбінація - це один прогін
+векторизованого рушія по днях. Результат - рядок статистики (як calculate_statistics) на комбінацію.
+"""
+
+import argparse
+import itertools
+import os
+import time
+
+import pandas as pd
+
+from config import Config
+from excel_writer import write_excel
+from result_statistics import metric_summary
+from vectorized_engine import PreparedBars, VectorizedEngine
+
+SWEEP_SHEET = 'Parameter_Sweep'
+
+
+def parse_hours(text):
+    """'1-9' -> (1, 9); сесія має лежати в межах доби"""
+    start, end = (int(part) for part in text.split('-'))
+    if not 0 <= start < end <= 24:
+        raise ValueError(f"Некоректні години сесії: {text} (потрібно 0 <= початок < кінець <= 24)")
+    return start, end
+
+
+def parameter_grid(sessions=None, pip_sizes=None, tolerances=None):
+    """Усі комбінації параметрів
+
+    sessions - {сесія: [(початок, кінець), ...]}; сесії, яких немає, беруться з Config.SESSIONS.
+    Повертає список словників {'sessions': {...}, 'pip_size': ..., 'tolerance': ...}.
+    """
+    sessions = sessions or {}
+    names = list(Config.SESSIONS)
+    variants = [
+        sessions.get(name) or [(Config.SESSIONS[name]['start'], Config.SESSIONS[name]['end'])]
+        for name in names
+    ]
+    pip_sizes = pip_sizes or [Config.PIP_SIZE]
+    tolerances = tolerances or [Config.TOLERANCE]
+
+    grid = []
+    for hours, pip_size, tolerance in itertools.product(itertools.product(*variants), pip_sizes, tolerances):
+        grid.append({
+            'sessions': {name: {'start': start, 'end': end} for name, (start, end) in zip(names, hours)},
+            'pip_size': pip_size,
+            'tolerance': tolerance,
+        })
+    return grid
+
+
+class ParameterSweep:
+    """Перебір комбінацій параметрів над одними підготовленими барами"""
+
+    def __init__(self, df, session_index=None):
+        self.bars = PreparedBars.from_frame(df, session_index, ranges=True)
+
+    def evaluate(self, sessions, pip_size, tolerance):
+        """Таблиця результатів для однієї комбінації (як analyze_period, типізована схема)"""
+        if self.bars is None:
+            return pd.DataFrame([])
+        return VectorizedEngine(pip_size, tolerance, sessions).evaluate(self.bars)
+
+    def run(self, grid, progress_every=500):
+        """Рядок статистики на кожну комбінацію grid (parameter_grid)"""
+        rows = []
+        started = time.perf_counter()
+        for number, combination in enumerate(grid, 1):
+            results = self.evaluate(combination['sessions'], combination['pip_size'], combination['tolerance'])
+
+            row = {}
+            for name, hours in combination['sessions'].items():
+                row[f'{name}_start'] = hours['start']
+                row[f'{name}_end'] = hours['end']
+            row['pip_size'] = combination['pip_size']
+            row['tolerance'] = combination['tolerance']
+            row.update(metric_summary(results))
+            rows.append(row)
+
+            if progress_every and number % progress_every == 0:
+                print(f"   ⏳ {number}/{len(grid)} комбінацій ({time.perf_counter() - started:.1f} с)")
+
+        return pd.DataFrame(rows)
+
+
+def save_sweep(table, output_file):
+    """Зберегти таблицю перебору: .xlsx - аркуш Parameter_Sweep, інакше CSV"""
+    if output_file.lower().endswith('.xlsx'):
+        write_excel(output_file, {SWEEP_SHEET: table})
+    else:
+        table.to_csv(output_file, index=False)
+
+
+def main():
+    """Запуск: python parameter_sweep.py дані.csv --asia 1-9,2-10 --london 9-14 --tolerances 0.0002,0.0003,0.0005"""
+    parser = argparse.ArgumentParser(description="Перебір годин сесій, порогу sweep і допуску Asia Mid")
+    parser.add_argument('input', help="файл M1 даних (як для analyze_period)")
+    for name in Config.SESSIONS:
+        hours = Config.SESSIONS[name]
+        parser.add_argument(f'--{name}', help=f"години через кому, напр. {hours['start']}-{hours['end']}")
+    parser.add_argument('--pips', help=f"пороги sweep (pip_size) через кому, типово {Config.PIP_SIZE}")
+    parser.add_argument('--tolerances', help=f"допуски через кому, типово {Config.TOLERANCE}")
+    parser.add_argument('--output', default='parameter_sweep.xlsx', help="файл результату (.xlsx або .csv)")
+    args = parser.parse_args()
+
+    def values(text, convert):
+        return [convert(part.strip()) for part in text.split(',') if part.strip()] if text else None
+
+    try:
+        sessions = {name: values(getattr(args, name), parse_hours) for name in Config.SESSIONS}
+        grid = parameter_grid(
+            {name: hours for name, hours in sessions.items() if hours},
+            values(args.pips, float),
+            values(args.tolerances, float),
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Аналізатор сам імпортує цей модуль, тому тут імпорт лише для запуску з командного рядка
+    from liquidity_analyzer import LiquidityAnalyzer
+
+    analyzer = LiquidityAnalyzer()
+    df = analyzer.load_data(args.input)
+    if df is None:
+        return
+
+    print(f"🔍 Перебір {len(grid)} комбінацій параметрів...")
+    started = time.perf_counter()
+    table = analyzer.sweep_parameters(df, grid)
+    print(f"✅ Готово за {time.perf_counter() - started:.1f} с")
+
+    save_sweep(table, args.output)
+    print(f"💾 Результати перебору збережено: {os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
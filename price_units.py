@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Цілочисельне представлення цін
+Ціни в перевірках - кількості одиниць 10^-PRECISION (для EUR/USD - 0.00001), пункт і допуск -
+цілі кількості одиниць, тож перевірки sweep/retest порівнюють цілі числа без похибок float.
+Масиви High/Low векторизованого рушія та вікон дотиків - int32; DataFrame барів лишається float64,
+а рушій loop переводить в одиниці лише ціни, що порівнюються. Рівні між барами (Asia Mid) мають
+точність половини одиниці. Float відновлюється лише для експорту результатів.
+"""
+
+import numpy as np
+
+from config import Config
+
+PRICE_SCALE = 10 ** Config.PRECISION
+UNITS_DTYPE = np.int32
+
+# Пропущена ціна (NaN у барі), як і в pandas max/min: High не стає максимумом, Low - мінімумом,
+# і жоден з них не торкається рівнів
+MISSING_HIGH = np.iinfo(UNITS_DTYPE).min
+MISSING_LOW = np.iinfo(UNITS_DTYPE).max
+
+
+def to_units(prices, missing=MISSING_HIGH):
+    """Масив цін -> int32 одиниці; NaN -> missing (ValueError для цін поза діапазоном int32)"""
+    scaled = np.rint(np.asarray(prices, dtype=np.float64) * PRICE_SCALE)
+    valid = np.isfinite(scaled)
+    if not valid.all():
+        scaled = np.where(valid, scaled, missing)
+    if scaled.size:
+        limits = np.iinfo(UNITS_DTYPE)
+        if scaled.min() < limits.min or scaled.max() > limits.max:
+            raise ValueError(f"Ціни не вміщуються в {UNITS_DTYPE.__name__} одиниць 1e-{Config.PRECISION}")
+    return scaled.astype(UNITS_DTYPE)
+
+
+def price_units(price):
+    """Ціна або рівень -> кількість одиниць з точністю до половини одиниці (точна у float64; NaN лишається NaN)"""
+    scaled = price * PRICE_SCALE * 2
+    if scaled != scaled:
+        return scaled
+    return round(scaled) / 2
+
+
+def from_units(units):
+    """Одиниці -> ціна (float) для експорту"""
+    return np.asarray(units, dtype=np.float64) / PRICE_SCALE
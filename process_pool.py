@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Паралельна обробка файлів у пулі процесів
+Файли запускаються від найбільшого до найменшого, щоб зменшити загальний час обробки
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def file_size(file_path):
+    """Розмір файлу (0, якщо файл недоступний)"""
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def largest_first(file_paths):
+    """Файли від найбільшого до найменшого"""
+    return sorted(file_paths, key=file_size, reverse=True)
+
+
+def run_in_processes(worker, file_paths, workers, *args):
+    """Виконати worker(file_path, *args) для кожного файлу в workers процесах
+
+    Генератор пар (file_path, result) у порядку завершення. Якщо воркер впав,
+    замість результату повертається виняток, решта файлів обробляється далі.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(worker, file_path, *args): file_path for file_path in largest_first(file_paths)}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = e
+            yield futures[future], result
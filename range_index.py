@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Індекс діапазонних запитів max High / min Low
+Sparse table будується один раз над масивами High і Low: максимум/мінімум будь-якого вікна [lo, hi)
+та позиція його першого входження - за O(1) (два перекриті блоки довжини 2^k).
+Рівні обмежені довжиною найдовшого вікна (Config.RANGE_INDEX_MAX_WINDOW), довші вікна
+рахуються прямим проходом по зрізу.
+"""
+
+import numpy as np
+
+from config import Config
+from day_context import WindowStats
+
+
+class RangeExtrema:
+    """Sparse table позицій першого максимуму (kind='max') або мінімуму (kind='min')
+
+    offsets[k - 1][i] - зсув від i першого екстремуму вікна [i, i + 2^k).
+    Зсуви менші за 2^k, тому зберігаються як int16 (рівнів не більше 15).
+    NaN пропускаються, як у pandas max/min: порівняння йдуть по ключах, де NaN - найгірше значення.
+    """
+
+    MAX_LEVEL = 15
+
+    def __init__(self, values, kind='max', max_window=None):
+        self.values = np.asarray(values)
+        self.kind = kind
+        self.keys = self.values
+        if self.values.dtype.kind == 'f' and np.isnan(self.values).any():
+            self.keys = np.where(np.isnan(self.values), -np.inf if kind == 'max' else np.inf, self.values)
+        length = len(self.values)
+        max_window = min(length, max_window or length)
+        self.levels = min(int(max_window).bit_length() - 1, self.MAX_LEVEL) if max_window > 0 else 0
+        self.offsets = []
+
+        # При рівності лишається лівий кандидат - перше входження
+        better = np.greater_equal if kind == 'max' else np.less_equal
+        positions = np.arange(length, dtype=np.int64)
+        for level in range(1, self.levels + 1):
+            half = 1 << (level - 1)
+            count = length - (1 << level) + 1
+            left = positions[:count]
+            right = positions[half:half + count]
+            positions = np.where(better(self.keys[left], self.keys[right]), left, right)
+            self.offsets.append((positions - np.arange(count)).astype(np.int16))
+
+    def _block(self, level, start):
+        """Позиція першого екстремуму блоку [start, start + 2^level)"""
+        if level == 0:
+            return start
+        return start + int(self.offsets[level - 1][start])
+
+    def position(self, lo, hi):
+        """Позиція першого екстремуму вікна [lo, hi) (-1 для порожнього вікна)"""
+        lo, hi = int(lo), int(hi)
+        length = hi - lo
+        if length <= 0:
+            return -1
+        level = length.bit_length() - 1
+        if level > self.levels:
+            window = self.keys[lo:hi]
+            return lo + int(window.argmax() if self.kind == 'max' else window.argmin())
+
+        left = self._block(level, lo)
+        right = self._block(level, hi - (1 << level))
+        if self.kind == 'max':
+            return int(left if self.keys[left] >= self.keys[right] else right)
+        return int(left if self.keys[left] <= self.keys[right] else right)
+
+    def positions(self, lo, hi):
+        """Позиції перших екстремумів для масивів вікон [lo, hi) (-1 для порожніх)"""
+        lo = np.asarray(lo, dtype=np.int64)
+        hi = np.asarray(hi, dtype=np.int64)
+        result = np.full(len(lo), -1, dtype=np.int64)
+        lengths = hi - lo
+        nonempty = lengths > 0
+        if not nonempty.any():
+            return result
+
+        # floor(log2(length)) для кожного вікна
+        levels = np.zeros(len(lo), dtype=np.int64)
+        levels[nonempty] = np.frexp(lengths[nonempty].astype(np.float64))[1] - 1
+
+        indexed = nonempty & (levels <= self.levels)
+        for level in np.unique(levels[indexed]).tolist():
+            rows = np.flatnonzero(indexed & (levels == level))
+            starts = lo[rows]
+            ends = hi[rows] - (1 << level)
+            if level == 0:
+                left, right = starts, ends
+            else:
+                offsets = self.offsets[level - 1]
+                left = starts + offsets[starts]
+                right = ends + offsets[ends]
+            if self.kind == 'max':
+                result[rows] = np.where(self.keys[left] >= self.keys[right], left, right)
+            else:
+                result[rows] = np.where(self.keys[left] <= self.keys[right], left, right)
+
+        for row in np.flatnonzero(nonempty & ~indexed).tolist():
+            result[row] = self.position(int(lo[row]), int(hi[row]))
+        return result
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.offsets)
+
+
+class BarRangeIndex:
+    """Індекс max High / min Low над барами DataFrame з агрегатами вікон за позиціями"""
+
+    def __init__(self, df, max_window=None):
+        max_window = max_window or Config.RANGE_INDEX_MAX_WINDOW
+        self.df = df
+        self.length = len(df)
+        self.opens = df['Open'].to_numpy(dtype=np.float64)
+        self.closes = df['Close'].to_numpy(dtype=np.float64)
+        self.high = RangeExtrema(df['High'].to_numpy(dtype=np.float64), 'max', max_window)
+        self.low = RangeExtrema(df['Low'].to_numpy(dtype=np.float64), 'min', max_window)
+        self.datetimes = df['Datetime'].array
+
+    def matches(self, df):
+        """Чи побудовано індекс саме для цього DataFrame"""
+        return self.df is df and self.length == len(df)
+
+    def window_stats(self, lo, hi):
+        """WindowStats вікна [lo, hi) (None для порожнього вікна)"""
+        if hi <= lo:
+            return None
+        high_pos = self.high.position(lo, hi)
+        low_pos = self.low.position(lo, hi)
+        return WindowStats(
+            open=self.opens[lo],
+            high=self.high.values[high_pos],
+            low=self.low.values[low_pos],
+            close=self.closes[hi - 1],
+            high_time=self.datetimes[high_pos],
+            low_time=self.datetimes[low_pos],
+        )
+
+    def extrema(self, lo, hi):
+        """Для масивів вікон: (max High, позиція, min Low, позиція); NaN і -1 для порожніх вікон"""
+        high_pos = self.high.positions(lo, hi)
+        low_pos = self.low.positions(lo, hi)
+        found = high_pos >= 0
+        highs = np.full(len(high_pos), np.nan)
+        lows = np.full(len(low_pos), np.nan)
+        highs[found] = self.high.values[high_pos[found]]
+        lows[found] = self.low.values[low_pos[found]]
+        return highs, high_pos, lows, low_pos
+
+    @property
+    def nbytes(self):
+        return self.high.nbytes + self.low.nbytes
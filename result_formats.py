@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Формати файлів результатів
+Крім Excel результати можна зберігати у Parquet, Arrow IPC (потрібен pyarrow), CSV.gz та JSONL.
+Формат визначається розширенням файлу; у нетабличних форматах статистика та її куб пишуться
+в окремі файли <назва>.stats.<розширення> і <назва>.cube.<розширення>.
+Excel отримує звичний вигляд результатів (Yes/No, HH:MM), табличні формати - типізовану схему.
+Читання бере швидкий формат, якщо він є і не старший за Excel, і повертає звичний вигляд.
+"""
+
+import importlib.util
+import os
+
+import pandas as pd
+
+from excel_writer import write_excel
+from results_schema import format_results
+
+RESULTS_SHEET = 'Analysis_Results'
+STATISTICS_SHEET = 'Statistics'
+CUBE_SHEET = 'Statistics_Cube'
+
+# Формат -> розширення файлу
+RESULT_FORMATS = {
+    'xlsx': '.xlsx',
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+    'csv.gz': '.csv.gz',
+    'jsonl': '.jsonl',
+}
+EXTENSION_ALIASES = {'.feather': 'arrow'}
+
+# Формати, що потребують pyarrow
+ARROW_FORMATS = ('parquet', 'arrow')
+
+# Порядок пошуку швидкого формату при читанні
+READ_PREFERENCE = ('parquet', 'arrow', 'jsonl', 'csv.gz')
+
+
+def has_pyarrow():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def format_from_path(path):
+    """Формат файлу за розширенням"""
+    name = path.lower()
+    for fmt, extension in sorted(RESULT_FORMATS.items(), key=lambda item: -len(item[1])):
+        if name.endswith(extension):
+            return fmt
+    for extension, fmt in EXTENSION_ALIASES.items():
+        if name.endswith(extension):
+            return fmt
+    raise ValueError(f"Невідомий формат файлу результатів: {path}")
+
+
+def with_format(path, fmt):
+    """Шлях з тією самою назвою та розширенням формату fmt"""
+    try:
+        current = format_from_path(path)
+    except ValueError:
+        return path + RESULT_FORMATS[fmt]
+    name = path.lower()
+    extension = next(ext for ext in (RESULT_FORMATS[current], *EXTENSION_ALIASES) if name.endswith(ext))
+    return path[:-len(extension)] + RESULT_FORMATS[fmt]
+
+
+def sidecar_path(path, kind):
+    """Файл <назва>.<kind>.<розширення> поруч з файлом результатів (для нетабличних форматів)"""
+    fmt = format_from_path(path)
+    extension = RESULT_FORMATS[fmt]
+    if not path.lower().endswith(extension):
+        path = with_format(path, fmt)
+    return path[:-len(extension)] + f'.{kind}' + extension
+
+
+def stats_path(path):
+    """Файл статистики поруч з файлом результатів"""
+    return sidecar_path(path, 'stats')
+
+
+def cube_path(path):
+    """Файл куба статистики поруч з файлом результатів"""
+    return sidecar_path(path, 'cube')
+
+
+def write_table(df, path, fmt):
+    """Записати одну таблицю у формат fmt"""
+    if fmt in ARROW_FORMATS and not has_pyarrow():
+        raise ImportError(f"Для формату {fmt} потрібен pyarrow (pip install pyarrow)")
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'arrow':
+        df.reset_index(drop=True).to_feather(path)
+    elif fmt == 'csv.gz':
+        df.to_csv(path, index=False, compression='gzip')
+    elif fmt == 'jsonl':
+        df.to_json(path, orient='records', lines=True, force_ascii=False)
+    else:
+        raise ValueError(f"Невідомий формат таблиці: {fmt}")
+
+
+def read_table(path, fmt):
+    """Прочитати одну таблицю формату fmt"""
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    if fmt == 'arrow':
+        return pd.read_feather(path)
+    if fmt == 'csv.gz':
+        return pd.read_csv(path, compression='gzip')
+    if fmt == 'jsonl':
+        # Без перетворення рядків дат, як у Excel-версії; precise_float - числа читаються без похибки останнього знака
+        return pd.read_json(path, orient='records', lines=True, convert_dates=False, dtype=False, precise_float=True)
+    raise ValueError(f"Невідомий формат таблиці: {fmt}")
+
+
+def write_results(results_df, stats_df, output_file, formats=(), cube_df=None, display_df=None):
+    """Зберегти результати у формат за розширенням output_file і в додаткові формати formats
+
+    cube_df - куб статистики (окремий аркуш Statistics_Cube або файл .cube).
+    display_df - results_df у звичному вигляді для Excel (якщо вже відформатовано).
+    Повертає список записаних файлів. Додатковий формат без потрібної бібліотеки пропускається.
+    """
+    primary = format_from_path(output_file)
+    written = []
+    for fmt in [primary] + [fmt for fmt in formats if fmt != primary]:
+        path = output_file if fmt == primary else with_format(output_file, fmt)
+        try:
+            if fmt == 'xlsx':
+                if display_df is None:
+                    display_df = format_results(results_df)
+                sheets = {RESULTS_SHEET: display_df, STATISTICS_SHEET: stats_df}
+                if cube_df is not None:
+                    sheets[CUBE_SHEET] = cube_df
+                write_excel(path, sheets)
+            else:
+                write_table(results_df, path, fmt)
+                write_table(stats_df, stats_path(path), fmt)
+                if cube_df is not None:
+                    write_table(cube_df, cube_path(path), fmt)
+        except ImportError as e:
+            if fmt == primary:
+                raise
+            print(f"⚠️ Пропускаю формат {fmt}: {e}")
+            continue
+        written.append(path)
+    return written
+
+
+def find_results(output_file):
+    """(шлях, формат) файлу результатів для читання: швидкий формат, якщо він є і не старший за output_file"""
+    base_mtime = os.path.getmtime(output_file) if os.path.exists(output_file) else None
+    for fmt in READ_PREFERENCE:
+        if fmt in ARROW_FORMATS and not has_pyarrow():
+            continue
+        path = with_format(output_file, fmt)
+        if path == output_file or not (os.path.exists(path) and os.path.exists(stats_path(path))):
+            continue
+        if base_mtime is None or os.path.getmtime(path) >= base_mtime:
+            return path, fmt
+    if base_mtime is None:
+        return None
+    return output_file, format_from_path(output_file)
+
+
+def read_results(output_file, with_cube=False):
+    """Прочитати (результати у звичному вигляді, статистика[, куб]); FileNotFoundError, якщо файлів немає
+
+    Куба немає у файлах, збережених до його появи - тоді замість нього None.
+    """
+    found = find_results(output_file)
+    if found is None:
+        raise FileNotFoundError(output_file)
+    path, fmt = found
+    if fmt == 'xlsx':
+        sheets = pd.read_excel(path, sheet_name=None if with_cube else [RESULTS_SHEET, STATISTICS_SHEET])
+        tables = sheets[RESULTS_SHEET], sheets[STATISTICS_SHEET]
+        cube = sheets.get(CUBE_SHEET)
+    else:
+        tables = format_results(read_table(path, fmt)), read_table(stats_path(path), fmt)
+        cube = read_table(cube_path(path), fmt) if with_cube and os.path.exists(cube_path(path)) else None
+    return (*tables, cube) if with_cube else tables
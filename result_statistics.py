@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Статистика результатів аналізу
+Кількості всіх метрик рахуються одним групуванням по значеннях категорійних колонок
+(таблиця в типізованій схемі спершу приводиться до звичного вигляду),
+а куб статистики містить ті самі метрики в розрізі днів тижня, місяців, років і типів sweep
+"""
+
+import numpy as np
+import pandas as pd
+
+from results_schema import MEASURE_COLUMNS, format_results
+
+TOTAL_METRIC = 'Загальна кількість днів'
+
+# Метрика -> (колонка, значення)
+STATISTICS_METRICS = {
+    'Frankfurt Sweep High': ('frankfurt_sweep_high', 'Yes'),
+    'Frankfurt Sweep Low': ('frankfurt_sweep_low', 'Yes'),
+    'London Sweep High': ('london_sweep_high', 'Yes'),
+    'London Sweep Low': ('london_sweep_low', 'Yes'),
+    'Continue': ('sweep_type', 'Continue'),
+    'Sweep and Reverse': ('sweep_type', 'Sweep and Reverse'),
+    'No Sweep': ('sweep_type', 'No Sweep'),
+    'Rebalance Yes': ('rebalance', 'Yes'),
+    'London Long': ('london_direction', 'Long'),
+    'London Short': ('london_direction', 'Short'),
+}
+
+# Середні значення розширення в кубі (Percentage порожній)
+EXTENSION_METRICS = {
+    'Extension Pips Mean': ('extension_pips', 'mean'),
+    'Extension Pips Std': ('extension_pips', 'std'),
+    'Extension Percent Mean': ('extension_percent', 'mean'),
+}
+
+# Розрізи куба: назва -> ключ групи з таблиці результатів
+BREAKDOWNS = {
+    'weekday': lambda results_df: results_df['day_of_week'],
+    'month': lambda results_df: results_df['date'].astype(str).str[:7],
+    'year': lambda results_df: results_df['date'].astype(str).str[:4],
+    'sweep_type': lambda results_df: results_df['sweep_type'],
+}
+
+CUBE_COLUMNS = ['Breakdown', 'Group', 'Metric', 'Value', 'Percentage']
+
+
+def value_counts(results_df, groups=None):
+    """Кількість днів кожного значення категорійних колонок метрик: Series з індексом ([група,] колонка, значення)"""
+    columns = sorted({column for column, _ in STATISTICS_METRICS.values()})
+    frame = results_df[columns]
+    keys = ['column', 'value']
+    if groups is not None:
+        frame = frame.set_index(pd.Index(groups.to_numpy(), name='group'))
+        keys = ['group'] + keys
+    long = frame.melt(var_name='column', value_name='value', ignore_index=groups is None)
+    if groups is not None:
+        long = long.reset_index()
+    return long.groupby(keys, sort=False).size()
+
+
+def metric_counts(counts, total, group=()):
+    """Значення та відсотки метрик зі словника value_counts (group - ключ групи, якщо рахували по групах)"""
+    values = np.array(
+        [counts.get((*group, column, value), 0) for column, value in STATISTICS_METRICS.values()], dtype=np.int64
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentages = np.round(values / total * 100, 2)
+    return values, percentages
+
+
+def summary_statistics(results_df):
+    """Таблиця Statistics: загальна кількість днів і кількість/відсоток кожної метрики"""
+    results_df = format_results(results_df)
+    total = len(results_df)
+    values, percentages = metric_counts(value_counts(results_df).to_dict(), total)
+    return pd.DataFrame({
+        'Metric': [TOTAL_METRIC] + list(STATISTICS_METRICS),
+        'Value': np.r_[total, values],
+        'Percentage': np.r_[100.0, percentages],
+    })
+
+
+def metric_summary(results_df):
+    """Статистика одним рядком: {метрика: кількість, 'метрика %': відсоток, середні розширення}
+
+    Рахує прямо по типізованій (або звичній) таблиці без форматування - для перебору параметрів.
+    """
+    total = len(results_df)
+    row = {TOTAL_METRIC: total}
+    for metric, (column, value) in STATISTICS_METRICS.items():
+        if total == 0:
+            count = 0
+        elif results_df[column].dtype == bool:
+            count = int(results_df[column].sum())
+        else:
+            count = int((results_df[column] == value).sum())
+        row[metric] = count
+        row[f'{metric} %'] = float(np.round(count / total * 100, 2)) if total else np.nan
+    for metric, (column, how) in EXTENSION_METRICS.items():
+        if total == 0:
+            row[metric] = np.nan
+            continue
+        # Ті самі округлені значення, що й у звичному вигляді таблиці
+        values = np.round(results_df[column].to_numpy(dtype=np.float64), MEASURE_COLUMNS[column])
+        row[metric] = pd.Series(values).agg(how)
+    return row
+
+
+def statistics_cube(results_df):
+    """Куб статистики: ті самі метрики по днях тижня, місяцях, роках і типах sweep
+
+    Довга таблиця Breakdown/Group/Metric/Value/Percentage; Percentage - відсоток днів групи,
+    для загальної кількості днів - частка групи в усьому періоді.
+    """
+    results_df = format_results(results_df)
+    total = len(results_df)
+    parts = []
+    for breakdown, key in BREAKDOWNS.items():
+        groups = key(results_df)
+        sizes = groups.value_counts(sort=False).sort_index()
+        counts = value_counts(results_df, groups).to_dict()
+        extensions = results_df.groupby(groups.to_numpy()).agg(
+            **{metric: spec for metric, spec in EXTENSION_METRICS.items()}
+        )
+
+        for group, size in sizes.items():
+            values, percentages = metric_counts(counts, size, (group,))
+            parts.append(pd.DataFrame({
+                'Breakdown': breakdown,
+                'Group': str(group),
+                'Metric': [TOTAL_METRIC] + list(STATISTICS_METRICS) + list(EXTENSION_METRICS),
+                'Value': np.r_[size, values, extensions.loc[group].to_numpy(dtype=np.float64)].astype(np.float64),
+                'Percentage': np.r_[round(size / total * 100, 2), percentages, [np.nan] * len(EXTENSION_METRICS)],
+            }))
+
+    if not parts:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    return pd.concat(parts, ignore_index=True)
+
+
+def cube_table(cube, breakdown):
+    """Розріз куба як таблиця: рядки - групи, колонки - метрики (значення Value)"""
+    part = cube[cube['Breakdown'] == breakdown]
+    return part.pivot(index='Group', columns='Metric', values='Value')
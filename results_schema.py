@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Типізована схема таблиці результатів
+analyze_period повертає компактну таблицю: прапорці Yes/No - bool, напрямки і типи sweep - category,
+час - int16 хвилин від початку доби (-1 - немає), пункти та відсотки - фіксований тип кожної колонки
+(float32 для 1-2 знаків, float64 для 5 знаків), тож таблиці різних днів і частин об'єднуються
+без зміни типу. Звичний вигляд (Yes/No, HH:MM) формується одним векторизованим форматуванням
+лише для Excel і переглядачів результатів.
+"""
+
+import numpy as np
+import pandas as pd
+
+FLAG_COLUMNS = [
+    'frankfurt_sweep_high', 'frankfurt_sweep_low', 'london_sweep_high', 'london_sweep_low',
+    'rebalance', 'retest_sweep_level', 'asia_mid_retest', 'sweep_pdh', 'sweep_pdl',
+]
+
+# Колонка -> допустимі значення (порядок категорій фіксований, щоб таблиці частин об'єднувались без втрати типу)
+CATEGORY_COLUMNS = {
+    'sweep_type': ['Continue', 'Sweep and Reverse', 'No Sweep'],
+    'london_direction': ['Long', 'Short'],
+    'ny_direction': ['Long', 'Short'],
+    'ny_status': ['Support', 'Reverse'],
+}
+
+TIME_COLUMNS = [
+    'frankfurt_high_time', 'frankfurt_low_time',
+    'london_sweep_asia_high_time', 'london_sweep_asia_low_time', 'london_high_time', 'london_low_time',
+    'max_time', 'min_time', 'pdh_time', 'pdl_time', 'ny_max_high_time', 'ny_min_low_time',
+]
+MISSING_MINUTE = -1
+MINUTES_PER_DAY = 1440
+
+# Пункти та відсотки -> знаків після коми в результатах
+MEASURE_COLUMNS = {
+    'extension_pips': 1,
+    'extension_percent': 2,
+    'reverse_pips': 1,
+    'reverse_percent': 2,
+    'ny_up_extension_pips': 5,
+    'ny_up_extension_percent': 5,
+    'ny_down_extension_pips': 5,
+    'ny_down_extension_percent': 5,
+}
+
+# Тип кожної колонки пунктів/відсотків: float32 точно відновлює 1-2 знаки після коми, 5 знаків - лише float64
+MEASURE_DTYPES = {column: np.float32 if digits <= 2 else np.float64 for column, digits in MEASURE_COLUMNS.items()}
+
+# 'HH:MM' для кожної хвилини доби
+HHMM = np.array([f'{minute // 60:02d}:{minute % 60:02d}' for minute in range(MINUTES_PER_DAY)], dtype=object)
+
+
+def measure_values(values, column):
+    """Значення колонки пунктів/відсотків у типі схеми (округлені до знаків колонки)"""
+    values = np.round(np.asarray(values, dtype=np.float64), MEASURE_COLUMNS[column])
+    return values.astype(MEASURE_DTYPES[column])
+
+
+def minutes_from_hhmm(values):
+    """'HH:MM' (або None) -> int16 хвилин від початку доби"""
+    text = pd.Series(values, dtype=object)
+    valid = text.notna().to_numpy()
+    minutes = np.full(len(text), MISSING_MINUTE, dtype=np.int16)
+    if valid.any():
+        parts = text[valid].astype(str)
+        minutes[valid] = parts.str[:2].astype(np.int16).to_numpy() * 60 + parts.str[3:5].astype(np.int16).to_numpy()
+    return minutes
+
+
+def typed_results(results_df):
+    """Таблиця результатів у типізованій схемі (колонки, що вже мають тип схеми, не змінюються)"""
+    if results_df.empty and len(results_df.columns) == 0:
+        return results_df
+    results_df = results_df.copy()
+
+    for column in FLAG_COLUMNS:
+        if column in results_df and results_df[column].dtype != bool:
+            results_df[column] = results_df[column].to_numpy(dtype=object) == 'Yes'
+
+    for column, categories in CATEGORY_COLUMNS.items():
+        if column in results_df and not isinstance(results_df[column].dtype, pd.CategoricalDtype):
+            results_df[column] = pd.Categorical(results_df[column].to_numpy(dtype=object), categories=categories)
+
+    for column in TIME_COLUMNS:
+        if column in results_df and results_df[column].dtype.kind not in 'iu':
+            results_df[column] = minutes_from_hhmm(results_df[column].to_numpy(dtype=object))
+
+    for column in MEASURE_COLUMNS:
+        if column in results_df and results_df[column].dtype != MEASURE_DTYPES[column]:
+            results_df[column] = measure_values(results_df[column], column)
+
+    return results_df
+
+
+def format_results(results_df):
+    """Звичний вигляд таблиці результатів: Yes/No, рядки категорій, HH:MM і float64
+
+    Тип рядкових колонок визначається так само, як при побудові таблиці зі списку днів.
+    Колонки, що вже мають такий вигляд (наприклад, прочитані з Excel), не змінюються.
+    """
+    results_df = results_df.copy()
+
+    for column in FLAG_COLUMNS:
+        if column in results_df and results_df[column].dtype == bool:
+            results_df[column] = pd.Series(np.where(results_df[column].to_numpy(), 'Yes', 'No').astype(object),
+                                           index=results_df.index)
+
+    for column in CATEGORY_COLUMNS:
+        if column in results_df and isinstance(results_df[column].dtype, pd.CategoricalDtype):
+            values = results_df[column].to_numpy(dtype=object)
+            values[pd.isna(values)] = None
+            results_df[column] = pd.Series(values, index=results_df.index)
+
+    for column in TIME_COLUMNS:
+        if column in results_df and results_df[column].dtype.kind in 'iu':
+            minutes = results_df[column].to_numpy()
+            valid = minutes >= 0
+            values = np.full(len(minutes), None, dtype=object)
+            values[valid] = HHMM[minutes[valid]]
+            results_df[column] = pd.Series(values, index=results_df.index)
+
+    # Округлення до знаків колонки незалежно від типу (float32 -> float64 без хвостів)
+    for column, digits in MEASURE_COLUMNS.items():
+        if column in results_df and results_df[column].dtype.kind == 'f':
+            results_df[column] = np.round(results_df[column].to_numpy(dtype=np.float64), digits)
+
+    return results_df
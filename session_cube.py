@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Куб агрегатів торгових сесій
+Один рядок на торговий день: Open/High/Low/Close та хвилина першого досягнення
+High/Low для кожної сесії з Config.SESSIONS і для всього дня
+"""
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from day_context import WindowStats
+from kernels import segment_extrema
+from session_index import NS_PER_MINUTE, NS_PER_DAY, SessionIndex, day_number
+
+CUBE_FIELDS = ('open', 'high', 'low', 'close', 'high_minute', 'low_minute')
+
+# Збільшувати при кожній зміні вмісту куба: збережені куби старої версії будуються заново
+CUBE_VERSION = 2
+
+# Хвилина екстремуму: сесія без барів і сесія, де бари є, але без цін (тоді рахується по барах)
+EMPTY_MINUTE = -1
+UNPRICED_MINUTE = -2
+
+
+def cube_sessions(sessions=None):
+    """Сесії куба: налаштовані сесії плюс весь день"""
+    sessions = sessions or Config.SESSIONS
+    result = {name: (hours['start'], hours['end']) for name, hours in sessions.items()}
+    result['day'] = (0, 24)
+    return result
+
+
+class SessionCube:
+    """Таблиця агрегатів сесій, індексована номером дня"""
+
+    def __init__(self, days, columns, sessions, tz=None, fingerprint=None, version=CUBE_VERSION):
+        self.days = np.asarray(days, dtype=np.int64)
+        self.version = version
+        self.columns = columns
+        self.sessions = sessions
+        self.tz = tz
+        self.fingerprint = fingerprint
+        self.df = None
+        self._times = None
+        self._rows = {day: row for row, day in enumerate(self.days.tolist())}
+        self._by_hours = {hours: name for name, hours in sessions.items()}
+
+    @staticmethod
+    def source_fingerprint(df, times=None):
+        """Відбиток вихідних даних для перевірки відповідності куба
+
+        Кількість барів, перший і останній час та хеш (blake2b) часу і цін OHLC,
+        тож виправлені на місці ціни теж роблять збережений куб непридатним.
+        """
+        if times is None:
+            times = SessionIndex(df).times
+        if len(times) == 0:
+            return [0, 0, 0, '']
+        digest = hashlib.blake2b(np.ascontiguousarray(times, dtype=np.int64).tobytes(), digest_size=20)
+        for column in ('Open', 'High', 'Low', 'Close'):
+            digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)).tobytes())
+        return [int(len(times)), int(times[0]), int(times[-1]), digest.hexdigest()]
+
+    @classmethod
+    def build(cls, df, sessions=None, session_index=None):
+        """Побудувати куб для відсортованих M1 даних (None якщо це неможливо)"""
+        if session_index is None or not session_index.matches(df):
+            session_index = SessionIndex(df)
+        times = session_index.times
+
+        # Куб зберігає хвилини, тому потрібні дані з точністю до хвилини
+        if not session_index.valid or len(times) == 0 or np.any(times % NS_PER_MINUTE):
+            return None
+
+        sessions = cube_sessions(sessions)
+        open_ = df['Open'].to_numpy(dtype=np.float64)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        day_start = session_index.days * NS_PER_DAY
+
+        columns = {}
+        for name, (start_hour, end_hour) in sessions.items():
+            lo = session_index.hour_bounds[:, start_hour]
+            hi = session_index.hour_bounds[:, end_hour]
+            has_data = hi > lo
+
+            session_high, high_idx = segment_extrema(high, lo, hi, 'max')
+            session_low, low_idx = segment_extrema(low, lo, hi, 'min')
+
+            columns[f'{name}_open'] = np.where(has_data, open_[np.minimum(lo, len(open_) - 1)], np.nan)
+            columns[f'{name}_high'] = session_high
+            columns[f'{name}_low'] = session_low
+            columns[f'{name}_close'] = np.where(has_data, close[np.maximum(hi - 1, 0)], np.nan)
+            missing = np.where(has_data, UNPRICED_MINUTE, EMPTY_MINUTE)
+            columns[f'{name}_high_minute'] = np.where(
+                high_idx >= 0, (times[np.maximum(high_idx, 0)] - day_start) // NS_PER_MINUTE, missing).astype(np.int16)
+            columns[f'{name}_low_minute'] = np.where(
+                low_idx >= 0, (times[np.maximum(low_idx, 0)] - day_start) // NS_PER_MINUTE, missing).astype(np.int16)
+
+        # Відбиток рахується лише при збереженні куба (save)
+        cube = cls(session_index.days, columns, sessions, tz=df['Datetime'].dt.tz)
+        cube.df = df
+        cube._times = times
+        return cube
+
+    def matches(self, df):
+        """Чи відповідає куб цьому DataFrame"""
+        return self.df is df
+
+    def bind(self, df):
+        """Прив'язати збережений куб до завантажених даних, якщо відбиток збігається"""
+        if self.version != CUBE_VERSION or self.source_fingerprint(df) != list(self.fingerprint or []):
+            return False
+        self.df = df
+        self.tz = df['Datetime'].dt.tz
+        return True
+
+    def to_frame(self):
+        """Куб як DataFrame з датою в індексі"""
+        table = pd.DataFrame(self.columns)
+        table.index = pd.to_datetime(self.days * NS_PER_DAY).rename('date')
+        return table
+
+    def _time(self, day, minute):
+        """Відновити момент часу з номера дня та хвилини"""
+        moment = pd.Timestamp(day * NS_PER_DAY + int(minute) * NS_PER_MINUTE)
+        if self.tz is not None:
+            moment = moment.tz_localize(self.tz, ambiguous='NaT', nonexistent='NaT')
+        return moment
+
+    def lookup(self, date, start_hour, end_hour):
+        """Агрегати сесії з куба
+
+        Повертає (found, stats): found == False, якщо сесії немає у кубі, у сесії немає цін
+        або час неможливо однозначно відновити (тоді потрібно рахувати по барах).
+        """
+        name = self._by_hours.get((start_hour, end_hour))
+        if name is None:
+            return False, None
+
+        day = day_number(date)
+        row = self._rows.get(day)
+        if row is None:
+            return True, None
+        high_minute = self.columns[f'{name}_high_minute'][row]
+        low_minute = self.columns[f'{name}_low_minute'][row]
+        if high_minute == EMPTY_MINUTE:
+            return True, None
+        if high_minute < 0 or low_minute < 0:
+            return False, None
+
+        high_time = self._time(day, high_minute)
+        low_time = self._time(day, low_minute)
+        if pd.isna(high_time) or pd.isna(low_time):
+            return False, None
+
+        stats = WindowStats(
+            open=self.columns[f'{name}_open'][row],
+            high=self.columns[f'{name}_high'][row],
+            low=self.columns[f'{name}_low'][row],
+            close=self.columns[f'{name}_close'][row],
+            high_time=high_time,
+            low_time=low_time,
+        )
+        return True, stats
+
+    def save(self, path):
+        """Зберегти куб у стиснутий .npz для повторного використання"""
+        if self.fingerprint is None and self.df is not None:
+            self.fingerprint = self.source_fingerprint(self.df, self._times)
+        meta = {
+            'sessions': {name: list(hours) for name, hours in self.sessions.items()},
+            'fingerprint': self.fingerprint,
+            'version': self.version,
+        }
+        np.savez_compressed(path, days=self.days, meta=np.array(json.dumps(meta)), **self.columns)
+
+    @classmethod
+    def load(cls, path):
+        """Завантажити куб, збережений методом save"""
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            sessions = {name: tuple(hours) for name, hours in meta['sessions'].items()}
+            columns = {f'{name}_{field}': data[f'{name}_{field}'] for name in sessions for field in CUBE_FIELDS}
+            return cls(data['days'], columns, sessions, fingerprint=meta['fingerprint'], version=meta.get('version', 1))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Індекс позицій рядків по днях і годинах для швидкого вибору торгових сесій
+Будується один раз після завантаження даних за допомогою searchsorted
+"""
+
+import numpy as np
+import pandas as pd
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_HOUR = 60 * NS_PER_MINUTE
+NS_PER_DAY = 24 * NS_PER_HOUR
+
+# Кінець дня так само, як у get_session_data: 23:59:59.999999
+DAY_END_NS = NS_PER_DAY - 1000
+
+
+def local_ns(datetimes):
+    """Локальний (wall-clock) час як int64 наносекунди"""
+    if datetimes.dt.tz is not None:
+        datetimes = datetimes.dt.tz_localize(None)
+    return datetimes.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def day_number(date):
+    """Номер календарного дня (днів від 1970-01-01) для дати у локальному часі"""
+    date = pd.Timestamp(date)
+    if date.tz is not None:
+        date = date.tz_localize(None)
+    return date.normalize().value // NS_PER_DAY
+
+
+def hour_offset(hour):
+    """Зсув години від початку дня (24 - кінець дня)"""
+    return DAY_END_NS if hour == 24 else hour * NS_PER_HOUR
+
+
+class SessionIndex:
+    """Позиції рядків для кожної години кожного дня
+
+    hour_bounds[d, h] - позиція першого рядка не раніше h:00 дня d,
+    тому сесія [start, end) дня d - це рядки hour_bounds[d, start]:hour_bounds[d, end].
+    Індекс валідний лише для відсортованих за часом даних.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.length = len(df)
+        self.times = local_ns(df['Datetime']) if self.length else np.empty(0, dtype=np.int64)
+        self.valid = bool(np.all(self.times[1:] >= self.times[:-1]))
+
+        self.days = np.unique(self.times // NS_PER_DAY) if self.valid else np.empty(0, dtype=np.int64)
+        offsets = np.array([hour_offset(hour) for hour in range(25)], dtype=np.int64)
+        targets = (self.days * NS_PER_DAY)[:, None] + offsets[None, :]
+        self.hour_bounds = np.searchsorted(self.times, targets, side='left')
+        self._rows = {day: row for row, day in enumerate(self.days.tolist())}
+
+    def matches(self, df):
+        """Чи побудовано індекс саме для цього DataFrame"""
+        return self.valid and self.df is df and self.length == len(df)
+
+    def bounds(self, date, start_hour, end_hour):
+        """Межі [lo, hi) сесії: O(1) для проіндексованих днів, O(log n) інакше"""
+        day = day_number(date)
+        row = self._rows.get(day)
+
+        if row is not None and end_hour >= start_hour:
+            return int(self.hour_bounds[row, start_hour]), int(self.hour_bounds[row, end_hour])
+
+        # Сесія переходить на наступний день або дня немає у даних
+        start = day * NS_PER_DAY + hour_offset(start_hour)
+        end = day * NS_PER_DAY + hour_offset(end_hour)
+        if end_hour < start_hour:
+            end += NS_PER_DAY
+        lo, hi = np.searchsorted(self.times, [start, end], side='left')
+        return int(lo), int(max(lo, hi))
+
+    def slice(self, date, start_hour, end_hour):
+        """Позиційний зріз DataFrame для сесії без копіювання"""
+        lo, hi = self.bounds(date, start_hour, end_hour)
+        return self.df.iloc[lo:hi]
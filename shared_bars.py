@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Передача барів у процеси-воркери через спільну пам'ять
+Час та OHLC копіюються один раз у блоки multiprocessing.shared_memory, а воркери
+підключаються до них за назвою і будують DataFrame без копіювання (масиви лише для читання)
+"""
+
+import gc
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from session_index import local_ns
+
+SHARED_COLUMNS = {
+    'Datetime': np.int64,
+    'Open': np.float64,
+    'High': np.float64,
+    'Low': np.float64,
+    'Close': np.float64,
+}
+
+
+class SharedBars:
+    """Блоки спільної пам'яті з колонками барів
+
+    У батьківському процесі - SharedBars.create(df) як контекстний менеджер:
+    блоки видаляються при виході з нього (успіх, виняток, переривання).
+    У воркері - SharedBars.attach(spec), теж як контекстний менеджер.
+    """
+
+    def __init__(self, blocks, rows, timezone=None, owner=False):
+        self.blocks = blocks
+        self.rows = rows
+        self.timezone = timezone
+        self.owner = owner
+
+    @classmethod
+    def create(cls, df):
+        """Скопіювати колонки барів df у нові блоки спільної пам'яті"""
+        rows = len(df)
+        bars = cls({}, rows, df.attrs.get('timezone'), owner=True)
+        try:
+            for column, dtype in SHARED_COLUMNS.items():
+                values = local_ns(df[column]) if column == 'Datetime' else df[column].to_numpy(dtype=dtype)
+                # Блок нульового розміру створити не можна
+                block = shared_memory.SharedMemory(create=True, size=max(rows * np.dtype(dtype).itemsize, 1))
+                bars.blocks[column] = block
+                np.ndarray(rows, dtype=dtype, buffer=block.buf)[:] = values
+        except BaseException:
+            bars.release()
+            raise
+        return bars
+
+    @property
+    def spec(self):
+        """Опис блоків для передачі у воркер (pickle-сумісний, без даних)"""
+        return {
+            'blocks': {column: block.name for column, block in self.blocks.items()},
+            'rows': self.rows,
+            'timezone': self.timezone,
+        }
+
+    @classmethod
+    def attach(cls, spec):
+        """Підключитися до блоків, створених у батьківському процесі"""
+        bars = cls({}, spec['rows'], spec['timezone'])
+        try:
+            for column, name in spec['blocks'].items():
+                bars.blocks[column] = shared_memory.SharedMemory(name=name)
+        except BaseException:
+            bars.release()
+            raise
+        return bars
+
+    def array(self, column):
+        """Масив колонки поверх спільної пам'яті (лише для читання)"""
+        values = np.ndarray(self.rows, dtype=SHARED_COLUMNS[column], buffer=self.blocks[column].buf)
+        values.flags.writeable = False
+        return values
+
+    def frame(self, lo=0, hi=None):
+        """DataFrame рядків [lo, hi) без копіювання (формат як у load_data)"""
+        columns = {column: self.array(column)[lo:hi] for column in SHARED_COLUMNS}
+        columns['Datetime'] = columns['Datetime'].view('datetime64[ns]')
+        df = pd.DataFrame(columns, copy=False)
+        if self.timezone is not None:
+            df.attrs['timezone'] = self.timezone
+        return df
+
+    def release(self):
+        """Закрити блоки (і видалити їх, якщо вони створені цим процесом)"""
+        # Масиви, що ще посилаються на буфери (зокрема в циклічних посиланнях), мають бути зібрані
+        gc.collect()
+        for block in self.blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                # Залишився живий view - відображення звільниться із завершенням процесу
+                pass
+            if self.owner:
+                try:
+                    block.unlink()
+                except FileNotFoundError:
+                    pass
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
@@ -7,6 +7,8 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from result_formats import read_results
+from result_statistics import cube_table, statistics_cube
 
 def show_results():
     """Показати основні результати аналізу"""
@@ -15,9 +17,11 @@ def show_results():
     print("=" * 60)
     
     try:
-        # Завантажуємо результати
-        df = pd.read_excel('liquidity_analysis_results.xlsx', sheet_name='Analysis_Results')
-        stats_df = pd.read_excel('liquidity_analysis_results.xlsx', sheet_name='Statistics')
+        # Завантажуємо результати (Parquet/Arrow/JSONL/CSV.gz поруч з Excel читаються швидше)
+        df, stats_df, cube = read_results('liquidity_analysis_results.xlsx', with_cube=True)
+        if cube is None:
+            # Файл збережено до появи куба статистики - рахуємо його з результатів
+            cube = statistics_cube(df)
         
         print(f"📅 Період аналізу: {df['date'].min()} - {df['date'].max()}")
         print(f"📊 Оброблено торгових днів: {len(df)}")
@@ -41,29 +45,21 @@ def show_results():
         # Аналіз по днях тижня
         print("📅 АНАЛІЗ ПО ДНЯХ ТИЖНЯ:")
         print("-" * 30)
-        day_analysis = df.groupby('day_of_week').agg({
-            'extension_pips': 'mean',
-            'extension_percent': 'mean',
-            'sweep_type': lambda x: (x == 'Continue').sum(),
-            'london_direction': lambda x: (x == 'Long').sum()
-        }).round(2)
+        day_analysis = cube_table(cube, 'weekday').round(2)
         
         for day, row in day_analysis.iterrows():
-            print(f"{day:<10}: Розширення {row['extension_pips']:>6.1f} пунктів, Continue: {int(row['sweep_type'])}, Long: {int(row['london_direction'])}")
+            print(f"{day:<10}: Розширення {row['Extension Pips Mean']:>6.1f} пунктів, Continue: {int(row['Continue'])}, Long: {int(row['London Long'])}")
         print()
         
         # Sweep Type аналіз
         print("🎯 АНАЛІЗ ТИПІВ SWEEP:")
         print("-" * 25)
-        sweep_analysis = df.groupby('sweep_type').agg({
-            'extension_pips': ['mean', 'std'],
-            'rebalance': lambda x: (x == 'Yes').sum()
-        }).round(2)
+        sweep_analysis = cube_table(cube, 'sweep_type').round(2)
         
         for sweep_type in sweep_analysis.index:
-            mean_ext = sweep_analysis.loc[sweep_type, ('extension_pips', 'mean')]
-            std_ext = sweep_analysis.loc[sweep_type, ('extension_pips', 'std')]
-            rebalance_count = int(sweep_analysis.loc[sweep_type, ('rebalance', '<lambda>')])
+            mean_ext = sweep_analysis.loc[sweep_type, 'Extension Pips Mean']
+            std_ext = sweep_analysis.loc[sweep_type, 'Extension Pips Std']
+            rebalance_count = int(sweep_analysis.loc[sweep_type, 'Rebalance Yes'])
             print(f"{sweep_type:<17}: {mean_ext:>6.1f}±{std_ext:>5.1f} пунктів, Rebalance: {rebalance_count}")
         print()
         
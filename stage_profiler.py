@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Профілювання етапів аналізу
+Час, кількість викликів і переглянуті рядки для load_data, кроків analyze_day та save_results.
+Методи обгортаються лише на екземплярі аналізатора з увімкненим профілюванням,
+тому вимкнене профілювання нічого не коштує.
+"""
+
+import functools
+import time
+
+import pandas as pd
+
+REPORT_COLUMNS = ['Stage', 'Calls', 'Seconds', 'Rows', 'Ms_Per_Call', 'Rows_Per_Sec']
+
+
+def frame_rows(frame):
+    """Кількість рядків результату (0, якщо це не таблиця)"""
+    return len(frame) if isinstance(frame, pd.DataFrame) else 0
+
+
+class StageProfiler:
+    """Лічильники етапів: {етап: [виклики, секунди, рядки]}
+
+    Час етапу включає вкладені етапи. Рядки - явний лічильник етапу (rows), а якщо його немає,
+    то сума рядків, переглянутих вкладеними етапами (зрізи сесій, вікна після sweep).
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._stack = []  # Рядки, переглянуті поточними (вкладеними) етапами
+
+    def _stage(self, name):
+        if name not in self.stages:
+            self.stages[name] = [0, 0.0, 0]
+        return self.stages[name]
+
+    def wrap(self, name, method, rows=None):
+        """Обгортка методу; rows(result, *args) - явна кількість рядків етапу"""
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            # Етап реєструється при першому вході, тож звіт іде в порядку виклику
+            stage = self._stage(name)
+            self._stack.append(0)
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                scanned = self._stack.pop()
+                stage[0] += 1
+                stage[1] += seconds
+                if rows is None:
+                    stage[2] += scanned
+                if self._stack:
+                    self._stack[-1] += scanned
+            if rows is not None:
+                count = rows(result, *args)
+                stage[2] += count
+                if self._stack:
+                    self._stack[-1] += count
+            return result
+        return timed
+
+    def instrument(self, obj, stages):
+        """Обгорнути методи obj: {назва методу: функція рядків або None}"""
+        for name, rows in stages.items():
+            setattr(obj, name, self.wrap(name, getattr(obj, name), rows))
+
+    def add_rows(self, count):
+        """Додати переглянуті рядки поточному етапу"""
+        if self._stack:
+            self._stack[-1] += count
+
+    def merge(self, stages):
+        """Додати лічильники іншого профайлера (наприклад, з процесу-воркера)"""
+        for name, (calls, seconds, rows) in stages.items():
+            stage = self._stage(name)
+            stage[0] += calls
+            stage[1] += seconds
+            stage[2] += rows
+
+    def reset(self):
+        self.stages = {}
+
+    def report(self):
+        """Звіт: етап, виклики, секунди, рядки, мс на виклик і рядків за секунду"""
+        records = []
+        for name, (calls, seconds, rows) in self.stages.items():
+            records.append({
+                'Stage': name,
+                'Calls': calls,
+                'Seconds': round(seconds, 6),
+                'Rows': rows,
+                'Ms_Per_Call': round(seconds / calls * 1000, 4) if calls else 0.0,
+                'Rows_Per_Sec': round(rows / seconds) if seconds > 0 else 0,
+            })
+        return pd.DataFrame(records, columns=REPORT_COLUMNS)
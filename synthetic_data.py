@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Генератор синтетичних M1 даних EUR/USD
+Детермінований (seed), без мережі: волатильність залежить від торгової сесії,
+ринок закритий з п'ятниці 17:00 до неділі 17:00 за Нью-Йорком, тому межі тижня
+зсуваються разом з переходами на літній/зимовий час. Час у файлі - UTC, як у вхідних даних.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+
+START = '2004-01-01'
+PRICE = 1.10
+# Стандартне відхилення лог-зміни ціни за хвилину поза сесіями
+BASE_VOLATILITY = 0.00004
+
+# Множники волатильності для сесій (години у локальному часі брокера)
+SESSION_VOLATILITY = {'asia': 1.0, 'frankfurt': 2.0, 'london': 2.5, 'newyork': 2.8}
+
+MARKET_ZONE = 'America/New_York'
+MARKET_CLOSE_HOUR = 17
+
+MINUTES_PER_DAY = 1440
+
+# Розміри наборів даних у місяцях
+SIZES = {'1m': 1, '3m': 3, '1y': 12, '5y': 60, '20y': 240}
+
+# Скільки місяців генерувати за раз (обмежує пам'ять для довгих історій)
+CHUNK_MONTHS = 12
+
+
+def hour_volatility():
+    """Множник волатильності для кожної години локального часу (0-23)"""
+    multipliers = np.ones(24)
+    for name, factor in SESSION_VOLATILITY.items():
+        hours = Config.SESSIONS[name]
+        multipliers[hours['start']:hours['end']] = np.maximum(multipliers[hours['start']:hours['end']], factor)
+    return multipliers
+
+
+def market_minutes(start, end):
+    """Хвилини UTC у [start, end), коли ринок відкритий"""
+    minutes = pd.date_range(start, end, freq='min', inclusive='left', tz='UTC')
+    market = minutes.tz_convert(MARKET_ZONE)
+    weekday, hour = market.weekday, market.hour
+    closed = (
+        (weekday == 5)
+        | ((weekday == 4) & (hour >= MARKET_CLOSE_HOUR))
+        | ((weekday == 6) & (hour < MARKET_CLOSE_HOUR))
+    )
+    return minutes[~closed]
+
+
+def generate_bars(months, start=START, seed=0):
+    """Генератор DataFrame-частин (по CHUNK_MONTHS місяців) з колонками Datetime (UTC), Open, High, Low, Close"""
+    rng = np.random.default_rng(seed)
+    multipliers = hour_volatility()
+    local_zone = Config.TIMEZONE
+    start = pd.Timestamp(start, tz='UTC')
+    log_price = np.log(PRICE)
+
+    for first in range(0, months, CHUNK_MONTHS):
+        chunk_start = start + pd.DateOffset(months=first)
+        chunk_end = start + pd.DateOffset(months=min(first + CHUNK_MONTHS, months))
+        minutes = market_minutes(chunk_start, chunk_end)
+        count = len(minutes)
+        if count == 0:
+            continue
+
+        # Волатильність за годиною локального часу брокера
+        volatility = BASE_VOLATILITY * multipliers[minutes.tz_convert(local_zone).hour]
+        steps = rng.normal(0.0, volatility)
+        closes = np.exp(log_price + np.cumsum(steps))
+        opens = np.r_[np.exp(log_price), closes[:-1]]
+        log_price = np.log(closes[-1])
+
+        wicks = np.abs(rng.normal(0.0, volatility, size=(2, count))) * closes
+        yield pd.DataFrame({
+            'Datetime': minutes,
+            'Open': np.round(opens, 5),
+            'High': np.round(np.maximum(opens, closes) + wicks[0], 5),
+            'Low': np.round(np.minimum(opens, closes) - wicks[1], 5),
+            'Close': np.round(closes, 5),
+        })
+
+
+def date_time_strings(datetimes):
+    """Колонки Date (YYYY.MM.DD) і Time (HH:MM): strftime лише для унікальних днів, час - з таблиці хвилин доби"""
+    minutes = datetimes.dt.tz_localize(None).to_numpy().astype('datetime64[m]').view(np.int64)
+    days, day_index = np.unique(minutes // MINUTES_PER_DAY, return_inverse=True)
+    dates = pd.to_datetime(days * MINUTES_PER_DAY, unit='m').strftime('%Y.%m.%d').to_numpy()
+    times = np.array([f'{minute // 60:02d}:{minute % 60:02d}' for minute in range(MINUTES_PER_DAY)])
+    return dates[day_index], times[minutes % MINUTES_PER_DAY]
+
+
+def write_csv(path, months, start=START, seed=0):
+    """Записати дані у форматі DAT_MT (без заголовка: Date,Time,Open,High,Low,Close,Volume); повертає кількість барів"""
+    tmp_path = path + '.tmp'
+    bars = 0
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in generate_bars(months, start, seed):
+            dates, times = date_time_strings(chunk['Datetime'])
+            out = pd.DataFrame({
+                'Date': dates,
+                'Time': times,
+                'Open': chunk['Open'],
+                'High': chunk['High'],
+                'Low': chunk['Low'],
+                'Close': chunk['Close'],
+                'Volume': 0,
+            })
+            out.to_csv(f, header=False, index=False)
+            bars += len(out)
+    os.replace(tmp_path, path)
+    return bars
+
+
+def dataset_path(directory, size, seed=0):
+    """Шлях до файлу набору даних розміру size (див. SIZES)"""
+    return os.path.join(directory, f'EURUSD_M1_synthetic_{size}_seed{seed}.csv')
+
+
+def ensure_dataset(directory, size, seed=0):
+    """Згенерувати набір даних, якщо його ще немає; повертає шлях"""
+    if size not in SIZES:
+        raise ValueError(f"Невідомий розмір набору даних: {size} (доступні: {', '.join(SIZES)})")
+    path = dataset_path(directory, size, seed)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        print(f"🧪 Генерую синтетичні дані {size}: {path}")
+        write_csv(path, SIZES[size], seed=seed)
+    return path
+
+
+def main():
+    """Генерація файлу: python synthetic_data.py <розмір> <файл.csv> [<seed>]"""
+    if len(sys.argv) < 3 or sys.argv[1] not in SIZES:
+        print(f"💡 Використання: python synthetic_data.py <{'|'.join(SIZES)}> <файл.csv> [<seed>]")
+        return
+
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    bars = write_csv(sys.argv[2], SIZES[sys.argv[1]], seed=seed)
+    print(f"✅ Записано {bars:,} барів у {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Спільне налаштування тестів: модулі проєкту лежать у корені репозиторію, синтетичні M1 дані
+(з переходом на літній час) і еталонні результати рушія loop"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthetic_data  # noqa: E402
+from results_schema import format_results  # noqa: E402
+from liquidity_analyzer import LiquidityAnalyzer  # noqa: E402
+
+# Два місяці з переходом на літній час наприкінці березня
+START = '2024-02-15'
+MONTHS = 2
+
+
+def quiet(function, *args, **kwargs):
+    """Виклик без прогресу аналізатора у виводі тестів"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def assert_same_results(results, expected):
+    """Таблиці однакові і в типізованій схемі, і у звичному вигляді для експорту"""
+    pd.testing.assert_frame_equal(results.reset_index(drop=True), expected.reset_index(drop=True), check_exact=True)
+    pd.testing.assert_frame_equal(format_results(results).reset_index(drop=True),
+                                  format_results(expected).reset_index(drop=True), check_exact=True)
+
+
+def make_analyzer(**kwargs):
+    return LiquidityAnalyzer(use_cache=False, profile=False, **kwargs)
+
+
+@pytest.fixture(scope='session')
+def m1_csv(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('data') / 'EURUSD_M1.csv')
+    synthetic_data.write_csv(path, MONTHS, start=START, seed=7)
+    return path
+
+
+@pytest.fixture(scope='session')
+def bars(m1_csv):
+    return quiet(make_analyzer().load_data, m1_csv)
+
+
+@pytest.fixture(scope='session')
+def loop_results(bars):
+    """Еталон: послідовний аналіз рушієм loop"""
+    return quiet(make_analyzer().analyze_period, bars.copy(), engine='loop', workers=1)
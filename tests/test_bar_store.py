@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Сховище барів по місяцях: злиття перекриттів, читання діапазону дат і аналіз зі сховища"""
+
+import pandas as pd
+import pytest
+
+from bar_store import BarStore
+from conftest import assert_same_results, make_analyzer, quiet
+
+
+@pytest.fixture
+def store(tmp_path, bars):
+    # Дві частини з перекриттям
+    store = BarStore(str(tmp_path / 'store'))
+    middle = len(bars) // 2
+    store.append(bars.iloc[:middle + 5000])
+    store.append(bars.iloc[middle:])
+    return store
+
+
+def test_append_merges_overlap(tmp_path, bars):
+    store = BarStore(str(tmp_path / 'store'))
+    middle = len(bars) // 2
+    store.append(bars.iloc[:middle + 5000])
+    newer = bars.iloc[middle:].copy()
+    newer['Close'] += 0.0001
+    store.append(newer)  # нові ціни перекриття мають пріоритет
+
+    expected = pd.concat([bars.iloc[:middle], newer], ignore_index=True)
+    stored = BarStore(store.root).read_range()
+    assert len(store) == len(bars)
+    assert stored.attrs['timezone'] == bars.attrs['timezone']
+    pd.testing.assert_frame_equal(stored, expected, check_exact=True)
+
+
+def test_read_range_by_local_dates(store, bars):
+    start, end = pd.Timestamp('2024-03-10'), pd.Timestamp('2024-03-31')
+    days = bars['Datetime'].dt.normalize()
+    expected = bars[(days >= start) & (days <= end)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(store.read_range(start, end), expected, check_exact=True)
+
+
+def test_analyze_range_equals_analyze_period(store, loop_results):
+    results = quiet(make_analyzer().analyze_range, store, '2024-03-10', '2024-03-31', engine='loop')
+    expected = loop_results[(loop_results['date'] >= '2024-03-10') & (loop_results['date'] <= '2024-03-31')]
+    assert_same_results(results, expected)
+
+
+def test_timezone_mismatch(store, bars):
+    other = bars.iloc[:10].copy()
+    other.attrs['timezone'] = 'UTC'
+    with pytest.raises(ValueError):
+        store.append(other)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Пул процесів для файлів: ті самі результати, що й послідовна обробка, помилки файлу не зупиняють інші"""
+
+import os
+import shutil
+
+import pytest
+
+from batch_analyzer import BatchLiquidityAnalyzer
+from config import Config
+from conftest import assert_same_results, quiet
+from process_pool import largest_first, run_in_processes
+from result_formats import read_results
+from results_schema import typed_results
+
+
+def _length(file_path):
+    if file_path.endswith('broken.csv'):
+        raise ValueError("broken")
+    return os.path.getsize(file_path)
+
+
+@pytest.fixture
+def month_files(tmp_path, m1_csv, monkeypatch):
+    """Синтетичні дані, розбиті на місячні файли"""
+    monkeypatch.setattr(Config, 'CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'PROFILE_STAGES', False)
+    files_dir = tmp_path / 'files'
+    files_dir.mkdir()
+    months = {}
+    for line in open(m1_csv, encoding='utf-8'):
+        months.setdefault(line[:7].replace('.', ''), []).append(line)
+    for month, lines in months.items():
+        (files_dir / f'DAT_MT_EURUSD_M1_{month}.csv').write_text(''.join(lines), encoding='utf-8')
+    return str(files_dir)
+
+
+def test_run_in_processes(tmp_path):
+    paths = []
+    for name, size in [('small.csv', 10), ('large.csv', 1000), ('broken.csv', 100)]:
+        path = tmp_path / name
+        path.write_text('x' * size)
+        paths.append(str(path))
+
+    assert largest_first(paths) == [paths[1], paths[2], paths[0]]
+    outcomes = dict(run_in_processes(_length, paths, 2))
+    assert outcomes[paths[0]] == 10 and outcomes[paths[1]] == 1000
+    assert isinstance(outcomes[paths[2]], ValueError)
+
+
+def test_parallel_files_equal_serial(tmp_path, month_files):
+    outputs = {}
+    for workers in (1, 3):
+        results_dir = str(tmp_path / f'results_{workers}')
+        batch = BatchLiquidityAnalyzer(month_files, results_dir)
+        quiet(batch.process_all_files, workers=workers)
+        outputs[workers] = sorted(name for name in os.listdir(results_dir) if name.startswith('liquidity_analysis_'))
+
+    assert outputs[1] == outputs[3] and len(outputs[1]) == len(os.listdir(month_files))
+    for name in outputs[1]:
+        serial, serial_stats = read_results(str(tmp_path / 'results_1' / name))
+        parallel, parallel_stats = read_results(str(tmp_path / 'results_3' / name))
+        assert_same_results(typed_results(parallel), typed_results(serial))
+        assert parallel_stats.equals(serial_stats)
+
+
+def test_single_file_workers_do_not_stick(tmp_path, m1_csv, monkeypatch):
+    monkeypatch.setattr(Config, 'CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'PROFILE_STAGES', False)
+    files_dir = tmp_path / 'files'
+    files_dir.mkdir()
+    shutil.copy(m1_csv, files_dir / 'DAT_MT_EURUSD_M1_202402.csv')
+    batch = BatchLiquidityAnalyzer(str(files_dir), str(tmp_path / 'results'))
+    analysis_workers = batch.analysis_workers
+
+    quiet(batch.process_all_files, workers=4)
+    assert batch.analysis_workers == analysis_workers
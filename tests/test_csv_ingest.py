@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Швидке читання CSV дає ті самі бари, що й звичайне завантаження з перебором форматів"""
+
+import pandas as pd
+import pytest
+
+from conftest import make_analyzer, quiet
+from csv_ingest import iter_bars_fast, read_bars_fast
+
+COLUMNS = ['Datetime', 'Open', 'High', 'Low', 'Close']
+
+
+@pytest.fixture(scope='module')
+def rows(m1_csv):
+    raw = pd.read_csv(m1_csv, header=None, names=['Date', 'Time', 'Open', 'High', 'Low', 'Close', 'Volume'],
+                      dtype={'Date': str, 'Time': str}, nrows=5000)
+    raw.loc[7, 'High'] = None  # бар без ціни
+    return raw
+
+
+def write_variant(rows, path, header, date_sep, with_seconds):
+    variant = rows.copy()
+    variant['Date'] = variant['Date'].str.replace('.', date_sep)
+    if with_seconds:
+        variant['Time'] = variant['Time'] + ':00'
+    variant.to_csv(path, header=header, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('header, date_sep, with_seconds', [
+    (False, '.', False),
+    (True, '.', False),
+    (False, '-', True),
+    (True, '-', False),
+])
+def test_fast_path_equals_regular_loading(rows, tmp_path, header, date_sep, with_seconds):
+    path = write_variant(rows, tmp_path / 'bars.csv', header, date_sep, with_seconds)
+    fast = read_bars_fast(path)
+    assert fast is not None
+
+    regular = quiet(make_analyzer()._read_raw_data, path)[COLUMNS]
+    regular['Datetime'] = regular['Datetime'].dt.as_unit('ns')
+    pd.testing.assert_frame_equal(fast, regular, check_exact=True)
+
+    chunks = pd.concat(iter_bars_fast(path, 1234), ignore_index=True)
+    pd.testing.assert_frame_equal(chunks, regular, check_exact=True)
+
+
+def test_other_formats_use_regular_loading(rows, tmp_path):
+    path = tmp_path / 'bars.csv'
+    variant = rows.assign(Date=pd.to_datetime(rows['Date'], format='%Y.%m.%d').dt.strftime('%d/%m/%Y'))
+    variant.to_csv(path, header=False, index=False)
+    assert read_bars_fast(str(path)) is None
+    assert iter_bars_fast(str(path), 1000) is None
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Кеш завантажених даних: повторне завантаження з кешу, індекс без втрат при паралельних записах"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+import data_cache
+from config import Config
+from conftest import quiet
+from data_cache import DataCache
+from liquidity_analyzer import LiquidityAnalyzer
+
+
+def _key_files(directory, paths):
+    cache = DataCache(directory, max_bytes=1 << 30)
+    return [cache.key(path) for path in paths]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'CACHE_DIR', str(tmp_path / 'cache'))
+    return str(tmp_path / 'cache')
+
+
+def test_cached_load_equals_file(m1_csv, bars, cache_dir):
+    first = quiet(LiquidityAnalyzer(use_cache=True, profile=False).load_data, m1_csv)
+    second = LiquidityAnalyzer(use_cache=True, profile=False)
+    assert second.data_cache.load(m1_csv) is not None
+
+    cached = quiet(second.load_data, m1_csv)
+    pd.testing.assert_frame_equal(first, bars, check_exact=True)
+    pd.testing.assert_frame_equal(cached, bars, check_exact=True)
+
+
+def test_parallel_keys_keep_every_index_entry(tmp_path):
+    directory = tmp_path / 'cache'
+    directory.mkdir()
+    paths = []
+    for number in range(40):
+        path = tmp_path / f'bars_{number}.csv'
+        path.write_text(f'2024.03.01,00:{number:02d},1.1,1.1,1.1,1.1,0\n')
+        paths.append(str(path))
+
+    groups = [paths[start::4] for start in range(4)]
+    with ProcessPoolExecutor(4) as executor:
+        list(executor.map(_key_files, [str(directory)] * 4, groups))
+
+    cache = DataCache(str(directory), max_bytes=1 << 30)
+    assert len(cache.index_paths()) == len(paths)
+
+
+def test_eviction_prunes_index(tmp_path, bars):
+    sources = []
+    for number in range(2):
+        path = tmp_path / f'bars_{number}.csv'
+        path.write_text(f'source {number}\n')
+        sources.append(str(path))
+
+    frame = bars.iloc[:1000].assign(Datetime=bars['Datetime'].iloc[:1000].dt.tz_localize('UTC'))
+    cache = DataCache(str(tmp_path / 'cache'), max_bytes=1)
+    for source in sources:
+        cache.store(source, frame)
+
+    assert cache.entries() == []
+    assert cache.index_paths() == []
+
+
+def test_cold_load_hashes_file_once(tmp_path, bars, monkeypatch):
+    source = tmp_path / 'bars.csv'
+    source.write_text('bars\n')
+    hashed = []
+    digest = data_cache.file_digest
+    monkeypatch.setattr(data_cache, 'file_digest', lambda path: hashed.append(path) or digest(path))
+
+    cache = DataCache(str(tmp_path / 'cache'), max_bytes=1 << 30)
+    assert cache.load(str(source)) is None
+    frame = bars.iloc[:100].assign(Datetime=bars['Datetime'].iloc[:100].dt.tz_localize('UTC'))
+    cache.store(str(source), frame)
+    assert len(hashed) == 1
+
+
+@pytest.mark.parametrize('damage', ['truncate', 'garbage'])
+def test_damaged_entry_is_reloaded(m1_csv, bars, cache_dir, damage):
+    quiet(LiquidityAnalyzer(use_cache=True, profile=False).load_data, m1_csv)
+    cache = DataCache(cache_dir, max_bytes=1 << 30)
+    [(entry_path, size, _)] = cache.entries()
+    with open(entry_path, 'r+b') as f:
+        if damage == 'truncate':
+            f.truncate(size // 2)
+        else:
+            f.write(b'\0' * 4096)
+
+    reloaded = quiet(LiquidityAnalyzer(use_cache=True, profile=False).load_data, m1_csv)
+    pd.testing.assert_frame_equal(reloaded, bars, check_exact=True)
+    assert cache.load(m1_csv) is not None
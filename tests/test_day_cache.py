@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Кеш результатів днів: повторний аналіз бере дні з кешу, час використання пишеться пачками"""
+
+import pytest
+
+from config import Config
+from conftest import assert_same_results, quiet
+from day_cache import DayResultCache
+from liquidity_analyzer import LiquidityAnalyzer
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(Config, 'DAY_CACHE_ENABLED', True)
+    return tmp_path / 'cache'
+
+
+def cached_analyzer():
+    return LiquidityAnalyzer(use_cache=True, profile=False)
+
+
+def test_day_cache_disabled_by_default():
+    assert LiquidityAnalyzer(use_cache=True, profile=False).day_cache is None
+
+
+def test_cached_days_equal_fresh_analysis(bars, loop_results, cache_dir, monkeypatch):
+    first = cached_analyzer()
+    assert_same_results(quiet(first.analyze_period, bars.copy(), engine='loop', workers=1), loop_results)
+    assert len(first.day_cache) == len(loop_results)
+    first.day_cache.close()
+
+    # Перераховуються лише дні без результату (їх кеш не зберігає)
+    second = cached_analyzer()
+    recomputed = []
+    analyze_day = second._analyze_day
+
+    def counted(df, date):
+        recomputed.append(analyze_day(df, date))
+        return recomputed[-1]
+
+    monkeypatch.setattr(second, '_analyze_day', counted)
+    assert_same_results(quiet(second.analyze_period, bars.copy(), engine='loop', workers=1), loop_results)
+    assert not any(recomputed)
+    second.day_cache.close()
+
+
+def test_key_follows_configured_sessions(bars, cache_dir, monkeypatch):
+    analyzer = cached_analyzer()
+    date = bars['Datetime'].dt.normalize().iloc[len(bars) // 2]
+    key = analyzer.day_cache_key(bars, date)
+
+    sessions = {name: dict(hours) for name, hours in Config.SESSIONS.items()}
+    sessions['london']['end'] += 1
+    monkeypatch.setattr(Config, 'SESSIONS', sessions)
+    assert analyzer.day_cache_key(bars, date) != key
+
+
+def test_last_used_written_in_batches(tmp_path):
+    cache = DayResultCache(str(tmp_path / 'days.sqlite'), max_entries=10)
+    cache.put('day', {'date': '2024-03-01'})
+    stored = cache.connection.execute('SELECT last_used FROM days').fetchone()[0]
+
+    assert cache.get('day') == {'date': '2024-03-01'}
+    assert cache.connection.execute('SELECT last_used FROM days').fetchone()[0] == stored
+
+    cache.flush()
+    assert cache.connection.execute('SELECT last_used FROM days').fetchone()[0] > stored
+    cache.close()
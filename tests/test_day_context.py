@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Агрегати дня однакові з куба сесій, з індексу діапазонів і з прямих зрізів"""
+
+import pandas as pd
+import pytest
+
+from config import Config
+from conftest import make_analyzer
+from day_context import DayContext
+
+HOURS = [(hours['start'], hours['end']) for hours in Config.SESSIONS.values()] + [(0, 24), (9, 24)]
+
+
+@pytest.fixture(scope='module')
+def contexts(bars):
+    """Фабрики контекстів дня для трьох джерел агрегатів"""
+    cube = make_analyzer()
+    cube.build_session_index(bars)
+    cube.build_session_cube(bars)
+
+    ranges = make_analyzer()
+    ranges.build_session_index(bars)
+    ranges.build_range_index(bars)
+
+    plain = make_analyzer()
+    plain.session_index = None
+
+    return {'cube': cube, 'ranges': ranges, 'plain': plain}
+
+
+def test_sources_agree(bars, contexts):
+    days = bars['Datetime'].dt.normalize().unique()
+    for date in days:
+        by_source = {name: DayContext(analyzer, bars, date) for name, analyzer in contexts.items()}
+        for start_hour, end_hour in HOURS:
+            for day_offset in (0, -1):
+                expected = by_source['plain'].session_stats(start_hour, end_hour, day_offset)
+                assert by_source['cube'].session_stats(start_hour, end_hour, day_offset) == expected
+                assert by_source['ranges'].session_stats(start_hour, end_hour, day_offset) == expected
+
+        for sweep_time in bars['Datetime'][bars['Datetime'].dt.normalize() == date].iloc[::180]:
+            expected = by_source['plain'].after_sweep(sweep_time)
+            pd.testing.assert_frame_equal(by_source['ranges'].after_sweep(sweep_time), expected)
+            assert by_source['ranges'].after_sweep_stats(sweep_time) == by_source['plain'].after_sweep_stats(sweep_time)
+
+
+def test_windows_are_cached(bars, contexts):
+    context = DayContext(contexts['plain'], bars, bars['Datetime'].dt.normalize().iloc[len(bars) // 2])
+    assert context.session(2, 10) is context.session(2, 10)
+    sweep_time = context.session(10, 15)['Datetime'].iloc[30]
+    assert context.after_sweep(sweep_time) is context.after_sweep(sweep_time)
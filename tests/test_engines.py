@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Векторизований і живий рушії дають ті самі результати, що й рушій loop, зокрема з іншими годинами сесій"""
+
+import pytest
+
+from config import Config
+from conftest import assert_same_results, make_analyzer, quiet
+from live_analyzer import LiveAnalyzer, csv_tail, run
+
+CUSTOM_SESSIONS = {
+    'asia': {'start': 1, 'end': 9},
+    'frankfurt': {'start': 8, 'end': 10},
+    'london': {'start': 9, 'end': 14},
+    'newyork': {'start': 14, 'end': 20},
+}
+
+
+def test_vectorized_equals_loop(bars, loop_results):
+    results = quiet(make_analyzer().analyze_period, bars.copy(), engine='vectorized', workers=1)
+    assert_same_results(results, loop_results)
+
+
+@pytest.fixture
+def custom_sessions(monkeypatch):
+    monkeypatch.setattr(Config, 'SESSIONS', CUSTOM_SESSIONS)
+
+
+def test_engines_follow_configured_sessions(m1_csv, bars, loop_results, custom_sessions):
+    loop = quiet(make_analyzer().analyze_period, bars.copy(), engine='loop', workers=1)
+    vectorized = quiet(make_analyzer().analyze_period, bars.copy(), engine='vectorized', workers=1)
+    assert_same_results(vectorized, loop)
+
+    live = LiveAnalyzer(make_analyzer())
+    run(live, csv_tail(m1_csv, follow=False))
+    assert_same_results(live.results_frame(), loop)
+    assert not loop['asia_high'].equals(loop_results['asia_high'])
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Файл write_excel читається pd.read_excel так само, як файл DataFrame.to_excel (openpyxl)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import excel_writer
+from excel_writer import write_excel
+from results_schema import format_results
+
+
+def edge_frame():
+    """Колонки всіх типів, які пише запис: логічні, цілі, дробові з NaN/inf, дати, рядки з пропусками"""
+    return pd.DataFrame({
+        'flag': [True, False, True, False],
+        'flag_object': [True, None, False, np.nan],
+        'count': np.array([1, -2, 0, 2**40], dtype=np.int64),
+        'price': [1.08525, np.nan, np.inf, -np.inf],
+        'datetime': pd.to_datetime(['2024-03-31 01:59:00', None, '2024-01-01 00:00:00',
+                                    '2024-12-31 23:59:59.5'], format='ISO8601').as_unit('ns'),
+        'datetime_tz': pd.to_datetime(['2024-03-31 01:59:00', '2024-03-31 04:00:00', None,
+                                       '2024-01-01 00:00:00']).tz_localize('Europe/Kyiv'),
+        'date': [pd.Timestamp('2024-03-01').date(), None, pd.Timestamp('2024-03-02').date(),
+                 pd.Timestamp('2024-03-03').date()],
+        'text': ['a', None, 'A&B <c> "q"', 'Лондон'],
+        'string': pd.array(['x', None, 'y', 'x'], dtype='string'),
+        'mixed': [1, 'x', 2.5, None],
+        'hhmm': ['09:15', '10:00', None, '23:59'],
+    })
+
+
+def read_back(path):
+    return pd.read_excel(path, sheet_name=None)
+
+
+def reference(tmp_path, sheets):
+    """Ті самі аркуші, записані DataFrame.to_excel (openpyxl не приймає дати з часовою зоною)"""
+    path = tmp_path / 'reference.xlsx'
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for name, df in sheets.items():
+            df = df.copy()
+            for column in df.columns:
+                if isinstance(df[column].dtype, pd.DatetimeTZDtype):
+                    df[column] = df[column].dt.tz_localize(None)
+            df.to_excel(writer, sheet_name=name, index=False)
+    return read_back(path)
+
+
+def assert_same_workbooks(written, expected):
+    assert list(written) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(written[name], expected[name], check_exact=True)
+
+
+def test_edge_columns_read_back_as_to_excel(tmp_path, monkeypatch):
+    # Кілька блоків рядків на аркуш
+    monkeypatch.setattr(excel_writer, 'CHUNK_ROWS', 3)
+    sheets = {'Edge': edge_frame(), 'Empty': pd.DataFrame({'a': [], 'b': []}), 'Числа': pd.DataFrame({'x': [1.5]})}
+    path = tmp_path / 'written.xlsx'
+    write_excel(path, sheets)
+    assert_same_workbooks(read_back(path), reference(tmp_path, sheets))
+
+
+def test_formula_like_text_stays_text(tmp_path):
+    path = tmp_path / 'written.xlsx'
+    write_excel(path, {'Text': pd.DataFrame({'text': ['=1+1', 'TRUE', '0123', 'bad\x01char']})})
+    assert read_back(path)['Text']['text'].tolist() == ['=1+1', 'TRUE', '0123', 'badchar']
+
+
+def test_results_round_trip(tmp_path, loop_results):
+    path = tmp_path / 'results.xlsx'
+    sheets = {'Results': format_results(loop_results)}
+    write_excel(path, sheets)
+    assert_same_workbooks(read_back(path), reference(tmp_path, sheets))
+
+
+def test_invalid_sheet_name(tmp_path):
+    with pytest.raises(ValueError):
+        write_excel(tmp_path / 'bad.xlsx', {'a/b': pd.DataFrame({'x': [1]})})
+
+
+def test_header_styled_as_to_excel(tmp_path):
+    # Стиль заголовка DataFrame.to_excel у pandas 1.x-2.x (pandas 3 його не ставить)
+    openpyxl = pytest.importorskip('openpyxl')
+    path = tmp_path / 'written.xlsx'
+    write_excel(path, {'Sheet1': pd.DataFrame({'a': [1], 'b': ['x']})})
+
+    sheet = openpyxl.load_workbook(path)['Sheet1']
+    for cell in (sheet['A1'], sheet['B1']):
+        assert cell.font.b
+        assert {side.style for side in (cell.border.left, cell.border.right, cell.border.top, cell.border.bottom)} == {'thin'}
+        assert (cell.alignment.horizontal, cell.alignment.vertical) == ('center', 'top')
+    assert not sheet['A2'].font.b and sheet['A2'].border.left.style is None
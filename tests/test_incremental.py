@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""Інкрементальний аналіз: дозавантаження нових днів дає ті самі результати, що й повний аналіз"""
+
+from conftest import assert_same_results, make_analyzer, quiet
+from incremental import IncrementalAnalysis
+from session_index import local_ns, NS_PER_DAY
+
+
+def test_incremental_update_equals_full_analysis(tmp_path, bars, loop_results):
+    days = local_ns(bars['Datetime']) // NS_PER_DAY
+    middle = days[len(days) // 2]
+
+    incremental = IncrementalAnalysis(str(tmp_path / 'state.pkl'), make_analyzer())
+    quiet(incremental.update, bars[days < middle].reset_index(drop=True))
+    results, recomputed = quiet(incremental.update, bars.reset_index(drop=True))
+
+    assert recomputed
+    assert_same_results(results, loop_results)
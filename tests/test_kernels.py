@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Ядра по сегментах збігаються з прямим проходом по кожному сегменту"""
+
+import numpy as np
+import pytest
+
+from kernels import first_touch, segment_extrema
+
+
+@pytest.fixture
+def segments():
+    rng = np.random.default_rng(3)
+    values = np.round(1.1 + rng.normal(0, 0.001, 500).cumsum(), 5)
+    values[rng.integers(0, 500, 40)] = np.nan
+    values[100:110] = np.nan  # сегмент лише з NaN
+    lo = np.array([0, 100, 50, 120, 300, 499, 200])
+    hi = np.array([50, 110, 50, 300, 499, 500, 260])  # [50, 50) порожній
+    return values, lo, hi
+
+
+@pytest.mark.parametrize('kind', ['max', 'min'])
+def test_segment_extrema_matches_direct_scan(segments, kind):
+    values, lo, hi = segments
+    extremum, first = segment_extrema(values, lo, hi, kind)
+
+    for segment, (start, end) in enumerate(zip(lo, hi)):
+        window = values[start:end]
+        if end <= start or np.isnan(window).all():
+            assert np.isnan(extremum[segment]) and first[segment] == -1
+            continue
+        expected = np.nanmax(window) if kind == 'max' else np.nanmin(window)
+        assert extremum[segment] == expected
+        assert first[segment] == start + int(np.flatnonzero(window == expected)[0])
+
+
+def test_first_touch_matches_direct_scan(segments):
+    values, lo, hi = segments
+    high, low = values + 0.0002, values - 0.0002
+    tolerance = 0.0003
+    levels = np.column_stack([values[lo] + 0.001, np.full(len(lo), 1.1)])
+
+    first = first_touch(high, low, levels, tolerance, lo, hi)
+    for segment, (start, end) in enumerate(zip(lo, hi)):
+        for column, level in enumerate(levels[segment]):
+            touched = [position for position in range(start, end)
+                       if abs(high[position] - level) <= tolerance or abs(low[position] - level) <= tolerance]
+            assert first[segment, column] == (touched[0] if touched else -1)
+
+
+def test_first_touch_single_segment():
+    high = np.array([1.1000, 1.1010, 1.1020])
+    low = high - 0.0005
+    assert first_touch(high, low, 1.1013, 0.0003) == 1
+    assert first_touch(high, low, 1.2, 0.0003) == -1
+    assert first_touch(high, low, [1.1013, 1.1021], 0.0003).tolist() == [1, 2]
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""Живий аналіз: CSV, поданий по одному рядку, дає ті самі результати днів, що й analyze_period"""
+
+from conftest import assert_same_results, make_analyzer
+from live_analyzer import LiveAnalyzer, csv_tail, run
+
+
+def test_live_stream_equals_analyze_period(m1_csv, loop_results):
+    live = LiveAnalyzer(make_analyzer())
+    events = []
+    run(live, csv_tail(m1_csv, follow=False), on_event=events.append)
+
+    assert_same_results(live.results_frame(), loop_results)
+    assert sum(event.kind == 'day_result' for event in events) == len(loop_results)
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""Паралельний аналіз частинами днів дає ті самі результати, що й послідовний"""
+
+import pytest
+
+from conftest import assert_same_results, make_analyzer, quiet
+
+
+@pytest.mark.parametrize('engine', ['loop', 'vectorized'])
+def test_parallel_equals_serial(bars, loop_results, engine):
+    results = quiet(make_analyzer().analyze_period, bars.copy(), engine=engine, workers=3)
+    assert_same_results(results, loop_results)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Кожна комбінація перебору дає ті самі результати, що й рушій loop з тими самими параметрами"""
+
+import pytest
+
+from config import Config
+from conftest import assert_same_results, make_analyzer, quiet
+from parameter_sweep import ParameterSweep, parameter_grid, parse_hours
+from result_statistics import metric_summary
+
+
+@pytest.fixture(scope='module')
+def grid():
+    return parameter_grid({'asia': [(2, 10), (1, 9)], 'london': [(10, 15), (9, 14)]}, tolerances=[0.0003, 0.0005])
+
+
+def loop_analysis(bars, combination, monkeypatch):
+    monkeypatch.setattr(Config, 'SESSIONS', combination['sessions'])
+    analyzer = make_analyzer()
+    analyzer.pip_size = combination['pip_size']
+    analyzer.tolerance = combination['tolerance']
+    return quiet(analyzer.analyze_period, bars.copy(), engine='loop', workers=1)
+
+
+def test_grid_covers_every_combination(grid):
+    assert len(grid) == 8
+    assert {tuple(combination['sessions']) for combination in grid} == {tuple(Config.SESSIONS)}
+    assert all(combination['sessions']['newyork'] == Config.SESSIONS['newyork'] for combination in grid)
+
+
+def test_each_combination_equals_loop_engine(bars, grid, monkeypatch):
+    sweep = ParameterSweep(bars)
+    table = quiet(sweep.run, grid)
+    assert len(table) == len(grid)
+
+    for number, combination in enumerate(grid):
+        with monkeypatch.context() as patch:
+            expected = loop_analysis(bars, combination, patch)
+        results = sweep.evaluate(combination['sessions'], combination['pip_size'], combination['tolerance'])
+        assert_same_results(results, expected)
+
+        row = table.iloc[number]
+        assert row['asia_start'] == combination['sessions']['asia']['start']
+        assert row['tolerance'] == combination['tolerance']
+        for metric, value in metric_summary(expected).items():
+            assert row[metric] == pytest.approx(value, nan_ok=True, rel=0, abs=0)
+
+
+@pytest.mark.parametrize('text', ['10-2', '5-5', '-1-4', '20-25', 'x'])
+def test_invalid_hours(text):
+    with pytest.raises(ValueError):
+        parse_hours(text)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""Цілочисельні одиниці цін: пропущені ціни (NaN) пропускаються, а не зупиняють аналіз"""
+
+import numpy as np
+
+from conftest import assert_same_results, make_analyzer, quiet
+from price_units import MISSING_HIGH, MISSING_LOW, price_units, to_units
+
+
+def test_to_units_masks_missing_prices():
+    prices = np.array([1.10001, np.nan, 1.09999])
+    np.testing.assert_array_equal(to_units(prices, MISSING_HIGH), [110001, MISSING_HIGH, 109999])
+    np.testing.assert_array_equal(to_units(prices, MISSING_LOW), [110001, MISSING_LOW, 109999])
+    assert np.isnan(price_units(np.nan))
+    assert price_units(1.100015) == 110001.5
+
+
+def test_engines_agree_on_bars_with_missing_prices(bars):
+    df = bars.copy()
+    rng = np.random.default_rng(3)
+    for column in ('Open', 'High', 'Low', 'Close'):
+        df.loc[rng.choice(df.index, len(df) // 50, replace=False), column] = np.nan
+
+    loop = quiet(make_analyzer().analyze_period, df.copy(), engine='loop', workers=1)
+    vectorized = quiet(make_analyzer().analyze_period, df.copy(), engine='vectorized', workers=1)
+    assert len(loop) > 0
+    assert_same_results(vectorized, loop)
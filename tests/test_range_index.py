@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Sparse table дає ті самі екстремуми і перші позиції, що й прямий прохід по вікну"""
+
+import numpy as np
+import pytest
+
+from range_index import RangeExtrema
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(11)
+    values = np.round(1.1 + rng.normal(0, 0.0005, 3000).cumsum(), 4)  # багато рівних значень
+    values[rng.integers(0, 3000, 200)] = np.nan
+    values[500:520] = np.nan
+    return values
+
+
+def expected_position(values, lo, hi, kind):
+    window = values[lo:hi]
+    if hi <= lo:
+        return -1
+    if np.isnan(window).all():
+        return lo  # вікно лише з NaN: позиція першого бару, значення NaN
+    extremum = np.nanmax(window) if kind == 'max' else np.nanmin(window)
+    return lo + int(np.flatnonzero(window == extremum)[0])
+
+
+@pytest.mark.parametrize('kind', ['max', 'min'])
+@pytest.mark.parametrize('max_window', [None, 64])
+def test_positions_match_direct_scan(values, kind, max_window):
+    rng = np.random.default_rng(5)
+    lo = rng.integers(0, len(values), 400)
+    hi = np.minimum(lo + rng.integers(0, 1500, 400), len(values))
+    lo = np.append(lo, [505, 10, 0])
+    hi = np.append(hi, [515, 10, len(values)])
+    index = RangeExtrema(values, kind, max_window)
+
+    expected = [expected_position(values, start, end, kind) for start, end in zip(lo, hi)]
+    assert index.positions(lo, hi).tolist() == expected
+    assert [index.position(start, end) for start, end in zip(lo, hi)] == expected
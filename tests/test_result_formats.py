@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Файли результатів у всіх форматах читаються назад у ту саму таблицю"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import assert_same_results, make_analyzer, quiet
+from result_formats import cube_path, format_from_path, has_pyarrow, read_results, stats_path, with_format
+from results_schema import format_results, typed_results
+
+FORMATS = ['csv.gz', 'jsonl'] + (['parquet', 'arrow'] if has_pyarrow() else [])
+
+
+@pytest.fixture(scope='module')
+def saved(tmp_path_factory, loop_results):
+    """Результати, збережені в Excel, а потім окремо в кожному форматі"""
+    directory = tmp_path_factory.mktemp('results')
+    analyzer = make_analyzer()
+    paths = {}
+    for fmt in ['xlsx'] + FORMATS:
+        path = str(directory / fmt / ('results' + with_format('.xlsx', fmt)))
+        os.makedirs(os.path.dirname(path))
+        quiet(analyzer.save_results, loop_results, path, [])
+        paths[fmt] = path
+    return paths
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_round_trip(saved, loop_results, fmt):
+    path = saved[fmt]
+    assert os.path.exists(stats_path(path)) and os.path.exists(cube_path(path))
+
+    results, stats, cube = read_results(path, with_cube=True)
+    assert_same_results(typed_results(results), loop_results)
+    pd.testing.assert_frame_equal(results, format_results(loop_results), check_exact=True)
+
+    _, excel_stats, excel_cube = read_results(saved['xlsx'], with_cube=True)
+    pd.testing.assert_frame_equal(stats, excel_stats, check_exact=True, check_dtype=False)
+    assert cube.shape == excel_cube.shape
+
+
+def test_format_from_path():
+    assert format_from_path('a/results.CSV.GZ') == 'csv.gz'
+    assert format_from_path('results.feather') == 'arrow'
+    assert with_format('results.xlsx', 'jsonl') == 'results.jsonl'
+    assert stats_path('results.csv.gz') == 'results.stats.csv.gz'
+    with pytest.raises(ValueError):
+        format_from_path('results.txt')
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Куб статистики: розрізи збігаються з групуваннями, які раніше рахували переглядачі результатів"""
+
+import numpy as np
+
+from results_schema import format_results
+from result_statistics import cube_table, statistics_cube
+
+
+def test_weekday_and_sweep_type_breakdowns_match_groupby(loop_results):
+    df = format_results(loop_results)
+    cube = statistics_cube(loop_results)
+
+    weekday = cube_table(cube, 'weekday')
+    expected = df.groupby('day_of_week').agg(
+        extension=('extension_pips', 'mean'),
+        continues=('sweep_type', lambda x: (x == 'Continue').sum()),
+        longs=('london_direction', lambda x: (x == 'Long').sum()),
+    )
+    assert list(weekday.index) == list(expected.index)
+    np.testing.assert_allclose(weekday['Extension Pips Mean'], expected['extension'])
+    np.testing.assert_array_equal(weekday['Continue'], expected['continues'])
+    np.testing.assert_array_equal(weekday['London Long'], expected['longs'])
+
+    sweep = cube_table(cube, 'sweep_type')
+    expected = df.groupby('sweep_type').agg(
+        mean=('extension_pips', 'mean'),
+        std=('extension_pips', 'std'),
+        rebalance=('rebalance', lambda x: (x == 'Yes').sum()),
+    )
+    assert list(sweep.index) == list(expected.index)
+    np.testing.assert_allclose(sweep['Extension Pips Mean'], expected['mean'])
+    np.testing.assert_allclose(sweep['Extension Pips Std'], expected['std'])
+    np.testing.assert_array_equal(sweep['Rebalance Yes'], expected['rebalance'])
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Типізована схема результатів: типи колонок не залежать від значень, форматування стабільне"""
+
+import numpy as np
+import pandas as pd
+
+from results_schema import MEASURE_COLUMNS, MEASURE_DTYPES, format_results, typed_results
+
+
+def day(date, ny_percent, extension_pips):
+    return {
+        'date': date, 'day_of_week': 'Monday', 'sweep_type': 'Continue', 'rebalance': 'No',
+        'max_time': '09:15', 'extension_pips': extension_pips, 'ny_up_extension_percent': ny_percent,
+    }
+
+
+def test_measure_dtypes_do_not_depend_on_values():
+    # 142.5 точно представлене у float32, 142.44186 - ні
+    exact = typed_results(pd.DataFrame([day('2024-01-01', 142.5, 10.5)]))
+    inexact = typed_results(pd.DataFrame([day('2024-01-02', 142.44186, 10.3)]))
+    for column in ('extension_pips', 'ny_up_extension_percent'):
+        assert exact[column].dtype == inexact[column].dtype == MEASURE_DTYPES[column]
+
+
+def test_concat_of_typed_parts_formats_like_whole():
+    days = [day('2024-01-01', 142.5, 10.5), day('2024-01-02', 142.44186, 10.3)]
+    whole = typed_results(pd.DataFrame(days))
+    parts = pd.concat([typed_results(pd.DataFrame([d])) for d in days], ignore_index=True)
+    pd.testing.assert_frame_equal(format_results(parts), format_results(whole))
+    assert format_results(whole)['ny_up_extension_percent'].tolist() == [142.5, 142.44186]
+
+
+def test_format_rounds_every_measure_column():
+    values = {column: [1 / 3] for column in MEASURE_COLUMNS}
+    formatted = format_results(pd.DataFrame(values).astype(np.float64))
+    for column, digits in MEASURE_COLUMNS.items():
+        assert formatted[column].iloc[0] == round(1 / 3, digits)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Куб агрегатів сесій: збережений куб приймається лише для тих самих барів"""
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from conftest import make_analyzer
+from day_context import DayContext
+from session_cube import CUBE_VERSION, SessionCube
+
+
+def test_saved_cube_rejects_corrected_prices(tmp_path, bars):
+    path = str(tmp_path / 'cube.npz')
+    SessionCube.build(bars).save(path)
+
+    assert SessionCube.load(path).bind(bars.copy())
+
+    corrected = bars.copy()
+    corrected.loc[corrected.index[len(corrected) // 2], 'High'] += 0.0005
+    assert not SessionCube.load(path).bind(corrected)
+
+
+def test_session_without_prices_is_counted_from_bars(bars):
+    # Азійська сесія одного дня має бари, але без High
+    date = bars['Datetime'].dt.normalize().iloc[len(bars) // 2]
+    start, end = Config.SESSIONS['asia']['start'], Config.SESSIONS['asia']['end']
+    hours = bars['Datetime'].dt.hour
+    damaged = bars.copy()
+    damaged.loc[(damaged['Datetime'].dt.normalize() == date) & (hours >= start) & (hours < end), 'High'] = np.nan
+
+    cube = SessionCube.build(damaged)
+    assert cube.lookup(date, start, end) == (False, None)
+
+    analyzer = make_analyzer()
+    analyzer.build_session_index(damaged)
+    analyzer.session_cube = cube
+    ranges = make_analyzer()
+    ranges.build_session_index(damaged)
+    from_cube = DayContext(analyzer, damaged, date).session_stats(start, end)
+    from_bars = DayContext(ranges, damaged, date).session_stats(start, end)
+    pd.testing.assert_series_equal(pd.Series(from_cube._asdict()), pd.Series(from_bars._asdict()))
+
+
+def test_cube_of_older_version_is_rebuilt(tmp_path, bars):
+    path = str(tmp_path / 'cube.npz')
+    cube = SessionCube.build(bars)
+    cube.version = CUBE_VERSION - 1
+    cube.save(path)
+    assert not SessionCube.load(path).bind(bars.copy())
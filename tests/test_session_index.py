@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Позиційні зрізи індексу сесій збігаються з вибіркою за булевою маскою"""
+
+import pandas as pd
+import pytest
+
+from conftest import make_analyzer
+from session_index import SessionIndex
+
+HOURS = [(0, 24), (2, 10), (9, 10), (10, 15), (15, 19), (23, 24), (22, 3)]
+
+
+@pytest.mark.parametrize('start_hour, end_hour', HOURS)
+def test_slices_equal_mask_selection(bars, start_hour, end_hour):
+    analyzer = make_analyzer()
+    analyzer.session_index = None  # вибірка маскою
+    index = SessionIndex(bars)
+    assert index.valid and index.matches(bars)
+
+    days = pd.date_range(bars['Datetime'].min().normalize() - pd.Timedelta(days=1),
+                         bars['Datetime'].max().normalize() + pd.Timedelta(days=1))
+    for date in days:
+        expected = analyzer.get_session_data(bars, date, start_hour, end_hour)
+        pd.testing.assert_frame_equal(index.slice(date, start_hour, end_hour), expected, check_exact=True)
+
+
+def test_unordered_data_is_not_indexed(bars):
+    shuffled = bars.iloc[::-1]
+    assert not SessionIndex(shuffled).valid
+    assert not SessionIndex(shuffled).matches(shuffled)
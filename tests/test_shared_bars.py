@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Бари у спільній пам'яті: воркер бачить ті самі дані, блоки видаляються після виходу"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pandas as pd
+import pytest
+
+from shared_bars import SharedBars
+
+
+def _close_sum(spec, lo, hi):
+    with SharedBars.attach(spec) as bars:
+        return float(bars.frame(lo, hi)['Close'].sum())
+
+
+def test_frames_equal_source(bars):
+    with SharedBars.create(bars) as shared:
+        pd.testing.assert_frame_equal(shared.frame(), bars, check_exact=True)
+        pd.testing.assert_frame_equal(shared.frame(100, 2000), bars.iloc[100:2000].reset_index(drop=True),
+                                      check_exact=True)
+        assert shared.frame().attrs['timezone'] == bars.attrs['timezone']
+        with pytest.raises(ValueError):
+            shared.array('Close')[0] = 0.0
+
+        with ProcessPoolExecutor(2) as executor:
+            sums = list(executor.map(_close_sum, [shared.spec] * 2, [0, 5000], [5000, len(bars)]))
+        assert sums == [float(bars['Close'].iloc[:5000].sum()), float(bars['Close'].iloc[5000:].sum())]
+        names = list(shared.spec['blocks'].values())
+
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_empty_frame(bars):
+    with SharedBars.create(bars.iloc[:0]) as shared:
+        assert shared.frame().empty
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Профілювання етапів не змінює результатів і рахує виклики та рядки вкладених етапів"""
+
+from conftest import assert_same_results, quiet
+from liquidity_analyzer import LiquidityAnalyzer
+from stage_profiler import REPORT_COLUMNS, StageProfiler
+
+
+def test_profiled_analysis(m1_csv, bars, loop_results):
+    analyzer = LiquidityAnalyzer(use_cache=False, profile=True)
+    df = quiet(analyzer.load_data, m1_csv)
+    assert_same_results(quiet(analyzer.analyze_period, df, engine='loop', workers=1), loop_results)
+
+    report = analyzer.stage_report().set_index('Stage')
+    assert list(report.reset_index().columns) == REPORT_COLUMNS
+    assert report.loc['load_data', 'Calls'] == 1 and report.loc['load_data', 'Rows'] == len(bars)
+    assert report.loc['analyze_day', 'Calls'] == bars['Datetime'].dt.normalize().nunique()
+    # Рядки дня - сума рядків, переглянутих його кроками
+    steps = [stage for stage in report.index if stage in LiquidityAnalyzer.PROFILED_STAGES
+             and report.index.get_loc(stage) > report.index.get_loc('analyze_day')]
+    assert report.loc['analyze_day', 'Rows'] == report.loc[steps, 'Rows'].sum() > 0
+
+
+def test_nested_rows_and_merge():
+    profiler = StageProfiler()
+    inner = profiler.wrap('inner', lambda count: list(range(count)), rows=lambda result, count: len(result))
+    outer = profiler.wrap('outer', lambda: [inner(3), inner(4)])
+    outer()
+    outer()
+
+    assert profiler.stages['inner'][0] == 4 and profiler.stages['inner'][2] == 14
+    assert profiler.stages['outer'][0] == 2 and profiler.stages['outer'][2] == 14
+
+    other = StageProfiler()
+    other.merge(profiler.stages)
+    other.merge(profiler.stages)
+    assert other.stages['inner'][0] == 8 and other.stages['outer'][2] == 28
+
+
+def test_unprofiled_analyzer_has_no_wrappers():
+    analyzer = LiquidityAnalyzer(use_cache=False, profile=False)
+    assert analyzer.profiler is None and analyzer.stage_report() is None
+    assert 'analyze_day' not in vars(analyzer)
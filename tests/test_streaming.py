@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Потоковий аналіз по днях дає ті самі результати, що й analyze_period над усім файлом"""
+
+import pandas as pd
+import pytest
+
+from conftest import assert_same_results, make_analyzer, quiet
+from results_schema import typed_results
+
+
+@pytest.mark.parametrize('chunk_rows', [997, 50_000])
+def test_stream_equals_analyze_period(m1_csv, loop_results, chunk_rows):
+    analyzer = make_analyzer()
+    results = quiet(lambda: list(analyzer.analyze_stream(m1_csv, chunk_rows)))
+    assert_same_results(typed_results(pd.DataFrame(results)), loop_results)
+
+
+def test_days_carry_previous_day(m1_csv, bars):
+    days = quiet(lambda: list(make_analyzer().iter_days(m1_csv, 997)))
+    local_days = bars['Datetime'].dt.normalize()
+    assert [date for date, _ in days] == list(local_days.unique())
+
+    for date, frame in days[1:]:
+        expected = bars[local_days.isin([date, date - pd.Timedelta(days=1)])]
+        assert frame['Datetime'].tolist() == expected['Datetime'].tolist()
+
+
+def test_unordered_data_is_rejected(tmp_path, m1_csv):
+    lines = open(m1_csv, encoding='utf-8').read().splitlines()[:5000]
+    path = tmp_path / 'unordered.csv'
+    path.write_text('\n'.join(lines[2000:] + lines[:2000]) + '\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        quiet(lambda: list(make_analyzer().iter_days(str(path), 997)))
+
+
+def test_stream_with_missing_prices(tmp_path, m1_csv):
+    # Порожня ціна далеко за першою частиною файлу
+    lines = open(m1_csv, encoding='utf-8').read().splitlines()[:20000]
+    fields = lines[15000].split(',')
+    fields[3] = ''
+    lines[15000] = ','.join(fields)
+    path = str(tmp_path / 'gaps.csv')
+    open(path, 'w', encoding='utf-8').write('\n'.join(lines) + '\n')
+
+    analyzer = make_analyzer()
+    expected = quiet(analyzer.analyze_period, quiet(analyzer.load_data, path), engine='loop', workers=1)
+    results = quiet(lambda: list(make_analyzer().analyze_stream(path, 997)))
+    assert_same_results(typed_results(pd.DataFrame(results)), expected)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Синтетичні M1 дані: відтворювані за seed, без барів при закритому ринку, з коректними OHLC"""
+
+import numpy as np
+import pandas as pd
+
+import synthetic_data
+from conftest import make_analyzer, quiet
+
+
+def bars_frame(months, seed):
+    return pd.concat(synthetic_data.generate_bars(months, start='2024-02-15', seed=seed), ignore_index=True)
+
+
+def test_same_seed_same_bars():
+    pd.testing.assert_frame_equal(bars_frame(1, 3), bars_frame(1, 3), check_exact=True)
+    assert not bars_frame(1, 3)['Close'].equals(bars_frame(1, 4)['Close'])
+
+
+def test_market_hours_and_ohlc():
+    bars = bars_frame(2, 0)
+    market = bars['Datetime'].dt.tz_convert(synthetic_data.MARKET_ZONE)
+    assert not (market.dt.weekday == 5).any()
+    assert bars['Datetime'].is_monotonic_increasing and bars['Datetime'].is_unique
+
+    highs, lows = bars['High'].to_numpy(), bars['Low'].to_numpy()
+    assert (highs >= np.maximum(bars['Open'], bars['Close'])).all()
+    assert (lows <= np.minimum(bars['Open'], bars['Close'])).all()
+
+
+def test_write_csv_loads_back(tmp_path, m1_csv, bars):
+    path = str(tmp_path / 'bars.csv')
+    count = synthetic_data.write_csv(path, 2, start='2024-02-15', seed=7)
+    assert count == len(bars)
+    assert open(path, encoding='utf-8').read() == open(m1_csv, encoding='utf-8').read()
+    assert len(quiet(make_analyzer().load_data, path)) == count
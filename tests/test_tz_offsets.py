@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Таблиця зсувів часової зони: той самий наївний локальний час, що й tz_convert"""
+
+import numpy as np
+import pandas as pd
+
+from session_index import NS_PER_HOUR
+from tz_offsets import OffsetTable
+
+
+def test_zone_table_matches_tz_convert_across_dst():
+    utc = pd.date_range('2023-03-20', '2023-11-05', freq='7min', tz='UTC', unit='ns')
+    table = OffsetTable.from_zone('Europe/Kyiv', utc[0].value, utc[-1].value)
+    expected = utc.tz_convert('Europe/Kyiv').tz_localize(None).asi8
+    np.testing.assert_array_equal(table.to_local(utc.asi8), expected)
+
+
+def test_fixed_table_applies_constant_offset():
+    table = OffsetTable.fixed(3)
+    utc = pd.date_range('2023-01-01', periods=5, freq='h', unit='ns').asi8
+    np.testing.assert_array_equal(table.to_local(utc), utc + 3 * NS_PER_HOUR)
+    assert table.name == 'UTC+03:00'
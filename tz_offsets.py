@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Таблиця зсувів часової зони
+Зсув від UTC для кожного моменту береться з таблиці переходів (DST) через searchsorted
+по int64 наносекундах, тому дані зберігаються як наївний локальний час без tz-aware Timestamp
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from session_index import NS_PER_HOUR, NS_PER_MINUTE
+
+INT64_MIN = np.iinfo(np.int64).min
+
+# Крок вибірки при побудові таблиці (переходи відбуваються на межі 15 хвилин)
+SAMPLE_STEP_NS = 15 * NS_PER_MINUTE
+
+
+def utc_ns(datetimes):
+    """Моменти Series з datetime як int64 UTC наносекунди (наївні вважаються UTC)"""
+    if datetimes.dt.tz is not None:
+        datetimes = datetimes.dt.tz_convert('UTC').dt.tz_localize(None)
+    return datetimes.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+@lru_cache(maxsize=32)
+def _zone_transitions(zone, first_year, last_year):
+    """Переходи зони за роки [first_year, last_year]: (моменти UTC, зсуви) як кортежі"""
+    start = pd.Timestamp(year=first_year, month=1, day=1).value - 2 * 24 * NS_PER_HOUR
+    end = pd.Timestamp(year=last_year + 1, month=1, day=1).value + 2 * 24 * NS_PER_HOUR
+    samples = np.arange(start, end, SAMPLE_STEP_NS, dtype=np.int64)
+
+    local = pd.DatetimeIndex(samples.view('datetime64[ns]')).tz_localize('UTC').tz_convert(zone)
+    offsets = local.tz_localize(None).asi8 - samples
+
+    changes = np.flatnonzero(offsets[1:] != offsets[:-1]) + 1
+    transitions = np.concatenate([[INT64_MIN], samples[changes]])
+    return tuple(transitions.tolist()), tuple(offsets[np.concatenate([[0], changes])].tolist())
+
+
+class OffsetTable:
+    """Зсуви від UTC: offsets[i] діє з моменту transitions[i] (UTC ns) до наступного переходу"""
+
+    def __init__(self, name, transitions, offsets, zone=None):
+        self.name = name
+        self.zone = zone
+        self.transitions = np.asarray(transitions, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def fixed(cls, hours):
+        """Постійний зсув UTC+hours без переходів"""
+        sign = '+' if hours >= 0 else '-'
+        name = f"UTC{sign}{abs(int(hours)):02d}:{int(abs(hours) * 60) % 60:02d}"
+        return cls(name, [INT64_MIN], [int(hours * NS_PER_HOUR)])
+
+    @classmethod
+    def from_zone(cls, zone, start_ns, end_ns):
+        """Таблиця для зони (наприклад Europe/Kyiv), що покриває моменти [start_ns, end_ns]"""
+        first_year = pd.Timestamp(int(start_ns)).year
+        last_year = pd.Timestamp(int(end_ns)).year
+        transitions, offsets = _zone_transitions(zone, first_year, last_year)
+        return cls(zone, transitions, offsets, zone=zone)
+
+    def offsets_for(self, utc_ns):
+        """Зсув для кожного UTC моменту"""
+        idx = np.searchsorted(self.transitions, utc_ns, side='right') - 1
+        return self.offsets[idx]
+
+    def to_local(self, utc_ns):
+        """UTC ns → наївний локальний час ns"""
+        utc_ns = np.asarray(utc_ns, dtype=np.int64)
+        return utc_ns + self.offsets_for(utc_ns)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Векторизований рушій аналізу ліквідності EUR/USD
+Обчислює всі колонки analyze_day для всіх днів за один прохід по масивах NumPy
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from kernels import segment_extrema, first_touch
+from price_units import MISSING_HIGH, MISSING_LOW, PRICE_SCALE, from_units, price_units, to_units
+from range_index import RangeExtrema
+from results_schema import MISSING_MINUTE, typed_results
+from session_index import NS_PER_MINUTE, NS_PER_HOUR, NS_PER_DAY, DAY_END_NS, local_ns
+
+
+def minute_of_day(times_ns, valid):
+    """Хвилина доби (int16, MISSING_MINUTE там, де valid == False)"""
+    minutes = ((times_ns % NS_PER_DAY) // NS_PER_MINUTE).astype(np.int16)
+    return np.where(valid, minutes, np.int16(MISSING_MINUTE))
+
+
+class PreparedBars:
+    """Відсортовані бари в одиницях цін і календарні дні - спільна підготовка для кількох запусків рушія
+
+    Межі та екстремуми сесій кешуються за годинами, тож запуски з різними порогами і допусками
+    (або з тими самими сесіями) рахують їх один раз. З ranges=True екстремуми будь-яких вікон
+    беруться з sparse table (range_index.RangeExtrema) за O(1) на вікно.
+    """
+
+    def __init__(self, times, open_, high, low, ranges=False):
+        self.times = times
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.day_start = np.unique(times // NS_PER_DAY) * NS_PER_DAY
+        self.ranges = None
+        if ranges:
+            self.ranges = {
+                'max': RangeExtrema(high, 'max', Config.RANGE_INDEX_MAX_WINDOW),
+                'min': RangeExtrema(low, 'min', Config.RANGE_INDEX_MAX_WINDOW),
+            }
+        self._sessions = {}
+
+    @classmethod
+    def from_frame(cls, df, session_index=None, ranges=False):
+        """Підготовка DataFrame (None для порожніх даних)"""
+        if df.empty:
+            return None
+
+        order = None
+        if session_index is not None and session_index.matches(df):
+            # Час уже підготовлено і відсортовано при побудові індексу
+            times = session_index.times
+        else:
+            times = local_ns(df['Datetime'])
+        if not np.all(times[1:] >= times[:-1]):
+            order = np.argsort(times, kind='stable')
+            times = times[order]
+
+        # High/Low - int32 одиниці (price_units): порівняння точні, пам'ять на бар удвічі менша за float64,
+        # пропущені ціни не стають екстремумами. Open потрібен лише на початку сесій і лишається
+        # float64 одиницями, щоб пропущене відкриття дало NaN, як у рушії loop
+        def column(name, missing=None):
+            prices = df[name].to_numpy(dtype=np.float64)
+            values = np.rint(prices * PRICE_SCALE) if missing is None else to_units(prices, missing)
+            return values[order] if order is not None else values
+
+        return cls(times, column('Open'), column('High', MISSING_HIGH), column('Low', MISSING_LOW), ranges)
+
+    def bound(self, day_start, hour):
+        """Позиція першого бару не раніше day_start + hour (або кінця дня для 24)"""
+        offset = DAY_END_NS if hour == 24 else hour * NS_PER_HOUR
+        return np.searchsorted(self.times, day_start + offset, side='left')
+
+    def extrema(self, lo, hi, kind='max'):
+        """Максимум High (kind='max') або мінімум Low на сегментах [lo, hi): як kernels.segment_extrema
+
+        Сегмент лише з пропущеними цінами дає NaN, як max/min у рушії loop.
+        """
+        if self.ranges is None:
+            values, positions = segment_extrema(self.high if kind == 'max' else self.low, lo, hi, kind)
+        else:
+            table = self.ranges[kind]
+            positions = table.positions(lo, hi)
+            found = positions >= 0
+            values = np.full(len(positions), np.nan)
+            values[found] = table.values[positions[found]]
+        values[values == (MISSING_HIGH if kind == 'max' else MISSING_LOW)] = np.nan
+        return values, positions
+
+    def session(self, start_hour, end_hour, day_offset=0):
+        """Межі та екстремуми сесії для всіх днів: (lo, hi, high, high_idx, low, low_idx)"""
+        key = (start_hour, end_hour, day_offset)
+        if key not in self._sessions:
+            day_start = self.day_start + day_offset * NS_PER_DAY
+            lo, hi = self.bound(day_start, start_hour), self.bound(day_start, end_hour)
+            self._sessions[key] = (lo, hi) + self.extrema(lo, hi, 'max') + self.extrema(lo, hi, 'min')
+        return self._sessions[key]
+
+
+class VectorizedEngine:
+    """Рушій, що повторює LiquidityAnalyzer.analyze_day для всіх днів одночасно"""
+
+    def __init__(self, pip_size, tolerance, sessions=None):
+        self.pip_size = pip_size
+        self.tolerance = tolerance
+        self.sessions = sessions or Config.SESSIONS
+
+    def _session(self, bars, name, days):
+        """Межі та екстремуми сесії name для вибраних днів"""
+        session = self.sessions[name]
+        return tuple(values[days] for values in bars.session(session['start'], session['end']))
+
+    def analyze(self, df, session_index=None, typed=True):
+        """Аналіз всього періоду, результат ідентичний LiquidityAnalyzer.analyze_period
+
+        typed=False - таблиця до приведення до типізованої схеми (для об'єднання частин).
+        """
+        bars = PreparedBars.from_frame(df, session_index)
+        if bars is None:
+            return pd.DataFrame([])
+        return self.evaluate(bars, typed)
+
+    def evaluate(self, bars, typed=True):
+        """Аналіз підготовлених барів з параметрами рушія (типізована схема, якщо typed)"""
+        times, open_, high, low = bars.times, bars.open, bars.high, bars.low
+
+        pip = price_units(self.pip_size)
+        tol = price_units(self.tolerance)
+
+        # Азія - дні без азійських даних пропускаються
+        asia = self.sessions['asia']
+        asia_lo, asia_hi, asia_high, _, asia_low, _ = bars.session(asia['start'], asia['end'])
+        has_asia = asia_hi > asia_lo
+        day_start = bars.day_start[has_asia]
+        asia_high, asia_low = asia_high[has_asia], asia_low[has_asia]
+
+        days = len(day_start)
+        if days == 0:
+            return pd.DataFrame([])
+
+        asia_mid = (asia_high + asia_low) / 2
+        asia_range = asia_high - asia_low
+
+        # PDH/PDL - весь попередній календарний день
+        prev_lo, prev_hi, pdh, _, pdl, _ = (values[has_asia] for values in bars.session(0, 24, day_offset=-1))
+        has_prev = prev_hi > prev_lo
+
+        # Frankfurt
+        fr_lo, fr_hi, fr_high, fr_high_idx, fr_low, fr_low_idx = self._session(bars, 'frankfurt', has_asia)
+        has_fr = fr_hi > fr_lo
+        fr_sweep_high = has_fr & (fr_high >= asia_high + pip)
+        fr_sweep_low = has_fr & (fr_low <= asia_low - pip)
+
+        # London
+        ld_lo, ld_hi, ld_high, ld_high_idx, ld_low, ld_low_idx = self._session(bars, 'london', has_asia)
+        has_ld = ld_hi > ld_lo
+        ld_open = np.where(has_ld, open_[np.minimum(ld_lo, len(open_) - 1)], np.nan)
+        ld_sweep_high = has_ld & (ld_high >= asia_high + pip)
+        ld_sweep_low = has_ld & (ld_low <= asia_low - pip)
+        ld_high_time = times[np.maximum(ld_high_idx, 0)]
+        ld_low_time = times[np.maximum(ld_low_idx, 0)]
+
+        # Який sweep був першим
+        has_sweep = ld_sweep_high | ld_sweep_low
+        high_first = ld_sweep_high & (~ld_sweep_low | (ld_high_time <= ld_low_time))
+        sweep_price = np.where(high_first, asia_high, asia_low)
+        sweep_time = np.where(high_first, ld_high_time, ld_low_time)
+
+        # Вікно після sweep до кінця Лондону (включно)
+        london_end = day_start + self.sessions['london']['end'] * NS_PER_HOUR
+        after_lo = np.where(has_sweep, np.searchsorted(times, sweep_time, side='right'), 0)
+        after_hi = np.where(has_sweep, np.searchsorted(times, london_end, side='right'), 0)
+        has_after = has_sweep & (after_hi > after_lo)
+        after_high, after_high_idx = bars.extrema(after_lo, after_hi, 'max')
+        after_low, after_low_idx = bars.extrema(after_lo, after_hi, 'min')
+
+        # Основний рух Лондону
+        up_after = after_high - sweep_price
+        down_after = sweep_price - after_low
+        up_london = ld_high - ld_open
+        down_london = ld_open - ld_low
+        is_long = np.where(has_after, up_after > down_after, up_london > down_london)
+        has_direction = has_after | has_ld
+        london_direction = np.where(is_long, 'Long', 'Short').astype(object)
+        london_direction[~has_direction] = None
+
+        # Тип sweep
+        high_branch = ld_sweep_high & (~ld_sweep_low | (sweep_price == asia_high))
+        low_branch = ~high_branch & ld_sweep_low & (~ld_sweep_high | (sweep_price == asia_low))
+        sweep_type = np.full(days, 'No Sweep', dtype=object)
+        valid_type = has_sweep & has_direction
+        sweep_type[valid_type & high_branch] = np.where(is_long, 'Continue', 'Sweep and Reverse')[valid_type & high_branch]
+        sweep_type[valid_type & low_branch] = np.where(~is_long, 'Continue', 'Sweep and Reverse')[valid_type & low_branch]
+
+        # Rebalance: дотик до Asia Mid і подальший рух проти основного напрямку
+        check_rb = (sweep_type == 'Sweep and Reverse') & has_after
+        mid_touch = first_touch(high, low, asia_mid, tol, np.where(check_rb, after_lo, 0), np.where(check_rb, after_hi, 0))
+        touched = mid_touch >= 0
+        rb_lo = np.where(touched, np.searchsorted(times, times[np.maximum(mid_touch, 0)], side='right'), 0)
+        rb_hi = np.where(touched, after_hi, 0)
+        rb_lo = np.minimum(rb_lo, rb_hi)
+        rb_max, _ = bars.extrema(rb_lo, rb_hi, 'max')
+        rb_min, _ = bars.extrema(rb_lo, rb_hi, 'min')
+        rb_long = (london_direction == 'Long')
+        rebalance_yes = (rb_hi > rb_lo) & np.where(rb_long, rb_min < asia_mid - pip, rb_max > asia_mid + pip)
+
+        # Розширення
+        zero_range = asia_range == 0
+        ext_from_sweep = ~zero_range & has_sweep & has_after
+        ext_from_london = ~zero_range & ~has_sweep & has_ld
+        sweep_ext = np.where(ld_sweep_high, after_high - sweep_price, sweep_price - after_low) / pip
+        sweep_rev = np.where(ld_sweep_high, sweep_price - after_low, after_high - sweep_price) / pip
+        london_up = up_london > down_london
+        london_ext = np.where(london_up, up_london, down_london) / pip
+        london_rev = np.where(london_up, down_london, up_london) / pip
+        extension_pips = np.where(ext_from_sweep, sweep_ext, np.where(ext_from_london, london_ext, 0.0))
+        reverse_pips = np.where(ext_from_sweep, sweep_rev, np.where(ext_from_london, london_rev, 0.0))
+        has_ext = ext_from_sweep | ext_from_london
+        with np.errstate(divide='ignore', invalid='ignore'):
+            extension_percent = np.where(has_ext, (extension_pips * pip / asia_range) * 100, 0.0)
+            reverse_percent = np.where(has_ext, (reverse_pips * pip / asia_range) * 100, 0.0)
+        max_time = np.where(ext_from_sweep, times[np.maximum(after_high_idx, 0)], ld_high_time)
+        min_time = np.where(ext_from_sweep, times[np.maximum(after_low_idx, 0)], ld_low_time)
+
+        # Retests
+        retest_lo = np.where(has_after, after_lo, 0)
+        retest_hi = np.where(has_after, after_hi, 0)
+        retest_levels = np.column_stack([sweep_price, asia_mid])
+        retest_touch = first_touch(high, low, retest_levels, tol, retest_lo, retest_hi) >= 0
+        retest_sweep, retest_mid = retest_touch[:, 0], retest_touch[:, 1]
+
+        # PDH/PDL sweep у Лондоні
+        check_pd = has_ld & has_prev
+        sweep_pdh = check_pd & (ld_high >= pdh + pip)
+        sweep_pdl = check_pd & (ld_low <= pdl - pip)
+
+        # New York
+        ny_lo, ny_hi, ny_high, ny_high_idx, ny_low, ny_low_idx = self._session(bars, 'newyork', has_asia)
+        has_ny = ny_hi > ny_lo
+        ny_open = np.where(has_ny, open_[np.minimum(ny_lo, len(open_) - 1)], np.nan)
+        ny_up = ny_high - ny_open
+        ny_down = ny_open - ny_low
+        ny_direction = np.where(ny_up > ny_down, 'Long', 'Short').astype(object)
+        ny_direction[~has_ny] = None
+        ny_status = np.where(london_direction == ny_direction, 'Support', 'Reverse').astype(object)
+        ny_status[~has_ny | ~has_direction] = None
+        positive_range = asia_range > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ny_up_percent = np.where(positive_range, ny_up / asia_range * 100, 0.0)
+            ny_down_percent = np.where(positive_range, ny_down / asia_range * 100, 0.0)
+
+        def rounded(values, digits, valid=None):
+            values = np.round(values, digits)
+            if valid is not None:
+                values = np.where(valid, values, 0.0)
+            return values
+
+        # Float - лише для експорту цін
+        asia_high_price = from_units(asia_high)
+        asia_low_price = from_units(asia_low)
+
+        dates = pd.to_datetime(day_start)
+        ld_high_minute = minute_of_day(ld_high_time, ld_sweep_high)
+        ld_low_minute = minute_of_day(ld_low_time, ld_sweep_low)
+
+        results = pd.DataFrame({
+            'date': dates.strftime('%Y-%m-%d').tolist(),
+            'day_of_week': dates.strftime('%A').tolist(),
+            'asia_high': np.round(asia_high_price, 5),
+            'asia_low': np.round(asia_low_price, 5),
+            'asia_mid': np.round((asia_high_price + asia_low_price) / 2, 5),
+            'frankfurt_sweep_high': fr_sweep_high,
+            'frankfurt_sweep_low': fr_sweep_low,
+            'frankfurt_high_time': minute_of_day(times[np.maximum(fr_high_idx, 0)], fr_sweep_high),
+            'frankfurt_low_time': minute_of_day(times[np.maximum(fr_low_idx, 0)], fr_sweep_low),
+            'london_sweep_high': ld_sweep_high,
+            'london_sweep_low': ld_sweep_low,
+            'london_sweep_asia_high_time': ld_high_minute,
+            'london_sweep_asia_low_time': ld_low_minute,
+            'london_high_time': ld_high_minute,
+            'london_low_time': ld_low_minute,
+            'sweep_type': sweep_type.tolist(),
+            'london_direction': london_direction.tolist(),
+            'rebalance': rebalance_yes,
+            'extension_pips': rounded(extension_pips, 1, has_ext),
+            'extension_percent': rounded(extension_percent, 2, has_ext),
+            'max_time': minute_of_day(max_time, has_ext),
+            'min_time': minute_of_day(min_time, has_ext),
+            'reverse_pips': rounded(reverse_pips, 1, has_ext),
+            'reverse_percent': rounded(reverse_percent, 2, has_ext),
+            'retest_sweep_level': retest_sweep,
+            'asia_mid_retest': retest_mid,
+            'pdh': np.where(has_prev, np.round(from_units(pdh), 5), np.nan),
+            'pdl': np.where(has_prev, np.round(from_units(pdl), 5), np.nan),
+            'sweep_pdh': sweep_pdh,
+            'sweep_pdl': sweep_pdl,
+            'pdh_time': minute_of_day(ld_high_time, sweep_pdh),
+            'pdl_time': minute_of_day(ld_low_time, sweep_pdl),
+            'ny_direction': ny_direction.tolist(),
+            'ny_status': ny_status.tolist(),
+            'ny_up_extension_pips': rounded(ny_up / pip, 5, has_ny),
+            'ny_up_extension_percent': rounded(ny_up_percent, 5, has_ny),
+            'ny_down_extension_pips': rounded(ny_down / pip, 5, has_ny),
+            'ny_down_extension_percent': rounded(ny_down_percent, 5, has_ny),
+            'ny_max_high_time': minute_of_day(times[np.maximum(ny_high_idx, 0)], has_ny),
+            'ny_min_low_time': minute_of_day(times[np.maximum(ny_low_idx, 0)], has_ny),
+        })
+        return typed_results(results) if typed else results